@@ -1,3 +1,4 @@
+import numpy as np
 from Mersenne_twister import MersenneTwister
 
 
@@ -46,12 +47,61 @@ def untemper(y5):
     output : y1 : nombre avant le tempering, soit l'état un des 624 valeur interne de Mersenne Twister -> int
 
     sémantique : Permet de retrouver le nombre original à partir du nombre temperé en inversant les opérations de tempering.
+                 (formule fermée de untemper_tableau, même résultat que les fonctions undo_* bit à bit)
     """
-    y4 = undo_right_shift_xor(y5, 18)
-    y3 = undo_left_shift_xor_and(y4, 15, 0xEFC60000)
-    y2 = undo_left_shift_xor_and(y3, 7,  0x9D2C5680)
-    y1 = undo_right_shift_xor(y2, 11)
-    return y1
+    return int(untemper_tableau(np.uint32(y5)))
+
+
+def untemper_tableau(sorties):
+    """
+    input : sorties : sorties de Mersenne Twister, de forme quelconque -> np.ndarray[uint32]
+
+    output : mots de l'état interne correspondants, de même forme -> np.ndarray[uint32]
+
+    sémantique : Inverse le tempering en quelques décalages-XOR sur tout le tableau à la fois,
+                 au lieu de reconstruire les 32 bits un par un :
+                 - y ^= y >> 18 : 18 >= 16, donc x = y ^ (y >> 18)
+                 - y ^= (y << 15) & c : (c << 15) & c = 0, donc l'opération est sa propre inverse
+                 - y ^= (y << 7) & b : chaque itération de x = y ^ ((x << 7) & b) fixe 7 bits
+                   de plus, 4 itérations suffisent pour 32 bits
+                 - y ^= y >> 11 : x = y ^ (y >> 11) ^ (y >> 22)
+    """
+    y = np.asarray(sorties, dtype=np.uint32)
+    y = y ^ (y >> np.uint32(18))
+    y = y ^ ((y << np.uint32(15)) & np.uint32(0xEFC60000))
+    x = y
+    for _ in range(4):
+        x = y ^ ((x << np.uint32(7)) & np.uint32(0x9D2C5680))
+    return x ^ (x >> np.uint32(11)) ^ (x >> np.uint32(22))
+
+
+def cloner(sorties, decalage=None):
+    """
+    input : sorties : sorties consécutives du générateur attaqué -> list[int] ou np.ndarray
+            decalage : position de sorties[0] dans son bloc de 624 sorties, None si inconnue -> int
+
+    output : clone : MersenneTwister dont les prochaines sorties sont celles du générateur attaqué -> MersenneTwister
+
+    sémantique : Le twist de MersenneTwister calcule la nouvelle matrice entière à partir de l'ancienne :
+                 il faut donc 624 sorties d'un même bloc (alignées sur un twist) pour retrouver une
+                 matrice. Les sorties sont d'abord alignées (on saute les 624 - decalage premières),
+                 puis le clone est avancé sur les sorties restantes en vérifiant qu'il les prédit.
+                 Si le décalage est inconnu, chaque décalage est essayé : il faut alors au moins une
+                 sortie après le bloc aligné pour départager les candidats.
+    """
+    sorties = np.asarray(sorties, dtype=np.uint32)
+    n = 624
+    candidats = range(n) if decalage is None else [decalage % n]
+    for decalage_candidat in candidats:
+        saut = (n - decalage_candidat) % n
+        if len(sorties) < saut + n or (decalage is None and len(sorties) == saut + n):
+            continue
+        clone = MersenneTwister(0)
+        clone.MT = untemper_tableau(sorties[saut:saut+n]).tolist()
+        clone.INDEX = n
+        if np.array_equal(clone.random_uint32(len(sorties) - saut - n), sorties[saut+n:]):
+            return clone
+    raise ValueError("Aucun état de Mersenne Twister ne correspond à ces sorties (pas assez de sorties consécutives ?)")
 
 
 def restore_interne_state_of_mersenne_tiwister(): 
@@ -64,9 +114,7 @@ def restore_interne_state_of_mersenne_tiwister():
                  et le même que l'état d'origine. 
     """
     generator = MersenneTwister(123)
-    recompose_state = []
-    for _ in range(624):
-        recompose_state.append(untemper(generator.next_number()))
+    recompose_state = untemper_tableau(generator.random_uint32(624)).tolist()
     original_state = generator.MT
     assert(original_state == recompose_state)
 
@@ -87,5 +135,13 @@ if __name__ == "__main__":
     restore_interne_state_of_mersenne_tiwister()
     print("  Assertion passé. On retrouve donc bien l'état interne Mersenne Twister uniquement avec les sorties. Test validé !")
 
-    print("\nLes deux tests on réussit. On peut donc conssidérer que notre programme d'attaque fonctionne.")
+    print("\n=== Clone à partir de sorties interceptées (position inconnue) ===")
+    victime = MersenneTwister(2026)
+    victime.random_uint32(1000)
+    interceptees = victime.random_uint32(1500)
+    clone = cloner(interceptees)
+    assert(np.array_equal(clone.random_uint32(10000), victime.random_uint32(10000)))
+    print("  Le clone prédit les 10000 sorties suivantes de la victime. Test validé !")
+
+    print("\nLes trois tests on réussit. On peut donc conssidérer que notre programme d'attaque fonctionne.")
 
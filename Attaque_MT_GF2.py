@@ -0,0 +1,402 @@
+import io
+import numpy as np
+from cache_disque import chemin_cache, ecrire_cache
+from Mersenne_twister import MersenneTwister, polynome_caracteristique, polynome_twists
+
+# l'état attaqué est la matrice de 624 mots de 32 bits : 19968 inconnues sur GF(2)
+N: int = 624
+W: int = 32
+NB_INCONNUES: int = N * W
+# nombre de mots de 64 bits d'une ligne (forme linéaire sur les 19968 bits de l'état)
+NB_MOTS: int = NB_INCONNUES // 64
+# le twist n'est pas inversible : la matrice dont les 624 mots valent NOYAU est envoyée sur 0.
+# Avec Y = NOYAU (impair), Y ^ (Y >> 1) ^ a = 0 : NOYAU est l'inverse du code de Gray de a.
+NOYAU: int = 0xEE0F2095
+# seuls les états symboliques des blocs multiples de INTERVALLE_POINTS sont gardés sur le disque :
+# 50 Mo chacun, dans le cache partagé de cache_disque (.cache/ ou $GENERATEURS_CACHE)
+INTERVALLE_POINTS: int = 256
+# après k twists, le noyau est de dimension min(k, NOYAU_MAX) : les sorties du bloc b ne déterminent
+# la matrice de départ qu'à un sous-espace de dimension min(b + 1, NOYAU_MAX) près
+NOYAU_MAX: int = 16
+
+_GENERATEUR: MersenneTwister = MersenneTwister(0)
+# dernier état symbolique calculé (bloc, formes linéaires) : les blocs sont souvent lus dans l'ordre
+_DERNIER: tuple[int, np.ndarray] | None = None
+
+
+def _matrice_32(fonction) -> list[list[int]]:
+    """
+    input : fonction : application linéaire sur les mots de 32 bits (tableaux uint32) -> callable
+
+    output : bits[k] : liste des bits b de l'entrée dont le bit k de la sortie est la somme -> list[list[int]]
+
+    sémantique : Applique la fonction aux 32 vecteurs de base 1 << b pour obtenir sa matrice sur GF(2).
+    """
+    images = fonction(np.uint32(1) << np.arange(W, dtype=np.uint32))
+    return [[b for b in range(W) if (int(images[b]) >> k) & 1] for k in range(W)]
+
+
+TEMPER: list[list[int]] = _matrice_32(_GENERATEUR._temper_tableau)
+
+
+def _appliquer_32(matrice: list[list[int]], symboles: np.ndarray) -> np.ndarray:
+    """
+    input : matrice : matrice 32x32 sur GF(2) donnée par _matrice_32 -> list[list[int]]
+            symboles : formes linéaires des 32 bits de chaque mot, de forme (624, 32, NB_MOTS) -> np.ndarray[uint64]
+
+    output : formes linéaires des bits des mots transformés, de même forme -> np.ndarray[uint64]
+
+    sémantique : Le bit k du mot transformé est le XOR des bits de matrice[k] : on fait donc le XOR
+                 des formes linéaires correspondantes, pour les 624 mots à la fois.
+    """
+    resultat = np.zeros_like(symboles)
+    for k, bits in enumerate(matrice):
+        for b in bits:
+            resultat[:, k] ^= symboles[:, b]
+    return resultat
+
+
+def _twist_symbolique(symboles: np.ndarray) -> np.ndarray:
+    """
+    input : symboles : formes linéaires des bits de la matrice, de forme (624, 32, NB_MOTS) -> np.ndarray[uint64]
+
+    output : formes linéaires des bits de la matrice après un twist -> np.ndarray[uint64]
+
+    sémantique : Même calcul que MersenneTwister._twist_tableau, bit par bit :
+                 Y = bit 31 de MT[i] et bits 0 à 30 de MT[i+1], puis
+                 MT'[i] = MT[i+m] ^ (Y >> 1) ^ (bit 0 de Y) * a.
+    """
+    suivant = np.roll(symboles, -1, axis=0)
+    resultat = np.roll(symboles, -_GENERATEUR.m, axis=0)
+    resultat[:, :W-2] ^= suivant[:, 1:W-1]   # bits 1 à 30 de Y, décalés
+    resultat[:, W-2] ^= symboles[:, W-1]     # bit 31 de Y (bit 31 de MT[i])
+    bits_a = [k for k in range(W) if (_GENERATEUR.a >> k) & 1]
+    resultat[:, bits_a] ^= suivant[:, 0:1]   # bit 0 de Y, multiplié par a
+    return resultat
+
+
+def _identite() -> np.ndarray:
+    """formes linéaires des bits de l'état lui-même : le bit k du mot i est l'inconnue 32*i + k"""
+    symboles = np.zeros((NB_INCONNUES, NB_MOTS), dtype=np.uint64)
+    colonnes = np.arange(NB_INCONNUES)
+    symboles[colonnes, colonnes // 64] = np.uint64(1) << (colonnes % 64).astype(np.uint64)
+    return symboles.reshape(N, W, NB_MOTS)
+
+
+def _lire_symbolique(nom: str) -> np.ndarray | None:
+    """lit une matrice symbolique du cache (projetée en mémoire), None si elle n'existe pas"""
+    try:
+        return np.load(chemin_cache(nom), mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+
+
+def _appliquer_polynome_symbolique(g: int, symboles: np.ndarray) -> np.ndarray:
+    """
+    input : g : polynôme sur GF(2) (bit i = coefficient de x^i) -> int
+            symboles : formes linéaires des bits d'une matrice, de forme (624, 32, NB_MOTS) -> np.ndarray[uint64]
+
+    output : formes linéaires des bits de g(T)(matrice), T étant le twist -> np.ndarray[uint64]
+
+    sémantique : Schéma de Horner, comme MersenneTwister._appliquer_polynome, avec des twists symboliques.
+    """
+    resultat = np.zeros_like(symboles)
+    for bit in bin(g)[2:]:
+        resultat = _twist_symbolique(resultat)
+        if bit == "1":
+            resultat ^= symboles
+    return resultat
+
+
+def _enregistrer_point(bloc: int, etat: np.ndarray):
+    """écrit l'état symbolique d'un point de reprise dans le cache"""
+    tampon = io.BytesIO()
+    np.save(tampon, etat)
+    ecrire_cache(f"mt_symbolique_etat_{bloc}.npy", tampon.getvalue())
+
+
+def _etat_symbolique(bloc: int) -> np.ndarray:
+    """
+    input : bloc : numéro du bloc de 624 sorties -> int
+
+    output : formes linéaires des bits de T^(bloc+1)(état de départ), de forme (624, 32, NB_MOTS) -> np.ndarray[uint64]
+
+    sémantique : Repart de l'état le plus proche déjà connu : le dernier état calculé (gardé en
+                 mémoire pour les accès bloc après bloc) ou le point de reprise du cache le plus
+                 haut (un tous les INTERVALLE_POINTS blocs), sinon du premier twist de l'identité.
+                 Les twists sont ensuite appliqués dans une boucle, et chaque point de reprise
+                 traversé est écrit dans le cache partagé (cache_disque.CACHE_DIR, 50 Mo par point :
+                 une observation à la position p laisse environ p / 160 000 fichiers de 50 Mo). Quand le point de reprise visé est à plus de
+                 deg(P) blocs, on y saute directement avec le polynôme x^q mod P(x) de
+                 MersenneTwister.jump (environ 20 000 twists symboliques quelle que soit la distance).
+                 L'état de départ a déjà subi un twist : il est dans l'image de T, où P(T) s'annule.
+    """
+    global _DERNIER
+    depart, etat = -1, None
+    if _DERNIER is not None and _DERNIER[0] <= bloc:
+        depart, etat = _DERNIER
+    cible = bloc - bloc % INTERVALLE_POINTS
+    for point in range(cible, max(depart, 0), -INTERVALLE_POINTS):
+        lu = _lire_symbolique(f"mt_symbolique_etat_{point}.npy")
+        if lu is not None:
+            depart, etat = point, lu
+            break
+    if etat is None:
+        depart, etat = 0, _twist_symbolique(_identite())
+
+    if cible - depart > polynome_caracteristique().bit_length():
+        etat = _appliquer_polynome_symbolique(polynome_twists(cible - depart), np.asarray(etat))
+        depart = cible
+        _enregistrer_point(depart, etat)
+    while depart < bloc:
+        etat = _twist_symbolique(np.asarray(etat))
+        depart += 1
+        if depart % INTERVALLE_POINTS == 0:
+            _enregistrer_point(depart, etat)
+    _DERNIER = (bloc, etat)
+    return etat
+
+
+def sorties_symboliques(bloc: int) -> np.ndarray:
+    """
+    input : bloc : numéro du bloc de 624 sorties (0 pour les sorties du premier twist) -> int
+
+    output : formes linéaires des bits des sorties du bloc, de forme (624, 32, NB_MOTS) -> np.ndarray[uint64]
+
+    sémantique : La ligne [r, k] donne, en fonction des 19968 bits de la matrice de départ (celle
+                 d'un MersenneTwister qui vient d'être initialisé, INDEX = 624), le bit k de la sortie
+                 624*bloc + r : temper(T^(bloc+1)(état)). L'état symbolique vient de _etat_symbolique
+                 (50 Mo par bloc ; seuls les points de reprise sont écrits, dans cache_disque.CACHE_DIR).
+    """
+    return _appliquer_32(TEMPER, np.asarray(_etat_symbolique(bloc)))
+
+
+def _echelonner(A: np.ndarray, nb_colonnes: int) -> list[tuple[int, int]]:
+    """
+    input : A : système augmenté, une équation par ligne (bits des inconnues puis second membre) -> np.ndarray[uint64]
+            nb_colonnes : nombre d'inconnues -> int
+
+    output : pivots : couples (colonne, ligne), dans l'ordre des colonnes -> list[tuple[int, int]]
+
+    sémantique : Élimination de Gauss sur place, lignes compressées en mots de 64 bits, par groupes
+                 de 8 colonnes (un octet) à la manière de la méthode des quatre Russes : les pivots
+                 d'un octet sont choisis et réduits entre eux, puis les 256 combinaisons de ces
+                 pivots sont tabulées. Chaque ligne restante est alors éliminée sur les 8 colonnes
+                 par un seul XOR, celui de la combinaison indiquée par son octet, au lieu d'un XOR
+                 par colonne. Seuls les mots à partir de l'octet courant sont mis à jour (ceux
+                 d'avant sont déjà nuls sous le pivot) et seules les lignes dont l'octet n'est pas
+                 nul sont touchées, ce qui profite aux équations creuses des premiers blocs.
+    """
+    m = A.shape[0]
+    octets = A.view(np.uint8)
+    valeurs = np.arange(256, dtype=np.uint8)
+    pivots = []
+    r = 0
+    for g in range((nb_colonnes + 7) // 8):
+        if r == m:
+            break
+        mot = g // 8
+        reduction = valeurs.copy()   # octet -> octet une fois éliminé par les pivots du groupe
+        groupe = []                  # (bit, ligne) des pivots du groupe, lignes r, r+1, ...
+        for bit in range(min(8, nb_colonnes - 8*g)):
+            debut = r + len(groupe)
+            candidats = np.flatnonzero(reduction[octets[debut:, g]] & (1 << bit))
+            if len(candidats) == 0:
+                continue
+            ligne = debut + candidats[0]
+            if ligne != debut:
+                A[[debut, ligne]] = A[[ligne, debut]]
+            for b, p in groupe:
+                if octets[debut, g] & (1 << b):
+                    A[debut, mot:] ^= A[p, mot:]
+            for b, p in groupe:
+                if octets[p, g] & (1 << bit):
+                    A[p, mot:] ^= A[debut, mot:]
+            groupe.append((bit, debut))
+            reduction = valeurs.copy()
+            for b, p in groupe:
+                reduction ^= ((valeurs >> b) & 1) * octets[p, g]
+        if not groupe:
+            continue
+
+        table = np.zeros((256, A.shape[1] - mot), dtype=np.uint64)
+        for b, p in groupe:
+            table[(valeurs >> b) & 1 == 1] ^= A[p, mot:]
+        fin = r + len(groupe)
+        indices = octets[fin:, g]
+        touchees = np.flatnonzero(indices)
+        if len(touchees) > (m - fin) // 2:
+            A[fin:, mot:] ^= table[indices]
+        elif len(touchees):
+            A[fin + touchees, mot:] ^= table[indices[touchees]]
+        pivots += [(8*g + b, p) for b, p in groupe]
+        r = fin
+    return pivots
+
+
+def resoudre_gf2(equations: np.ndarray, seconds_membres: np.ndarray, nb_inconnues: int) -> tuple[np.ndarray, int]:
+    """
+    input : equations : une équation par ligne, bits des inconnues compressés en mots de 64 bits -> np.ndarray[uint64]
+            seconds_membres : bit du second membre de chaque équation -> np.ndarray
+            nb_inconnues : nombre d'inconnues -> int
+
+    output : (solution, rang) : bits de la solution compressés comme les équations (inconnues libres
+             à 0) et rang du système -> tuple[np.ndarray[uint64], int]
+
+    sémantique : Échelonne le système augmenté avec _echelonner, puis remonte les pivots du dernier
+                 au premier : la valeur de l'inconnue du pivot est son second membre plus la parité
+                 des inconnues déjà calculées de sa ligne. Lève une ValueError si le système est
+                 incohérent (observations fausses ou mal positionnées).
+    """
+    m, nb_mots = equations.shape
+    A = np.zeros((m, nb_mots + 1), dtype=np.uint64)
+    A[:, :nb_mots] = equations
+    A[:, nb_mots] = np.asarray(seconds_membres, dtype=np.uint64) & np.uint64(1)
+    pivots = _echelonner(A, nb_inconnues)
+
+    lignes_restantes = np.setdiff1d(np.arange(m), [p for _, p in pivots])
+    if np.any(A[lignes_restantes, nb_mots]):
+        raise ValueError("Le système est incohérent : aucune matrice ne donne ces observations")
+
+    solution = np.zeros(nb_mots, dtype=np.uint64)
+    for colonne, p in reversed(pivots):
+        # parité des bits communs : celle du XOR des mots (sans np.bitwise_count, NumPy >= 2)
+        commun = int(np.bitwise_xor.reduce(A[p, :nb_mots] & solution))
+        parite = (bin(commun).count("1") + int(A[p, nb_mots])) & 1
+        if parite:
+            solution[colonne // 64] |= np.uint64(1) << np.uint64(colonne % 64)
+    return solution, len(pivots)
+
+
+def recuperer_etat(indices, valeurs, masques=0xFFFFFFFF) -> MersenneTwister:
+    """
+    input : indices : position de chaque sortie observée depuis l'initialisation du générateur -> array-like
+            valeurs : sorties observées (seuls les bits du masque sont utilisés) -> array-like
+            masques : bits connus de chaque sortie, un masque commun ou un par sortie -> int ou array-like
+
+    output : clone : MersenneTwister dans l'état de la victime juste après son initialisation -> MersenneTwister
+
+    sémantique : Chaque bit observé est une équation linéaire sur les 19968 bits de la matrice de
+                 départ, lue dans sorties_symboliques. Les sorties peuvent être tronquées (bits de
+                 poids fort, flottants 53 bits) et non consécutives : il faut seulement assez de
+                 bits observés indépendants. Le twist ayant un noyau (NOYAU), les sorties ne
+                 déterminent la matrice de départ qu'au XOR de NOYAU sur tous ses mots près : le rang
+                 vaut au plus 19967 et les deux matrices possibles donnent exactement la même suite.
+                 Le clone rejoue donc toute la suite de la victime (graine choisit entre les deux
+                 matrices pour retrouver la seed). Si la première sortie observée est dans le bloc b,
+                 le noyau de T^(b+1) est de dimension min(b + 1, NOYAU_MAX) : le rang attendu baisse
+                 d'autant, et le clone ne rejoue la suite qu'à partir du bloc b (graine ne retrouve
+                 alors la seed que pour b = 0). Lève une ValueError s'il n'y a pas assez d'observations.
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    valeurs = np.broadcast_to(np.asarray(valeurs, dtype=np.uint64), indices.shape)
+    masques = np.broadcast_to(np.asarray(masques, dtype=np.uint64), indices.shape)
+    if np.any(indices < 0):
+        raise ValueError("Les positions des sorties observées doivent être positives")
+
+    # les blocs les plus proches du départ donnent les équations les plus creuses : en premier
+    ordre = np.argsort(indices, kind="stable")
+    equations, seconds_membres = [], []
+    blocs = indices[ordre] // N
+    for bloc in np.unique(blocs):
+        selection = ordre[blocs == bloc]
+        symboles = sorties_symboliques(int(bloc)).reshape(NB_INCONNUES, NB_MOTS)
+        for k in range(W):
+            connus = selection[(masques[selection] >> np.uint64(k)) & np.uint64(1) == 1]
+            equations.append(np.asarray(symboles[(indices[connus] % N) * W + k]))
+            seconds_membres.append((valeurs[connus] >> np.uint64(k)) & np.uint64(1))
+
+    equations = np.concatenate(equations)
+    rang_attendu = NB_INCONNUES - min(int(blocs[0]) + 1, NOYAU_MAX)
+    if len(equations) < rang_attendu:
+        raise ValueError(f"Pas assez de bits observés : {len(equations)} pour {NB_INCONNUES} inconnues")
+    solution, rang = resoudre_gf2(equations, np.concatenate(seconds_membres), NB_INCONNUES)
+    if rang < rang_attendu:
+        raise ValueError(f"Observations insuffisantes : rang {rang} pour {rang_attendu} attendu")
+
+    clone = MersenneTwister(0)
+    clone.MT = solution.view(np.uint32).tolist()
+    clone.INDEX = N
+    return clone
+
+
+def graine(clone: MersenneTwister) -> int | None:
+    """
+    input : clone : générateur renvoyé par recuperer_etat -> MersenneTwister
+
+    output : seed de la victime, None si la matrice ne vient pas d'une initialisation -> int | None
+
+    sémantique : L'initialisation met la seed dans MT[0] : pour chacune des deux matrices possibles
+                 (celle du clone et son XOR avec NOYAU), on vérifie si MersenneTwister(MT[0]) redonne
+                 toute la matrice. Le clone est alors remis exactement dans l'état de la victime.
+    """
+    for masque in (0, NOYAU):
+        etat = [mot ^ masque for mot in clone.MT]
+        if MersenneTwister(etat[0]).MT == etat:
+            clone.MT = etat
+            return etat[0]
+    return None
+
+
+def observations_bits_forts(fuites, nb_bits: int, indices=None):
+    """
+    input : fuites : nb_bits de poids fort de chaque sortie (sortie >> (32 - nb_bits)) -> array-like
+            nb_bits : nombre de bits qui fuient par sortie -> int
+            indices : positions des sorties, None pour des sorties consécutives depuis 0 -> array-like
+
+    output : (indices, valeurs, masques) à passer à recuperer_etat -> tuple[np.ndarray, np.ndarray, int]
+    """
+    fuites = np.asarray(fuites, dtype=np.uint64)
+    indices = np.arange(len(fuites)) if indices is None else np.asarray(indices)
+    decalage = np.uint64(W - nb_bits)
+    return indices, fuites << decalage, ((1 << nb_bits) - 1) << (W - nb_bits)
+
+
+def observations_flottants_53(flottants, positions=None):
+    """
+    input : flottants : flottants de uniformes_53 (deux sorties par flottant) -> array-like
+            positions : rang de chaque flottant dans la suite, None pour des flottants consécutifs -> array-like
+
+    output : (indices, valeurs, masques) à passer à recuperer_etat -> tuple[np.ndarray, np.ndarray, np.ndarray]
+
+    sémantique : Le flottant numéro p vaut (a >> 5) * 2^-27 + (b >> 6) * 2^-53 avec a et b les
+                 sorties 2p et 2p+1 : il donne les 27 bits de poids fort de a et les 26 de b.
+    """
+    entiers = (np.asarray(flottants, dtype=np.float64) * (1 << 53)).astype(np.uint64)
+    positions = np.arange(len(entiers)) if positions is None else np.asarray(positions)
+    indices = np.stack([2 * positions, 2 * positions + 1], axis=1).ravel()
+    valeurs = np.stack([(entiers >> np.uint64(26)) << np.uint64(5),
+                        (entiers & np.uint64((1 << 26) - 1)) << np.uint64(6)], axis=1).ravel()
+    masques = np.tile(np.array([0xFFFFFFE0, 0xFFFFFFC0], dtype=np.uint64), len(entiers))
+    return indices, valeurs, masques
+
+
+if __name__ == "__main__":
+    from time import perf_counter
+    from distributions import uniformes_53
+
+    print("=== 16 bits de poids fort, une sortie sur deux ===")
+    victime = MersenneTwister(2026)
+    sorties = victime.random_uint32(5000)
+    debut = perf_counter()
+    clone = recuperer_etat(*observations_bits_forts(sorties[::2] >> 16, 16, np.arange(0, 5000, 2)))
+    print(f"  état retrouvé en {perf_counter() - debut:.1f} s, seed : {graine(clone)}")
+    assert(np.array_equal(clone.random_uint32(10000), MersenneTwister(2026).random_uint32(10000)))
+
+    print("\n=== flottants 53 bits ===")
+    victime = MersenneTwister(7)
+    flottants = uniformes_53(victime.random_uint32(2 * 700))
+    debut = perf_counter()
+    clone = recuperer_etat(*observations_flottants_53(flottants))
+    print(f"  état retrouvé en {perf_counter() - debut:.1f} s, seed : {graine(clone)}")
+    assert(np.array_equal(clone.random_uint32(10000), MersenneTwister(7).random_uint32(10000)))
+
+    print("\n=== 1000 sorties observées à partir de la position 1 000 000 ===")
+    victime = MersenneTwister(31337)
+    sorties = victime.random_uint32(1_001_000)[1_000_000:]
+    debut = perf_counter()
+    clone = recuperer_etat(np.arange(1_000_000, 1_001_000), sorties)
+    print(f"  état retrouvé en {perf_counter() - debut:.1f} s (blocs symboliques calculés en boucle)")
+    assert(np.array_equal(clone.random_uint32(1_010_000)[1_000_000:], MersenneTwister(31337).random_uint32(1_010_000)[1_000_000:]))
+
+    print("\nLes trois clones prédisent les sorties de la victime. Test validé !")
@@ -1,24 +1,67 @@
 from Mersenne_twister import MersenneTwister
-from math import sqrt
+from flux import FluxAleatoire
+from cache_disque import lire_cache, ecrire_cache
+from secrets import randbelow
+
+# petits nombres premiers : division d'essai rapide et bases de Miller–Rabin
+PETITS_PREMIERS = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]
+# en dessous de cette borne, les bases PETITS_PREMIERS rendent Miller–Rabin déterministe
+BORNE_DETERMINISTE = 3317044064679887385961981
+
+# nombres premiers déjà calculés, par (seed, bits), et couples (M, Xo) par (p, q)
+_PREMIERS: dict[tuple[int, int], int] = {}
+_PARAMETRES: dict[tuple[int, int], tuple[int, int]] = {}
 
 ##################################
 #   Fonctions de vérifications  #
 ##################################
 
+def miller_rabin(number, rounds=40):
+    """
+    input : number : entier impair > 2 à tester -> int
+            rounds : nombre de bases aléatoires au-delà de BORNE_DETERMINISTE -> int
+
+    output : True si le nombre est (très probablement) premier, False sinon -> bool
+
+    sémantique : Test de Miller–Rabin. On écrit number - 1 = d * 2^s puis, pour chaque
+                 base a, on vérifie que a^d vaut 1 ou que l'un des a^(d*2^r) vaut -1.
+                 Le test est exact en dessous de BORNE_DETERMINISTE, et se trompe avec une
+                 probabilité d'au plus 4^-rounds au-dessus.
+    """
+    d, s = number - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    bases = PETITS_PREMIERS
+    if number >= BORNE_DETERMINISTE:
+        bases = bases + [2 + randbelow(number - 3) for _ in range(rounds)]
+    for a in bases:
+        x = pow(a, d, number)
+        if x == 1 or x == number - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % number
+            if x == number - 1:
+                break
+        else:
+            return False
+    return True
+
 def is_primary(number):
     """
     input : number : entier à tester -> int
 
     output : True si le nombre est premier, False sinon -> bool
 
-    sémantique : Vérifie si l'entier fourni est un nombre premier.
+    sémantique : Vérifie si l'entier fourni est un nombre premier
+                 (division par les petits premiers puis Miller–Rabin).
     """
     if number <= 1:
         return False
-    for i in range(2, int(sqrt(number))):
-        if number % i == 0:
-            return False
-    return True
+    for premier in PETITS_PREMIERS:
+        if number % premier == 0:
+            return number == premier
+    return miller_rabin(number)
 
 def calcul_pgcd(a, b):
     """
@@ -38,22 +81,39 @@ def calcul_pgcd(a, b):
 #   Fonctions de génération  #
 ###############################
 
-def generate_prime_3mod4(seed):
+def generate_prime_3mod4(seed, bits=32):
     """
     input : seed : valeur d'initialisation pour le générateur -> int
+            bits : taille maximale du nombre premier en bits -> int
 
     output : number : nombre premier congru à 3 modulo 4 -> int
 
     sémantique : Utilise le générateur MersenneTwister pour produire des
-                 candidats et retourne le premier nombre qui est premier
-                 et qui est congru à 3 modulo 4.
+                 candidats (bits de poids fort de mots de 32 bits concaténés)
+                 et retourne le premier nombre qui est premier et qui est
+                 congru à 3 modulo 4. Le résultat est conservé en mémoire et
+                 sur le disque pour chaque couple (seed, bits).
     """
-    ramdomizer = MersenneTwister(seed)
-    while True:
-        number = ramdomizer.next_number()
-        number |= 3
-        if(is_primary(number)):
-            return number
+    if (seed, bits) in _PREMIERS:
+        return _PREMIERS[(seed, bits)]
+    nom = f"bbs_premier_{seed}_{bits}.txt"
+    donnees = lire_cache(nom)
+    if donnees is not None:
+        number = int(donnees)
+    else:
+        ramdomizer = MersenneTwister(seed)
+        nb_mots = (bits + 31) // 32
+        while True:
+            number = 0
+            for _ in range(nb_mots):
+                number = (number << 32) | ramdomizer.next_number()
+            number >>= 32*nb_mots - bits
+            number |= 3
+            if(is_primary(number)):
+                break
+        ecrire_cache(nom, str(number).encode())
+    _PREMIERS[(seed, bits)] = number
+    return number
 
 def generate_M_and_Xo(p,q):
     """
@@ -62,21 +122,129 @@ def generate_M_and_Xo(p,q):
     output : (M, Xo) : module M = p*q et une valeur de départ X0 première avec M -> (int, int)
 
     sémantique : Calcule M = p*q puis génère (avec MersenneTwister) une valeur
-                 Xo telle que pgcd(M, Xo) == 1. Retourne le couple (M, Xo).
+                 Xo telle que pgcd(M, Xo) == 1. Retourne le couple (M, Xo),
+                 conservé en mémoire pour les appels suivants.
     """
-    M = p*q
-    ramdomizer = MersenneTwister(789)
-    while True:
-        Xo = ramdomizer.next_number()
-        Xo **= 2
-        if(calcul_pgcd(M,Xo) == 1):
-            return M,Xo
+    if (p, q) not in _PARAMETRES:
+        M = p*q
+        ramdomizer = MersenneTwister(789)
+        while True:
+            Xo = ramdomizer.next_number()
+            Xo **= 2
+            if(calcul_pgcd(M,Xo) == 1):
+                break
+        _PARAMETRES[(p, q)] = (M, Xo)
+    return _PARAMETRES[(p, q)]
 
 
 ###################################
 #   Algorithme de Blum–Blum–Shub  #
 ###################################
 
+class BlumBlumShub(FluxAleatoire):
+    def __init__(self, seed_p=123, seed_q=456, bits=32):
+        """
+        input : seed_p, seed_q : valeurs d'initialisation de la recherche de p et q -> int, int
+                bits : taille de p et q en bits -> int
+
+        sémantique : Générateur Blum–Blum–Shub qui conserve son état entre les appels.
+                     L'état est gardé sous la forme (X mod p, X mod q) : chaque élévation au
+                     carré se fait séparément modulo p et modulo q (théorème des restes chinois),
+                     sur des nombres deux fois plus petits que M.
+                     Le flux d'octets (read, fill) contient les log2(log2 M) bits de poids
+                     faible de chaque Xn, l'itération renvoie les Xn complets.
+        """
+        self.p = generate_prime_3mod4(seed_p, bits)
+        self.q = generate_prime_3mod4(seed_q, bits)
+        self.M, self.Xo = generate_M_and_Xo(self.p, self.q)
+        self.q_inv = pow(self.q, -1, self.p)
+        self.nb_bits = max(1, (self.M.bit_length() - 1).bit_length() - 1) # bits extraits par Xn
+        self.seek(0)
+
+    @property
+    def X(self):
+        """
+        output : Xn, recomposé à partir de (Xn mod p, Xn mod q) -> int
+        """
+        h = (self.xp - self.xq) * self.q_inv % self.p
+        return self.xq + self.q * h
+
+    def valeur(self, i):
+        """
+        input : i : indice du terme -> int
+
+        output : Xi = Xo^(2^i) mod M -> int
+
+        sémantique : Accès direct au i-ème terme. D'après le théorème d'Euler, l'exposant
+                     2^i peut être réduit modulo p-1 (resp. q-1) pour le calcul modulo p
+                     (resp. q), ce qui coûte O(log p) multiplications quel que soit i.
+        """
+        xp = pow(self.Xo % self.p, pow(2, i, self.p - 1), self.p)
+        xq = pow(self.Xo % self.q, pow(2, i, self.q - 1), self.q)
+        h = (xp - xq) * self.q_inv % self.p
+        return xq + self.q * h
+
+    def seek(self, i):
+        """
+        input : i : indice du terme -> int
+
+        sémantique : Positionne le générateur sur Xi, le prochain terme produit sera Xi+1.
+        """
+        Xi = self.valeur(i)
+        self.xp, self.xq = Xi % self.p, Xi % self.q
+        self._reste = b''
+
+    def next_number(self):
+        """
+        output : Xn+1 = Xn² mod M : nombre suivant de la séquence -> int
+        """
+        self.xp = self.xp * self.xp % self.p
+        self.xq = self.xq * self.xq % self.q
+        return self.X
+
+    def fill(self, buffer):
+        """
+        input : buffer : tampon accessible en écriture (bytearray, memoryview, tableau NumPy...)
+
+        output : le tampon rempli
+
+        sémantique : Chaque élévation au carré fournit les nb_bits bits de poids faible de Xn,
+                     huit élévations fournissent donc exactement nb_bits octets. Ces bits sont
+                     obtenus sans recomposer Xn : Xn = Xn mod q + q*h donc
+                     Xn mod 2^j = (Xn mod q + (q mod 2^j)*h) mod 2^j.
+        """
+        octets = memoryview(buffer).cast('B')
+        pos = min(len(self._reste), len(octets))
+        octets[:pos] = self._reste[:pos]
+        self._reste = self._reste[pos:]
+
+        p, q, q_inv, j = self.p, self.q, self.q_inv, self.nb_bits
+        masque = (1 << j) - 1
+        q_bas = q & masque
+        xp, xq = self.xp, self.xq
+        while pos < len(octets):
+            bloc = 0
+            for _ in range(8):
+                xp = xp * xp % p
+                xq = xq * xq % q
+                h = (xp - xq) * q_inv % p
+                bloc = (bloc << j) | ((xq + q_bas*h) & masque)
+            bloc = bloc.to_bytes(j, 'big')
+            nb = min(j, len(octets) - pos)
+            octets[pos:pos+nb] = bloc[:nb]
+            self._reste = bloc[nb:]
+            pos += nb
+        self.xp, self.xq = xp, xq
+        return buffer
+
+    def __iter__(self):
+        """
+        output : itérateur sans fin sur X1, X2, ... -> int
+        """
+        while True:
+            yield self.next_number()
+
+
 def BBS(length_of_sequence):
     """
     input : length_of_sequence : longueur de la séquence à générer -> int
@@ -85,18 +253,13 @@ def BBS(length_of_sequence):
 
     sémantique : Implémente l'algorithme Blum–Blum–Shub (BBS). 
     """
-    sequence = []
-    p = generate_prime_3mod4(123)
-    q = generate_prime_3mod4(456)
-    M,Xn = generate_M_and_Xo(p,q)
-    
-    for _ in range(length_of_sequence):
-        Xn = (Xn**2)%M
-        sequence.append(Xn)
-    return sequence
-
+    generateur = BlumBlumShub()
+    return [generateur.next_number() for _ in range(length_of_sequence)]
 
 
 if __name__ == "__main__":
     res = BBS(10)
-    print(f"Séquence générée : {res}")
\ No newline at end of file
+    print(f"Séquence générée : {res}")
+    generateur = BlumBlumShub()
+    print(f"X10 par accès direct : {generateur.valeur(10)} => {generateur.valeur(10) == res[-1]}")
+    print(f"16 octets ({generateur.nb_bits} bits par élévation au carré) : {generateur.read(16).hex()}")
\ No newline at end of file
@@ -1,39 +1,122 @@
 from Mersenne_twister import MersenneTwister
-from math import log2, sqrt
+from flux import FluxAleatoire
+from distributions import uniformes_53
+import numpy as np
 
 SEED: int = 123
-RANDOMUNIFORM: MersenneTwister = MersenneTwister(SEED) # algorithme de génération de nombre Uniforme
-OTHER_NUMBER: float | None = None
+# nombre de couples uniformes tirés à la fois par la méthode polaire
+TAILLE_LOT: int = 1 << 14
+
+
+class NormalSampler(FluxAleatoire):
+    def __init__(self, seed: int = SEED):
+        """Générateur de nombres suivant une loi Normale Centrée Réduite (méthode polaire de Marsaglia)
+
+        Chaque instance possède sa propre source uniforme et sa propre réserve de nombres déjà
+        générés : des instances différentes peuvent être utilisées en même temps sans interférer.
+
+        Args:
+            seed (int, optional): seed de la source uniforme. Defaults to SEED.
+        """
+        self.uniforme: MersenneTwister = MersenneTwister(seed) # algorithme de génération de nombre Uniforme
+        self._reserve: np.ndarray = np.empty(0)
+        self._position: int = 0
+
+    def _remplir_reserve(self):
+        """tire TAILLE_LOT couples de la source uniforme et garde les nombres de loi Normale obtenus
+
+        Méthode polaire : (x, y) uniforme dans [-1, 1)², on garde les couples tels que
+        0 < s = x² + y² < 1, puis x*sqrt(-2 ln(s) / s) et y*sqrt(-2 ln(s) / s) sont deux
+        nombres indépendants de loi Normale. Les lots ont toujours la même taille : la suite
+        des nombres ne dépend donc pas de la façon dont ils sont demandés.
+        """
+        u = 2.0 * uniformes_53(self.uniforme.random_uint32(4 * TAILLE_LOT)) - 1.0
+        x, y = u[0::2], u[1::2]
+        s = x*x + y*y
+        acceptes = (s > 0.0) & (s < 1.0)
+        x, y, s = x[acceptes], y[acceptes], s[acceptes]
+        facteur = np.sqrt(-2.0 * np.log(s) / s)
+
+        nombres = np.empty(2 * len(s))
+        nombres[0::2] = x * facteur
+        nombres[1::2] = y * facteur
+        self._reserve = nombres
+        self._position = 0
+
+    def normal(self, n: int) -> np.ndarray:
+        """renvois n nombres aléatoires qui suivent une loi Normale Centrée Réduite
+
+        Args:
+            n (int): nombre de nombres
+
+        Returns:
+            np.ndarray: tableau de n flottants (float64)
+        """
+        sortie = np.empty(n)
+        rempli = 0
+        while rempli < n:
+            if self._position == len(self._reserve):
+                self._remplir_reserve()
+            nb = min(n - rempli, len(self._reserve) - self._position)
+            sortie[rempli:rempli+nb] = self._reserve[self._position:self._position+nb]
+            self._position += nb
+            rempli += nb
+        return sortie
+
+    def next_number(self) -> float:
+        """renvois un nombre aléatoire qui suit une loi Normale Centrée Réduite
+
+        Returns:
+            float: nombre aléatoire généré
+        """
+        if self._position == len(self._reserve):
+            self._remplir_reserve()
+        nb = self._reserve[self._position]
+        self._position += 1
+        return float(nb)
+
+    def random_uint32(self, n: int) -> np.ndarray:
+        """renvois n mots de la source uniforme (flux d'octets de read et fill)
+
+        Args:
+            n (int): nombre de mots
+
+        Returns:
+            np.ndarray: tableau de n entiers non signés 32 bits
+        """
+        return self.uniforme.random_uint32(n)
+
+    def __iter__(self):
+        """itère sans fin sur les nombres de loi Normale
+
+        Yields:
+            float: nombre aléatoire généré
+        """
+        while True:
+            if self._position == len(self._reserve):
+                self._remplir_reserve()
+            reste = self._reserve[self._position:].tolist()
+            self._position = len(self._reserve)
+            yield from reste
+
+
+_ECHANTILLONNEUR: NormalSampler = NormalSampler(SEED)
+RANDOMUNIFORM: MersenneTwister = _ECHANTILLONNEUR.uniforme # algorithme de génération de nombre Uniforme
+
 
 def BoxMuller():
-    """renvois un nombre aléatoire en suivant l'algorithme de Box Muller
-    qui suit une loi Normale Centrée Réduite
+    """renvois un nombre aléatoire qui suit une loi Normale Centrée Réduite
+    (échantillonneur partagé du module, voir NormalSampler pour un usage concurrent)
 
     Returns:
         float: nombre aléatoire généré
     """
-    global OTHER_NUMBER
-    # si un nombre a déjà été généré
-    if OTHER_NUMBER:
-        nb = OTHER_NUMBER
-        OTHER_NUMBER = None
-        return nb
-
-    x1 = float("0."+str(RANDOMUNIFORM.next_number()))
-    x2 = float("0."+str(RANDOMUNIFORM.next_number()))
-    s = x1**2+x2**2
-    while s >= 1:
-        x1 = float("0."+str(RANDOMUNIFORM.next_number()))
-        x2 = float("0."+str(RANDOMUNIFORM.next_number()))
-        s = x1**2+x2**2
-
-    
-    const = sqrt(-2*log2(s) / s)
-    OTHER_NUMBER = x2 * const
-    return x1 * const
+    return _ECHANTILLONNEUR.next_number()
 
 if __name__ == "__main__":
     print("implémentation de la génération de nombre aléatoire")
     for i in range(10):
         nb = BoxMuller()
-        print(nb)
\ No newline at end of file
+        print(nb)
+    echantillon = NormalSampler(SEED).normal(1_000_000)
+    print(f"moyenne : {echantillon.mean():.4f}, écart type : {echantillon.std():.4f}")
@@ -1,3 +1,10 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from flux import FluxAleatoire
+
+# nombre de voies de l'évaluation entrelacée : chaque opération NumPy calcule un bloc de VOIES termes
+VOIES = 1 << 16
 
 def linear_congruential_generator(m,a,c,Xo,length_of_sequence):
     """
@@ -19,6 +26,212 @@ def linear_congruential_generator(m,a,c,Xo,length_of_sequence):
         sequence.append(Xn)
     return sequence
 
+
+def puissance_affine(a, c, m, n):
+    """
+    input : a, c, m : paramètres du LCG -> int
+            n : nombre de pas -> int
+
+    output : (A, C) : coefficients tels que X(k+n) = (A*X(k) + C) mod m -> (int, int)
+
+    sémentique : Compose n fois la fonction affine X -> a*X + c modulo m par exponentiation
+                 rapide (carré et multiplication), en O(log n) opérations.
+    """
+    A, C = 1, 0       # résultat : identité
+    a_p, c_p = a % m, c % m  # puissance courante : f^(2^i)
+    while n > 0:
+        if n & 1:
+            # résultat <- f^(2^i) o résultat
+            A, C = (a_p * A) % m, (a_p * C + c_p) % m
+        # f^(2^(i+1)) = f^(2^i) o f^(2^i)
+        a_p, c_p = (a_p * a_p) % m, (a_p * c_p + c_p) % m
+        n >>= 1
+    return A, C
+
+
+def linear_congruential_generator_array(m, a, c, Xo, length_of_sequence=None, out=None):
+    """
+    input : m, a, c, Xo : paramètres du générateur (voir linear_congruential_generator)
+            length_of_sequence : nombre de nombre à généré (par défaut la taille de out) -> int
+            out : tampon de sortie : tableau uint64, memoryview, bytearray, array('Q')... -> buffer
+
+    output : X1, X2, ... , Xn : nombres générés, écrits dans out sans copie -> np.ndarray[uint64]
+
+    sémentique : Évaluation entrelacée (leapfrog) : la voie i calcule X(i+kL) avec la fonction
+                 affine composée L fois, X(i+L) = (A*X(i) + C) mod m, donc chaque opération NumPy
+                 produit un bloc entier. Le bloc de départ est construit en doublant sa taille.
+                 Les produits tiennent sur 64 bits si m <= 2^32 ; si m est une puissance de deux
+                 (jusqu'à 2^64) le débordement des uint64 est exactement la réduction modulo m.
+                 Pour les autres modulos, les termes sont calculés un par un dans le tampon.
+                 Lève une ValueError si m > 2^64 : les termes ne tiennent plus dans des uint64.
+    """
+    if m > 2**64:
+        raise ValueError("m > 2^64 : les termes ne tiennent pas dans un tableau uint64 (utiliser generate ou random_uint32)")
+    if out is None:
+        out = np.empty(length_of_sequence, dtype=np.uint64)
+    elif not isinstance(out, np.ndarray):
+        out = np.frombuffer(out, dtype=np.uint64)
+    if length_of_sequence is not None:
+        out = out[:length_of_sequence]
+    n = len(out)
+    if n == 0:
+        return out
+
+    out[0] = (a*Xo + c) % m
+    puissance_de_deux = m & (m - 1) == 0
+    if m > 2**32 and not puissance_de_deux:
+        Xn = int(out[0])
+        for i in range(1, n):
+            Xn = (a*Xn + c) % m
+            out[i] = Xn
+        return out
+
+    pas = debut = 1
+    A, C = puissance_affine(a, c, m, pas)
+    while debut < n:
+        nb = min(pas, n - debut)
+        bloc = out[debut:debut+nb]
+        np.multiply(out[debut-pas:debut-pas+nb], np.uint64(A), out=bloc)
+        np.add(bloc, np.uint64(C), out=bloc)
+        if puissance_de_deux:
+            if m < 2**64:
+                np.bitwise_and(bloc, np.uint64(m - 1), out=bloc)
+        else:
+            np.remainder(bloc, np.uint64(m), out=bloc)
+        debut += nb
+        if pas < VOIES:
+            pas *= 2
+            A, C = puissance_affine(a, c, m, pas)
+    return out
+
+
+def _generer_bloc(parametres):
+    """
+    input : parametres : (m, a, c, Xo, longueur) d'un bloc de la séquence -> tuple
+
+    output : X1, ..., Xlongueur : bloc généré -> int[]
+
+    sémentique : Fonction exécutée dans les processus de generate_parallel.
+    """
+    return linear_congruential_generator(*parametres)
+
+
+class LCG(FluxAleatoire):
+    def __init__(self, m, a, c, Xo):
+        """
+        input : m, a, c, Xo : paramètres du générateur (voir linear_congruential_generator)
+
+        sémentique : Générateur congruentiel linéaire conservant son état entre les appels.
+        """
+        self.m = m
+        self.a = a
+        self.c = c
+        self.X = Xo
+
+    def next_number(self):
+        """
+        output : Xn+1 : nombre suivant de la séquence -> int
+        """
+        self.X = (self.a*self.X + self.c) % self.m
+        return self.X
+
+    def advance(self, n):
+        """
+        input : n : nombre de termes à sauter -> int
+
+        output : le générateur lui-même -> LCG
+
+        sémentique : Avance de n termes en O(log n) sans les calculer.
+        """
+        A, C = puissance_affine(self.a, self.c, self.m, n)
+        self.X = (A*self.X + C) % self.m
+        return self
+
+    def generate(self, length):
+        """
+        input : length : nombre de nombre à généré -> int
+
+        output : X1, ..., Xlength : nombres aléatoires générés -> int[]
+        """
+        sequence = linear_congruential_generator(self.m, self.a, self.c, self.X, length)
+        if sequence:
+            self.X = sequence[-1]
+        return sequence
+
+    def generate_array(self, length=None, out=None):
+        """
+        input : length : nombre de nombre à généré (par défaut la taille de out) -> int
+                out : tampon de sortie uint64 fourni par l'appelant -> buffer
+
+        output : X1, ..., Xlength : nombres aléatoires générés -> np.ndarray[uint64]
+
+        sémentique : Version vectorisée de generate (voir linear_congruential_generator_array).
+        """
+        sequence = linear_congruential_generator_array(self.m, self.a, self.c, self.X, length, out)
+        if len(sequence):
+            self.X = int(sequence[-1])
+        return sequence
+
+    def random_uint32(self, n):
+        """
+        input : n : nombre de mots -> int
+
+        output : 32 bits de poids faible des n termes suivants -> np.ndarray[uint32]
+
+        sémentique : Flux de mots de FluxAleatoire (read, fill, ...). Pour m < 2^32 les mots
+                     sont simplement les termes de la séquence. Pour m > 2^64, les termes sont
+                     calculés un par un et seuls leurs 32 bits de poids faible sont écrits.
+        """
+        if self.m <= 2**64:
+            return self.generate_array(n).astype(np.uint32)
+        sortie = np.empty(n, dtype=np.uint32)
+        for i in range(n):
+            sortie[i] = self.next_number() & 0xFFFFFFFF
+        return sortie
+
+    def __iter__(self):
+        """
+        output : itérateur sans fin sur les termes X1, X2, ... -> int
+
+        sémentique : Les termes sont calculés par blocs avec generate_array quand m <= 2^64.
+        """
+        if self.m > 2**64:
+            while True:
+                yield self.next_number()
+        while True:
+            yield from self.generate_array(self.TAILLE_BLOC).tolist()
+
+    def generate_parallel(self, length, workers=None):
+        """
+        input : length : nombre de nombre à généré -> int
+                workers : nombre de processus (par défaut le nombre de cœurs) -> int
+
+        output : X1, ..., Xlength : nombres aléatoires générés -> int[]
+
+        sémentique : Découpe la séquence en blocs dont le point de départ est obtenu avec
+                     puissance_affine, calcule les blocs dans des processus séparés et les
+                     renvoie dans l'ordre. La séquence est identique à celle de generate.
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or length < 2*workers:
+            return self.generate(length)
+
+        taille = -(-length // workers)  # taille d'un bloc, arrondie au supérieur
+        A, C = puissance_affine(self.a, self.c, self.m, taille)
+        blocs = []
+        depart = self.X
+        for debut in range(0, length, taille):
+            blocs.append((self.m, self.a, self.c, depart, min(taille, length - debut)))
+            depart = (A*depart + C) % self.m
+
+        sequence = []
+        with ProcessPoolExecutor(max_workers=workers) as executeur:
+            for bloc in executeur.map(_generer_bloc, blocs):
+                sequence.extend(bloc)
+        self.X = sequence[-1]
+        return sequence
+
+
 # Test
 def test():
     """
@@ -30,6 +243,16 @@ def test():
         res = linear_congruential_generator(9,2,1,3,7)
         print(f"Séquence générée : {res}\nSéquence attendue : [7, 6, 4, 0, 1, 3, 7]")
         assert(res == [7, 6, 4, 0, 1, 3, 7])
+        generateur = LCG(2**31 - 1, 48271, 12345, 42)
+        attendu = linear_congruential_generator(2**31 - 1, 48271, 12345, 42, 100000)
+        assert(LCG(2**31 - 1, 48271, 12345, 42).advance(100000).X == attendu[-1])
+        assert(generateur.generate_parallel(100000, 4) == attendu)
+        assert(LCG(2**31 - 1, 48271, 12345, 42).generate_array(100000).tolist() == attendu)
+        tampon = bytearray(8 * 1000)
+        linear_congruential_generator_array(2**64, 6364136223846793005, 1442695040888963407, 7, out=memoryview(tampon))
+        assert(np.frombuffer(tampon, dtype=np.uint64).tolist() == linear_congruential_generator(2**64, 6364136223846793005, 1442695040888963407, 7, 1000))
+        grand = LCG(2**89 - 1, 3**40, 7, 11)
+        assert(grand.read(40) == b"".join((x & 0xFFFFFFFF).to_bytes(4, "little") for x in linear_congruential_generator(2**89 - 1, 3**40, 7, 11, 10)))
         print("Test passé avec succès !!")
     except AssertionError:
         print("Erreur : la séqence optenue n'est pas celle qui était attendue")
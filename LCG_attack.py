@@ -1,7 +1,13 @@
 from math import  gcd
-from LCG import linear_congruential_generator
+from fractions import Fraction
+from time import perf_counter
+import numpy as np
+from LCG import linear_congruential_generator, puissance_affine
 from functools import reduce
 
+# plus grand cofacteur s essayé entre le pgcd des déterminants et le module (attaque_lot)
+COFACTEUR_MAX = 1 << 10
+
 def modinverse(a, m):
     """
         Entrée :
@@ -44,13 +50,14 @@ def attaque(xn, a, c, m, long_seq):
             retourne le (n-long_seq)ème terme de la suite générée
 
         Principe :
-            on applique plusieurs fois la fonction trouver_terme_precedent
-            pour remonter la suite terme par terme.
+            le terme précédent est l’image de x par la fonction affine
+            x -> inv_a*x - inv_a*c (mod m). L’inverse de a n’est calculé
+            qu’une fois, puis puissance_affine compose long_seq fois cette
+            fonction en O(log long_seq) opérations.
     """
-    xi = xn
-    for _ in range(long_seq,0,-1):
-        xi = trouver_terme_precedent(xi,a,c,m)
-    return xi
+    inv_a = modinverse(a, m)
+    A, C = puissance_affine(inv_a, -inv_a * c, m, long_seq)
+    return (A * xn + C) % m
 
 
 
@@ -135,6 +142,260 @@ def attaque_cas2(seq, n):
     print("La graine trouvé :",end=" ")
     return attaque(seq[-1], a, c, m, long_seq=n)
 
+def _inverses_modulaires(d, m):
+    """
+        Entrée :
+            d, m : tableaux d’entiers de même forme (int64 ou objets Python)
+
+        Sortie :
+            retourne (inverses, pgcd) : l’inverse de d modulo m là où pgcd(d, m) = 1,
+            et le pgcd de chaque couple
+
+        Principe :
+            algorithme d’Euclide étendu mené sur tout le tableau à la fois ;
+            les couples déjà terminés ne bougent plus.
+    """
+    r0, r1 = m, d % m
+    s0, s1 = np.ones_like(m) * 0, np.ones_like(m)
+    while np.any(r1 != 0):
+        actifs = r1 != 0
+        q = r0 // np.where(actifs, r1, 1)
+        r0, r1 = np.where(actifs, r1, r0), np.where(actifs, r0 - q*r1, r1)
+        s0, s1 = np.where(actifs, s1, s0), np.where(actifs, s0 - q*s1, s1)
+    return s0 % m, r0
+
+
+def attaque_lot(sequences):
+    """
+        Entrée :
+            sequences : tableau (nb_sequences, longueur) de sorties consécutives,
+                        une ligne par LCG attaqué (paramètres inconnus, longueur >= 5)
+
+        Sortie :
+            retourne un dictionnaire de tableaux (une valeur par séquence) :
+            "m", "a", "c", "graine" (terme précédant la première sortie),
+            "succes" (paramètres vérifiés sur toute la séquence) et
+            "debit" (séquences cassées par seconde)
+
+        Principe :
+            même attaque que attaque_cas2, sur toutes les séquences à la fois :
+            - m divise le pgcd des déterminants t1² - t0*t2 de chaque ligne (np.gcd) ;
+              c’est le plus petit diviseur M/s de ce pgcd qui vérifie la récurrence
+              (voir _casser). Tant que les sorties sont inférieures à 2^31, les
+              déterminants tiennent dans un int64, sinon les calculs se font sur
+              des entiers Python
+            - a vient du premier écart t inversible modulo m (Euclide étendu vectorisé)
+            - c et la graine s’en déduisent, avec un seul inverse de a par séquence
+    """
+    debut = perf_counter()
+    sequences = np.asarray(sequences)
+    petits = sequences.dtype != object and sequences.min() >= 0 and sequences.max() < 1 << 31
+    x = sequences.astype(np.int64 if petits else object)
+    t = np.diff(x, axis=1)
+    determinants = t[:, 1:-1]**2 - t[:, :-2]*t[:, 2:]
+    m = np.gcd.reduce(np.abs(determinants), axis=1)
+
+    resultat = {}
+    if petits and m.max() >= 1 << 31:
+        # pgcd multiple du vrai module et trop grand : ces lignes sortent des int64
+        grands = m >= 1 << 31
+        parties = [_casser(x[~grands], m[~grands]), _casser(x[grands].astype(object), m[grands].astype(object))]
+        for cle in ["m", "a", "c", "graine", "succes"]:
+            resultat[cle] = np.empty(len(x), dtype=bool if cle == "succes" else object)
+            resultat[cle][~grands], resultat[cle][grands] = parties[0][cle], parties[1][cle]
+    else:
+        resultat.update(_casser(x, m))
+    duree = perf_counter() - debut
+    resultat["debit"] = len(x) / duree if duree > 0 else float("inf")
+    return resultat
+
+
+def _parametres(x, m):
+    """
+        Entrée :
+            x : tableau (nb_sequences, longueur) des sorties
+            m : module candidat pour chaque séquence
+
+        Sortie :
+            retourne (a, c, verifies) : a et c modulo m, et verifies indique si
+            x_(i+1) = a*x_i + c (mod m) sur toute la séquence avec m > max(x)
+    """
+    valides = m > np.max(x, axis=1)
+    m = np.where(valides, m, x.max(axis=1) + 1)  # module quelconque, la vérification échouera
+    t = np.diff(x, axis=1)
+    inverses, pgcd = _inverses_modulaires(t[:, :-1], m[:, None])
+    inversibles = pgcd == 1
+    i = np.argmax(inversibles, axis=1)
+    lignes = np.arange(len(x))
+    valides &= inversibles[lignes, i]
+    a = t[lignes, i + 1] * inverses[lignes, i] % m
+    c = (x[:, 1] - a * x[:, 0]) % m
+    verifies = valides & np.all((a[:, None] * x[:, :-1] + c[:, None]) % m[:, None] == x[:, 1:], axis=1)
+    return a, c, verifies
+
+
+def _casser(x, m):
+    """
+        Entrée :
+            x : tableau (nb_sequences, longueur) des sorties
+            m : pgcd des déterminants de chaque séquence
+
+        Sortie :
+            retourne le dictionnaire "m", "a", "c", "graine", "succes" de attaque_lot
+
+        Principe :
+            tout module qui explique la séquence divise le pgcd M des déterminants,
+            mais M est souvent un multiple k*m du vrai module. Les modules possibles
+            sont donc les M/s plus grands que max(x) : on les essaie tous, s croissant,
+            et on garde le plus petit qui vérifie la récurrence. Si M/max(x) dépasse
+            COFACTEUR_MAX, le module minimal n’est pas garanti : pas de succès.
+    """
+    maxima = np.max(x, axis=1)
+    module = m.copy()
+    a, c, succes = _parametres(x, m)
+    rapports = m // (maxima + 1)   # s possibles : M/s > max(x)
+    for s in range(2, int(min(rapports.max(), COFACTEUR_MAX)) + 1):
+        lignes = np.flatnonzero((rapports >= s) & (m % s == 0))
+        if len(lignes) == 0:
+            continue
+        a_s, c_s, verifies = _parametres(x[lignes], m[lignes] // s)
+        lignes = lignes[verifies]
+        module[lignes] = m[lignes] // s
+        a[lignes], c[lignes] = a_s[verifies], c_s[verifies]
+        succes[lignes] = True
+    succes &= rapports <= COFACTEUR_MAX
+    inv_a, _ = _inverses_modulaires(a, np.where(succes, module, maxima + 1))
+    return {"m": module, "a": a, "c": c, "graine": inv_a * (x[:, 0] - c) % module, "succes": succes}
+
+
+def _produit(u, v):
+    """produit scalaire de deux vecteurs"""
+    return sum(x * y for x, y in zip(u, v))
+
+
+def reduction_lll(base, delta=Fraction(3, 4)):
+    """
+        Entrée :
+            base : vecteurs (lignes d’entiers) d’une base d’un réseau
+            delta : paramètre de Lovász, entre 1/4 et 1
+
+        Sortie :
+            retourne une base LLL-réduite du même réseau (vecteurs courts et
+            presque orthogonaux)
+
+        Principe :
+            algorithme de Lenstra–Lenstra–Lovász en arithmétique exacte
+            (Fraction) : réduction de taille de chaque vecteur par les
+            précédents, échange de deux vecteurs voisins quand la condition
+            de Lovász n’est pas respectée. L’orthogonalisation de Gram–Schmidt
+            n’est recalculée qu’après un échange.
+    """
+    b = [list(v) for v in base]
+    n = len(b)
+
+    def gram_schmidt():
+        orthogonaux, mu = [], [[Fraction(0)] * n for _ in range(n)]
+        for i in range(n):
+            v = [Fraction(x) for x in b[i]]
+            for j in range(i):
+                mu[i][j] = _produit(b[i], orthogonaux[j]) / _produit(orthogonaux[j], orthogonaux[j])
+                v = [vi - mu[i][j] * wj for vi, wj in zip(v, orthogonaux[j])]
+            orthogonaux.append(v)
+        return orthogonaux, [_produit(v, v) for v in orthogonaux], mu
+
+    orthogonaux, normes, mu = gram_schmidt()
+    k = 1
+    while k < n:
+        for j in range(k - 1, -1, -1):
+            q = round(mu[k][j])
+            if q:
+                b[k] = [x - q * y for x, y in zip(b[k], b[j])]
+                for i in range(j):
+                    mu[k][i] -= q * mu[j][i]
+                mu[k][j] -= q
+        if normes[k] >= (delta - mu[k][k-1]**2) * normes[k-1]:
+            k += 1
+        else:
+            b[k], b[k-1] = b[k-1], b[k]
+            orthogonaux, normes, mu = gram_schmidt()
+            k = max(k - 1, 1)
+    return b
+
+
+def _inverse_entier(base):
+    """
+        Entrée :
+            base : matrice carrée inversible d’entiers
+
+        Sortie :
+            retourne (inverse, d) : matrice d’entiers et dénominateur tels que
+            base^-1 = inverse / d (pivot de Gauss en Fraction)
+    """
+    n = len(base)
+    lignes = [[Fraction(x) for x in ligne] + [Fraction(int(i == j)) for j in range(n)]
+              for i, ligne in enumerate(base)]
+    for colonne in range(n):
+        pivot = next(i for i in range(colonne, n) if lignes[i][colonne] != 0)
+        lignes[colonne], lignes[pivot] = lignes[pivot], lignes[colonne]
+        p = lignes[colonne][colonne]
+        lignes[colonne] = [x / p for x in lignes[colonne]]
+        for i in range(n):
+            if i != colonne and lignes[i][colonne] != 0:
+                f = lignes[i][colonne]
+                lignes[i] = [x - f * y for x, y in zip(lignes[i], lignes[colonne])]
+    inverse = [ligne[n:] for ligne in lignes]
+    d = reduce(lambda u, v: u * v // gcd(u, v), (x.denominator for ligne in inverse for x in ligne))
+    return [[int(x * d) for x in ligne] for ligne in inverse], d
+
+
+def attaque_tronquee(sorties, a, c, m, decalage):
+    """
+        Entrée :
+            sorties : tableau (nb_sequences, k) des bits de poids fort observés,
+                      sortie = x >> decalage, pour des LCG de mêmes paramètres
+            a, c, m : paramètres du LCG (connus)
+            decalage : nombre de bits de poids faible cachés
+
+        Sortie :
+            retourne un dictionnaire : "etats" (valeur complète de la première
+            sortie de chaque séquence), "graine" (terme précédent), "succes"
+            (la valeur retrouvée redonne toutes les sorties observées) et
+            "debit" (séquences cassées par seconde)
+
+        Principe :
+            x_i = A_i*x_0 + C_i (mod m) avec (A_i, C_i) = puissance_affine(a, c, m, i) :
+            le vecteur (x_i - C_i) est un point du réseau engendré par
+            (A_0, ..., A_(k-1)) et les m*e_i, proche de la cible
+            (sortie_i * 2^decalage + 2^(decalage-1) - C_i). Le réseau ne dépend
+            que de (a, c, m) : il est réduit une seule fois par LLL, puis le point
+            le plus proche de chaque cible est obtenu par l’arrondi de Babai
+            (coordonnées de la cible dans la base réduite, arrondies).
+    """
+    debut = perf_counter()
+    sorties = np.asarray(sorties, dtype=object)
+    if sorties.ndim == 1:
+        sorties = sorties[None, :]
+    k = sorties.shape[1]
+    coefficients = [puissance_affine(a, c, m, i) for i in range(k)]
+    base = [[A for A, _ in coefficients]] + [[m * (i == j) for j in range(k)] for i in range(1, k)]
+    reduite = reduction_lll(base)
+    inverse, d = _inverse_entier(reduite)
+
+    decales = np.array([C for _, C in coefficients], dtype=object)
+    cibles = (sorties << decalage) + (1 << decalage >> 1) - decales
+    coordonnees = (2 * cibles.dot(np.array(inverse, dtype=object)) + d) // (2 * d)
+    etats = (coordonnees.dot(np.array(reduite, dtype=object))[:, 0]) % m
+
+    A = np.array([A for A, _ in coefficients], dtype=object)
+    retrouvees = ((A[None, :] * etats[:, None] + decales[None, :]) % m) >> decalage
+    succes = np.all(retrouvees == sorties, axis=1)
+    inv_a = modinverse(a, m)
+    graine = (inv_a * (etats - c)) % m
+    duree = perf_counter() - debut
+    return {"etats": etats, "graine": graine, "succes": succes,
+            "debit": len(sorties) / duree if duree > 0 else float("inf")}
+
+
 if __name__ == "__main__":
     print("---------Cas 1: on connaît les paramètres a, c et m ------------")
     m, a, c,  = 1024, 585, 899 #paramètres connus
@@ -150,4 +411,26 @@ if __name__ == "__main__":
     print(seq_reconstruite)
     
     print("\n---------Cas 2: on ne connaît pas les paramètres a, c et m------------")
-    print(attaque_cas2(seq, long_seq))
\ No newline at end of file
+    print(attaque_cas2(seq, long_seq))
+
+    print("\n---------Cas 3: 10000 séquences interceptées, paramètres inconnus------------")
+    rng = np.random.default_rng(2026)
+    m = 2**31 - 1
+    parametres = rng.integers(2, m, size=(10000, 3)).tolist()
+    sequences = np.array([linear_congruential_generator(m, a, c, x, 10) for a, c, x in parametres])
+    resultat = attaque_lot(sequences)
+    graines = np.array([x for _, _, x in parametres])
+    print(f"{resultat['succes'].mean():.1%} des séquences cassées, graines exactes : "
+          f"{np.mean(resultat['graine'] == graines):.1%}, {resultat['debit']:.0f} séquences par seconde")
+    # un succès annoncé donne toujours le vrai module (jamais un multiple) et la vraie graine
+    casses = resultat["succes"]
+    assert(np.all(resultat["m"][casses] == m) and np.all(resultat["graine"][casses] == graines[casses]))
+
+    print("\n---------Cas 4: sorties tronquées (32 bits de poids fort d'un LCG de module 2^48)------------")
+    m, a, c = 2**48, 0x5DEECE66D, 11
+    graines = [int(g) for g in rng.integers(0, m, size=1000, dtype=np.uint64)]
+    sorties = [[x >> 16 for x in linear_congruential_generator(m, a, c, g, 4)] for g in graines]
+    resultat = attaque_tronquee(sorties, a, c, m, 16)
+    print(f"{resultat['succes'].mean():.1%} des séquences cassées, graines exactes : "
+          f"{np.mean(resultat['graine'] == np.array(graines, dtype=object)):.1%}, "
+          f"{resultat['debit']:.0f} séquences par seconde")
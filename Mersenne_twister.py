@@ -1,4 +1,128 @@
-class MersenneTwister:
+import copy
+import numpy as np
+from cache_disque import lire_cache, ecrire_cache
+from flux import FluxAleatoire
+
+
+#########################################
+#   Polynômes sur GF(2) (sauts en avant)  #
+#########################################
+# un polynôme sur GF(2) est représenté par un entier : le bit i est le coefficient de x^i
+
+# _ETALEMENT[o] : octet o dont les bits sont espacés d'un zéro (carré d'un polynôme de degré < 8)
+_ETALEMENT = [sum(((o >> i) & 1) << (2*i) for i in range(8)).to_bytes(2, "little") for o in range(256)]
+
+
+def _carre_gf2(a: int) -> int:
+    """calcule a(x)^2 sur GF(2) : les termes croisés s'annulent, il suffit d'espacer les bits
+
+    Args:
+        a (int): polynôme
+
+    Returns:
+        int: polynôme a(x)^2
+    """
+    octets = a.to_bytes((a.bit_length() + 7) // 8, "little")
+    return int.from_bytes(b"".join(map(_ETALEMENT.__getitem__, octets)), "little")
+
+
+def _reduire_gf2(a: int, p: int) -> int:
+    """calcule a(x) mod p(x) sur GF(2) par division euclidienne
+
+    Args:
+        a (int): polynôme à réduire
+        p (int): polynôme diviseur
+
+    Returns:
+        int: reste de la division
+    """
+    degre = p.bit_length() - 1
+    while a.bit_length() > degre:
+        a ^= p << (a.bit_length() - 1 - degre)
+    return a
+
+
+def _puissance_x_gf2(e: int, p: int) -> int:
+    """calcule x^e mod p(x) sur GF(2) par exponentiation rapide
+
+    Args:
+        e (int): exposant
+        p (int): polynôme modulo
+
+    Returns:
+        int: polynôme x^e mod p(x)
+    """
+    resultat = 1
+    for bit in bin(e)[2:]:
+        resultat = _reduire_gf2(_carre_gf2(resultat), p)
+        if bit == "1":
+            resultat = _reduire_gf2(resultat << 1, p)
+    return resultat
+
+
+def _pgcd_gf2(a: int, b: int) -> int:
+    """calcule le pgcd de deux polynômes sur GF(2) avec l'algorithme d'Euclide
+
+    Args:
+        a, b (int): polynômes
+
+    Returns:
+        int: pgcd(a, b)
+    """
+    while b:
+        a, b = b, _reduire_gf2(a, b)
+    return a
+
+
+def _ppcm_gf2(a: int, b: int) -> int:
+    """calcule le ppcm de deux polynômes sur GF(2) : a * (b / pgcd(a, b))
+
+    Args:
+        a, b (int): polynômes
+
+    Returns:
+        int: ppcm(a, b)
+    """
+    # quotient exact de b par le pgcd
+    diviseur = _pgcd_gf2(a, b)
+    degre = diviseur.bit_length() - 1
+    quotient = 0
+    while b.bit_length() > degre:
+        decalage = b.bit_length() - 1 - degre
+        quotient |= 1 << decalage
+        b ^= diviseur << decalage
+    # produit de a par le quotient
+    resultat = 0
+    while quotient:
+        resultat ^= a << ((quotient & -quotient).bit_length() - 1)
+        quotient &= quotient - 1
+    return resultat
+
+
+def _berlekamp_massey(bits: bytes) -> int:
+    """renvois le polynôme minimal d'une suite de bits
+
+    Args:
+        bits (bytes): suite de bits (un bit par octet)
+
+    Returns:
+        int: polynôme caractéristique P tel que P(T) annule la récurrence qui produit la suite
+    """
+    c = b = 1       # polynômes de connexion courant et précédent
+    L, m = 0, -1    # complexité linéaire et position du dernier changement de L
+    fenetre = 0     # bit j de fenetre : bits[n-j]
+    for n, bit in enumerate(bits):
+        fenetre = (fenetre << 1) | bit
+        if (c & fenetre).bit_count() & 1:
+            precedent = c
+            c ^= b << (n - m)
+            if 2*L <= n:
+                L, m, b = n + 1 - L, n, precedent
+    # le polynôme caractéristique est le réciproque du polynôme de connexion
+    return int(format(c, f"0{L+1}b")[::-1], 2)
+
+
+class MersenneTwister(FluxAleatoire):
     def __init__(self, seed: int): 
         """Initialiation de MersenneTwister avec la norme MT19937 pour 32 bits
 
@@ -35,23 +159,38 @@ class MersenneTwister:
     def twist(self):
         """effectue un twist pour regénérer une nouvelle matrice
         """
-        newMT = [0] * self.n
-        for i in range(self.n):
-            mti = self.MT[i]
-            mti1 = self.MT[(i+1) % self.n]
-            mtim = self.MT[(i+self.m) % self.n]
-            
-            Y = (mti & 0x80000000) | (mti1 & 0x7FFFFFFF)
-            
-            Ydecal = Y >> 1
-            if Y & 1: 
-                Ydecal = Ydecal ^ self.a
-            
-            newMT[i] = mtim ^ Ydecal
-        
-        self.MT = newMT
+        self.MT = self._twist_tableau(np.array(self.MT, dtype=np.uint32)).tolist()
         self.INDEX = 0
 
+    def _twist_tableau(self, mt: np.ndarray) -> np.ndarray:
+        """twist vectorisé : les 624 mots sont recalculés en une seule passe NumPy
+
+        Chaque nouveau mot ne dépend que de l'ancienne matrice (MT[i], MT[i+1], MT[i+m]),
+        ce qui permet de remplacer la boucle par des décalages circulaires du tableau.
+
+        Args:
+            mt (np.ndarray): matrice courante (uint32)
+
+        Returns:
+            np.ndarray: nouvelle matrice (uint32)
+        """
+        Y = (mt & 0x80000000) | (np.roll(mt, -1) & 0x7FFFFFFF)
+        return np.roll(mt, -self.m) ^ (Y >> 1) ^ ((Y & 1) * np.uint32(self.a))
+
+    def _temper_tableau(self, y: np.ndarray) -> np.ndarray:
+        """tempering vectorisé d'un tableau de mots de la matrice
+
+        Args:
+            y (np.ndarray): mots à tempérer (uint32)
+
+        Returns:
+            np.ndarray: nombres aléatoires correspondants (uint32)
+        """
+        y = y ^ ((y >> self.u) & self.d)
+        y = y ^ ((y << self.s) & self.b)
+        y = y ^ ((y << self.t) & self.c)
+        return y ^ (y >> self.l)
+
     def temper(self):      
         """effectue la génération d'un nombre aléatoire a partir de la matrice
 
@@ -79,7 +218,165 @@ class MersenneTwister:
         """
         return self.temper()
 
-    
+    def random_uint32(self, n: int) -> np.ndarray:
+        """renvois n nombres aléatoires en un seul appel
+
+        Les nombres sont identiques à ceux qu'auraient renvoyés n appels successifs
+        à next_number(), mais la matrice est twistée et tempérée par blocs entiers.
+
+        Args:
+            n (int): nombre de valeurs à générer
+
+        Returns:
+            np.ndarray: tableau de n entiers non signés 32 bits
+        """
+        sortie = np.empty(n, dtype=np.uint32)
+        mt = np.array(self.MT, dtype=np.uint32)
+        pos = 0
+        while pos < n:
+            if self.INDEX >= self.n:
+                mt = self._twist_tableau(mt)
+                self.INDEX = 0
+            nb = min(self.n - self.INDEX, n - pos)
+            sortie[pos:pos+nb] = self._temper_tableau(mt[self.INDEX:self.INDEX+nb])
+            self.INDEX += nb
+            pos += nb
+        self.MT = mt.tolist()
+        return sortie
+
+    def jump(self, k: int):
+        """avance le générateur de 2^k nombres sans les générer
+
+        Les twists successifs sont une application linéaire T sur GF(2). Avancer de q twists
+        revient à calculer x^q mod P(x), où P est le polynôme caractéristique de T, puis à
+        évaluer ce polynôme en T sur l'état (schéma de Horner, environ 20 000 twists vectorisés).
+        Les polynômes x^q mod P(x) sont mis en cache sur le disque.
+
+        Args:
+            k (int): le générateur avance de 2^k nombres
+
+        Returns:
+            MersenneTwister: le générateur lui-même
+        """
+        if k < 0:
+            raise ValueError("k doit être positif")
+        # avancer de nb mots : q twists puis la position dans la nouvelle matrice
+        # (INDEX reste dans [1, n] pour obtenir exactement l'état d'une génération mot à mot)
+        nb = 1 << k
+        total = self.INDEX + nb
+        q = (total - 1) // self.n
+        base = (nb - 1) // self.n  # nombre de twists quand INDEX = 0, q - base vaut 0, 1 ou 2
+        mt = np.array(self.MT, dtype=np.uint32)
+        if base > polynome_caracteristique().bit_length():
+            mt = self._appliquer_polynome(_polynome_saut(k), mt)
+            q -= base
+        for _ in range(q):
+            mt = self._twist_tableau(mt)
+        self.MT = mt.tolist()
+        self.INDEX = total - ((total - 1) // self.n) * self.n
+        return self
+
+    def spawn(self, n: int, k: int = 64) -> list["MersenneTwister"]:
+        """crée n générateurs dont les flux ne se chevauchent pas (un par processus)
+
+        Le i-ème générateur démarre 2^k * i nombres après la position courante, puis le
+        générateur courant est avancé de 2^k * n nombres pour ne pas recouvrir leurs flux.
+
+        Args:
+            n (int): nombre de générateurs à créer
+            k (int, optional): chaque flux dispose de 2^k nombres. Defaults to 64.
+
+        Returns:
+            list[MersenneTwister]: générateurs indépendants
+        """
+        generateurs = []
+        for _ in range(n):
+            generateurs.append(copy.deepcopy(self))
+            self.jump(k)
+        return generateurs
+
+    def _appliquer_polynome(self, g: int, mt: np.ndarray) -> np.ndarray:
+        """calcule g(T)(mt), où T est le twist, par le schéma de Horner
+
+        Args:
+            g (int): polynôme sur GF(2)
+            mt (np.ndarray): matrice (uint32)
+
+        Returns:
+            np.ndarray: matrice obtenue (uint32)
+        """
+        resultat = np.zeros_like(mt)
+        for bit in bin(g)[2:]:
+            resultat = self._twist_tableau(resultat)
+            if bit == "1":
+                resultat ^= mt
+        return resultat
+
+
+
+_POLYNOMES: dict = {}
+
+
+def polynome_caracteristique() -> int:
+    """renvois le polynôme caractéristique du twist (calculé une seule fois puis lu sur le disque)
+
+    Returns:
+        int: polynôme P sur GF(2)
+    """
+    if "P" not in _POLYNOMES:
+        donnees = lire_cache("mt_polynome.bin")
+        if donnees is None:
+            # le polynôme minimal de la suite d'un bit de l'état au fil des twists divise celui
+            # du twist : on prend le ppcm sur plusieurs états jusqu'à atteindre le degré n*w
+            generateur = MersenneTwister(5489)
+            P, essais = 1, 0
+            while P.bit_length() - 1 < generateur.n * generateur.w and essais < 8:
+                mt = generateur.random_uint32(generateur.n)
+                bits = bytearray(2 * generateur.n * generateur.w + 64)
+                for i in range(len(bits)):
+                    bits[i] = mt[0] & 1
+                    mt = generateur._twist_tableau(mt)
+                nouveau = _ppcm_gf2(P, _berlekamp_massey(bits))
+                essais = essais + 1 if nouveau == P else 0
+                P = nouveau
+            donnees = P.to_bytes((P.bit_length() + 7) // 8, "little")
+            ecrire_cache("mt_polynome.bin", donnees)
+        _POLYNOMES["P"] = int.from_bytes(donnees, "little")
+    return _POLYNOMES["P"]
+
+
+def polynome_twists(q: int) -> int:
+    """renvois x^q mod P(x) : évalué en T (le twist), ce polynôme donne T^q sur les matrices
+    déjà passées par au moins un twist (image de T)
+
+    Args:
+        q (int): nombre de twists
+
+    Returns:
+        int: polynôme sur GF(2), de degré inférieur à deg(P)
+    """
+    return _puissance_x_gf2(q, polynome_caracteristique())
+
+
+def _polynome_saut(k: int) -> int:
+    """renvois x^q mod P(x) avec q = (2^k - 1) // 624, le nombre de twists d'un saut de 2^k nombres
+
+    Args:
+        k (int): taille du saut (2^k nombres)
+
+    Returns:
+        int: polynôme de saut
+    """
+    if k not in _POLYNOMES:
+        nom = f"mt_saut_{k}.bin"
+        donnees = lire_cache(nom)
+        if donnees is None:
+            g = polynome_twists(((1 << k) - 1) // 624)
+            donnees = g.to_bytes((g.bit_length() + 7) // 8, "little")
+            ecrire_cache(nom, donnees)
+        _POLYNOMES[k] = int.from_bytes(donnees, "little")
+    return _POLYNOMES[k]
+
 
 if __name__ == "__main__":
     mersenne = MersenneTwister(123)
@@ -92,4 +389,22 @@ if __name__ == "__main__":
     print(f" i :   valeurCaculée | valeurThéorique => egalité")
     for i in range(10):
         test = mersenne.next_number()
-        print(f"{i:2} : {test:15} | {reponse_seed_123[i]:15} => {test==reponse_seed_123[i]}")
\ No newline at end of file
+        print(f"{i:2} : {test:15} | {reponse_seed_123[i]:15} => {test==reponse_seed_123[i]}")
+
+    print("tests pour la génération en bloc")
+    bloc = MersenneTwister(123).random_uint32(len(reponse_seed_123))
+    print(f" random_uint32({len(reponse_seed_123)}) == reponse_seed_123 => {bloc.tolist() == reponse_seed_123}")
+    unitaire = MersenneTwister(123)
+    reference = [unitaire.next_number() for _ in range(3000)]
+    mixte = MersenneTwister(123)
+    bloc = [mixte.next_number() for _ in range(7)] + mixte.random_uint32(2993).tolist()
+    print(f" next_number() x 7 + random_uint32(2993) == next_number() x 3000 => {bloc == reference}")
+
+    print("tests pour le saut en avant")
+    saut = MersenneTwister(123)
+    saut.next_number()
+    saut.jump(25)
+    pas_a_pas = MersenneTwister(123)
+    pas_a_pas.next_number()
+    pas_a_pas.random_uint32(1 << 25)
+    print(f" jump(25) == random_uint32(2^25) => {saut.random_uint32(10).tolist() == pas_a_pas.random_uint32(10).tolist()}")
\ No newline at end of file
@@ -1,50 +1,151 @@
 import os
+import numpy as np
+from flux import FluxAleatoire
 from Mersenne_twister import MersenneTwister
-from BBS import BBS
+from BBS import BlumBlumShub
 
-def check_param(mini,maxi,param):
-    """
-    Input:
-        mini (int): borne inférieure exclusive acceptable pour `param`.
-        maxi (int): borne supérieure exclusive acceptable pour `param`.
-        param (int): valeur à vérifier.
+# nombre d'octets lus à la fois dans os.urandom
+TAILLE_ENTROPIE: int = 1 << 16
+# nombre d'octets combinés à la fois pour servir les petits entiers
+TAILLE_RESERVE: int = 1 << 12
 
-    Output:
-        None
 
-    Sémantique:
-        Vérifie que `param` est strictement entre `mini` et `maxi`.
-    """
-    if not(mini < param < maxi):
-        raise RuntimeError(f"La nombre de bits du nombre sortie doit être compri entre {mini+1} et {maxi-1}")
+class NRBG(FluxAleatoire):
+    def __init__(self, seed_p=123, seed_q=456, bits=32, taille_entropie=TAILLE_ENTROPIE):
+        """
+        Input:
+                seed_p, seed_q (int): seeds de la recherche des premiers de BBS (calculés une fois, en cache).
+                bits (int): taille des premiers de BBS.
+                taille_entropie (int): nombre d'octets lus à la fois dans os.urandom.
 
+        Sémantique:
+                Combine trois sources par XOR : os.urandom, un Mersenne Twister et un Blum Blum Shub.
+                Les deux sous-générateurs sont créés une seule fois et gardent leur état entre les
+                appels ; leur état de départ vient de os.urandom (matrice complète du Mersenne
+                Twister, position de départ de BBS), la sortie ne dépend donc plus de seeds fixes.
+                os.urandom est lu par blocs de taille_entropie octets gardés en réserve.
+        """
+        self.taille_entropie = taille_entropie
+        self._entropie = b''
+        self._position = 0
 
-def NRGB(bit_length):
+        self.mt = MersenneTwister(0)
+        self.mt.MT = np.frombuffer(os.urandom(4 * self.mt.n), dtype=np.uint32).tolist()
+        self.mt.INDEX = self.mt.n
+        self.bbs = BlumBlumShub(seed_p, seed_q, bits)
+        self.bbs.seek(int.from_bytes(os.urandom(8), 'big'))
+        self._tampon = np.empty(4 * self.TAILLE_BLOC, dtype=np.uint8)
+        self._reserve = b''
+        self._position_reserve = 0
+
+    def _lire_entropie(self, octets):
+        """
+        Input:
+                octets (np.ndarray): tableau d'octets à remplir avec os.urandom.
+
+        Sémantique:
+                Les petites demandes sont servies par la réserve, les grandes demandes lisent
+                directement os.urandom en un seul appel.
+        """
+        pos = 0
+        while pos < len(octets):
+            if self._position == len(self._entropie):
+                if len(octets) - pos >= self.taille_entropie:
+                    octets[pos:] = np.frombuffer(os.urandom(len(octets) - pos), dtype=np.uint8)
+                    return
+                self._entropie = os.urandom(self.taille_entropie)
+                self._position = 0
+            nb = min(len(octets) - pos, len(self._entropie) - self._position)
+            octets[pos:pos+nb] = np.frombuffer(self._entropie, dtype=np.uint8, count=nb, offset=self._position)
+            self._position += nb
+            pos += nb
+
+    def fill(self, buffer):
         """
         Input:
-                bit_length (int): nombre de bits souhaité pour la valeur de sortie.
-                                  Doit être strictement compris entre 1 et 33
+                buffer: tampon accessible en écriture (bytearray, memoryview, tableau NumPy...).
+
         Output:
-                int: un entier aléatoire.
+                le tampon rempli.
+
+        Sémantique:
+                Remplit le tampon avec os.urandom, puis lui applique le XOR des octets du Mersenne
+                Twister et de BBS, par blocs de 4*TAILLE_BLOC octets (opérations NumPy sur tout le bloc).
+        """
+        octets = np.frombuffer(memoryview(buffer).cast('B'), dtype=np.uint8)
+        taille = len(self._tampon)
+        for debut in range(0, len(octets), taille):
+            bloc = octets[debut:debut+taille]
+            tampon = self._tampon[:len(bloc)]
+            self._lire_entropie(bloc)
+            for source in (self.mt, self.bbs):
+                source.fill(tampon)
+                bloc ^= tampon
+        return buffer
+
+    def generate(self, nbytes):
+        """
+        Input:
+                nbytes (int): nombre d'octets à générer.
+
+        Output:
+                bytes: octets aléatoires.
+        """
+        return self.read(nbytes)
+
+    def entier(self, bit_length):
+        """
+        Input:
+                bit_length (int): nombre de bits de l'entier, sans limite de taille (au moins 1).
+
+        Output:
+                int: entier aléatoire de bit_length bits au plus.
 
         Sémantique:
-                Génère un nombre pseudo/aléatoire sur 32 bit en combinant trois sources d'entropie.
+                Les petits entiers sont pris dans une réserve de TAILLE_RESERVE octets déjà combinés,
+                pour ne pas payer le coût fixe de fill (lecture des sous-générateurs) à chaque appel.
         """
-        check_param(0,33,bit_length)
-        entropy = os.urandom(4)
-        DRGB1 = MersenneTwister(123)
-        DRGB2 = BBS(1)[0]
-        s1 = int.from_bytes(entropy, 'big') # 32 bits
-        s2 = DRGB1.next_number() # 32 bits
-        s3 = DRGB2 # 64 bits
+        if bit_length < 1:
+            raise RuntimeError("La nombre de bits du nombre sortie doit être supérieur ou égal à 1")
+        nbytes = (bit_length + 7) // 8
+        if nbytes > TAILLE_RESERVE:
+            octets = self.read(nbytes)
+        else:
+            if self._position_reserve + nbytes > len(self._reserve):
+                self._reserve = self.read(TAILLE_RESERVE)
+                self._position_reserve = 0
+            octets = self._reserve[self._position_reserve:self._position_reserve+nbytes]
+            self._position_reserve += nbytes
+        return int.from_bytes(octets, 'big') & ((1 << bit_length) - 1)
+
+
+_NRBG = None
 
-        mask = (1 << bit_length) - 1 
-        result = (s1 ^ s2 ^ s3) & mask 
 
-        return result
+def NRGB(bit_length):
+        """
+        Input:
+                bit_length (int): nombre de bits souhaité pour la valeur de sortie (au moins 1).
+        Output:
+                int: un entier aléatoire.
+
+        Sémantique:
+                Génère un nombre aléatoire en combinant trois sources d'entropie, avec une instance
+                de NRBG partagée par le module (créée au premier appel).
+        """
+        global _NRBG
+        if _NRBG is None:
+            _NRBG = NRBG()
+        return _NRBG.entier(bit_length)
 
 
 if __name__ == "__main__":
+    from time import perf_counter
+
     res = NRGB(32)
     print(res)
-
+    print(f"entier de 256 bits : {NRGB(256):#066x}")
+    generateur = NRBG()
+    debut = perf_counter()
+    generateur.generate(1 << 20)
+    print(f"1 Mio en {perf_counter() - debut:.2f} s")
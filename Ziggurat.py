@@ -0,0 +1,254 @@
+import math
+import numpy as np
+from Mersenne_twister import MersenneTwister
+from distributions import uniformes_53
+from flux import FluxAleatoire
+
+SEED: int = 123
+# nombre de couches de chaque ziggurat (indice de couche sur 8 bits)
+NB_COUCHES: int = 256
+# nombre de tirages faits à la fois
+TAILLE_LOT: int = 1 << 15
+# bord droit de la couche du bas (début de la queue) pour 256 couches
+R_NORMALE: float = 3.6541528853610088
+R_EXPONENTIELLE: float = 7.6971174701310497
+
+
+def _tables(densite, inverse, r: float, aire_queue: float):
+    """construit les tables d'un ziggurat de NB_COUCHES couches de même aire
+
+    Args:
+        densite: densité non normalisée, décroissante sur [0, +inf[ avec densite(0) = 1
+        inverse: réciproque de densite
+        r (float): bord droit de la couche du bas
+        aire_queue (float): aire sous la densité au-delà de r
+
+    Returns:
+        tuple: (x, seuils, f) où x[i] est le bord droit de la couche i (x[NB_COUCHES] = 0),
+               seuils[i] = x[i+1] / x[i] et f[i] = densite(x[i])
+    """
+    aire = r * densite(r) + aire_queue
+    x = np.zeros(NB_COUCHES + 1)
+    x[0] = aire / densite(r)  # la couche du bas contient la queue
+    x[1] = r
+    for i in range(1, NB_COUCHES - 1):
+        x[i + 1] = inverse(densite(x[i]) + aire / x[i])
+    f = np.array([densite(v) for v in x])
+    f[NB_COUCHES] = 1.0
+    return x, x[1:] / x[:-1], f
+
+
+X_NORMALE, SEUILS_NORMALE, F_NORMALE = _tables(
+    lambda x: math.exp(-0.5 * x * x), lambda y: math.sqrt(-2.0 * math.log(y)),
+    R_NORMALE, math.sqrt(math.pi / 2) * math.erfc(R_NORMALE / math.sqrt(2)))
+X_EXPONENTIELLE, SEUILS_EXPONENTIELLE, F_EXPONENTIELLE = _tables(
+    lambda x: math.exp(-x), lambda y: -math.log(y),
+    R_EXPONENTIELLE, math.exp(-R_EXPONENTIELLE))
+
+
+class Ziggurat(FluxAleatoire):
+    def __init__(self, seed: int = SEED):
+        """Générateur de nombres de loi Normale Centrée Réduite et de loi Exponentielle (λ = 1)
+        par la méthode du Ziggurat (Marsaglia et Tsang)
+
+        Chaque tirage utilise 64 bits de la source (deux mots du Mersenne Twister) : 8 bits pour
+        la couche, 1 bit pour le signe (loi Normale) et 52 bits pour la position dans la couche.
+        Dans 99 % des cas le nombre est accepté par une seule comparaison, sans logarithme ni
+        racine. Les tirages sont faits par lots avec NumPy, comme pour NormalSampler.
+
+        Args:
+            seed (int, optional): seed de la source uniforme. Defaults to SEED.
+        """
+        self.uniforme: MersenneTwister = MersenneTwister(seed)
+        self._reserves = {"normale": np.empty(0), "exponentielle": np.empty(0)}
+        self._positions = {"normale": 0, "exponentielle": 0}
+
+    def _uniformes(self, n: int) -> np.ndarray:
+        """n flottants uniformes dans [0, 1)"""
+        return uniformes_53(self.uniforme.random_uint32(2 * n))
+
+    def _mots_64(self, n: int) -> np.ndarray:
+        """n entiers de 64 bits formés de deux mots de la source"""
+        mots = self.uniforme.random_uint32(2 * n).astype(np.uint64).reshape(-1, 2)
+        return (mots[:, 0] << np.uint64(32)) | mots[:, 1]
+
+    def _lot(self, loi: str) -> np.ndarray:
+        """effectue TAILLE_LOT tirages et renvois les nombres acceptés, dans l'ordre des tirages"""
+        normale = loi == "normale"
+        x_couches, seuils, f = (X_NORMALE, SEUILS_NORMALE, F_NORMALE) if normale else \
+            (X_EXPONENTIELLE, SEUILS_EXPONENTIELLE, F_EXPONENTIELLE)
+
+        mots = self._mots_64(TAILLE_LOT)
+        couches = (mots & np.uint64(0xFF)).astype(np.intp)
+        u = (mots >> np.uint64(12)).astype(np.float64) * (1.0 / (1 << 52))
+        x = u * x_couches[couches]
+        gardes = u < seuils[couches]  # sous la couche du dessus : accepté directement
+
+        # queue : couche du bas au-delà de r
+        queue = np.flatnonzero(~gardes & (couches == 0))
+        if len(queue):
+            x[queue] = self._queue(normale, len(queue))
+            gardes[queue] = True
+
+        # coin : entre le bord de la couche et la courbe, accepté si le point est sous la densité
+        coins = np.flatnonzero(~gardes)
+        if len(coins):
+            i = couches[coins]
+            y = f[i] + self._uniformes(len(coins)) * (f[i + 1] - f[i])
+            xc = x[coins]
+            densite = np.exp(-0.5 * xc * xc) if normale else np.exp(-xc)
+            gardes[coins] = y < densite
+
+        if normale:
+            x = np.where((mots >> np.uint64(8)) & np.uint64(1), -x, x)
+        return x[gardes]
+
+    def _queue(self, normale: bool, n: int) -> np.ndarray:
+        """n nombres de la queue au-delà de r
+
+        Loi Exponentielle : r + Exp(1) (absence de mémoire). Loi Normale : méthode de Marsaglia,
+        x = -ln(U1)/r et y = -ln(U2) jusqu'à ce que 2y > x², le résultat est r + x.
+        """
+        if not normale:
+            return R_EXPONENTIELLE - np.log1p(-self._uniformes(n))
+        resultat = np.empty(n)
+        restants = np.arange(n)
+        while len(restants):
+            u = self._uniformes(2 * len(restants))
+            x = -np.log1p(-u[0::2]) / R_NORMALE
+            y = -np.log1p(-u[1::2])
+            acceptes = 2.0 * y > x * x
+            resultat[restants[acceptes]] = R_NORMALE + x[acceptes]
+            restants = restants[~acceptes]
+        return resultat
+
+    def _suivant(self, loi: str) -> float:
+        """renvois le nombre suivant de la réserve de la loi"""
+        position = self._positions[loi]
+        if position == len(self._reserves[loi]):
+            self._reserves[loi] = self._lot(loi)
+            position = 0
+        self._positions[loi] = position + 1
+        return float(self._reserves[loi][position])
+
+    def _tirer(self, loi: str, n: int) -> np.ndarray:
+        """renvois les n nombres suivants de la réserve de la loi, complétée par des lots"""
+        sortie = np.empty(n)
+        rempli = 0
+        while rempli < n:
+            if self._positions[loi] == len(self._reserves[loi]):
+                self._reserves[loi] = self._lot(loi)
+                self._positions[loi] = 0
+            position = self._positions[loi]
+            nb = min(n - rempli, len(self._reserves[loi]) - position)
+            sortie[rempli:rempli+nb] = self._reserves[loi][position:position+nb]
+            self._positions[loi] += nb
+            rempli += nb
+        return sortie
+
+    def normal(self, n: int) -> np.ndarray:
+        """renvois n nombres aléatoires qui suivent une loi Normale Centrée Réduite
+
+        Args:
+            n (int): nombre de nombres
+
+        Returns:
+            np.ndarray: tableau de n flottants (float64)
+        """
+        return self._tirer("normale", n)
+
+    def exponentielle(self, n: int) -> np.ndarray:
+        """renvois n nombres aléatoires qui suivent une loi Exponentielle de paramètre 1
+
+        Args:
+            n (int): nombre de nombres
+
+        Returns:
+            np.ndarray: tableau de n flottants (float64)
+        """
+        return self._tirer("exponentielle", n)
+
+    def next_normal(self) -> float:
+        """renvois un nombre aléatoire qui suit une loi Normale Centrée Réduite
+
+        Returns:
+            float: nombre aléatoire généré
+        """
+        return self._suivant("normale")
+
+    def next_exponentielle(self) -> float:
+        """renvois un nombre aléatoire qui suit une loi Exponentielle de paramètre 1
+
+        Returns:
+            float: nombre aléatoire généré
+        """
+        return self._suivant("exponentielle")
+
+    def random_uint32(self, n: int) -> np.ndarray:
+        """renvois n mots de la source uniforme (flux d'octets de read et fill)
+
+        Args:
+            n (int): nombre de mots
+
+        Returns:
+            np.ndarray: tableau de n entiers non signés 32 bits
+        """
+        return self.uniforme.random_uint32(n)
+
+    def __iter__(self):
+        """itère sans fin sur les nombres de loi Normale
+
+        Yields:
+            float: nombre aléatoire généré
+        """
+        while True:
+            yield from self.normal(self.TAILLE_BLOC).tolist()
+
+
+def verifier_queues(echantillonneur: Ziggurat, n: int = 10_000_000) -> dict[str, list[str]]:
+    """vérifie les deux lois et leurs queues avec les tests de testsStatistiques
+
+    Les nombres sont ramenés à une loi uniforme par leur fonction de répartition, avant de
+    passer effectuer_test. Pour les queues, seuls les nombres au-delà de r (ceux produits par
+    l'algorithme de queue) sont gardés, et ramenés à une loi uniforme par la fonction de
+    répartition conditionnelle.
+
+    Args:
+        echantillonneur (Ziggurat): générateur à vérifier
+        n (int, optional): nombre de tirages de chaque loi. Defaults to 10_000_000.
+
+    Returns:
+        dict[str, list[str]]: interprétations de effectuer_test pour "normale", "queue normale",
+                              "exponentielle" et "queue exponentielle"
+    """
+    from scipy.special import ndtr, erfc
+    from testsStatistiques import effectuer_test
+
+    normale = echantillonneur.normal(n)
+    queue = np.abs(normale[np.abs(normale) > R_NORMALE])
+    survie_r = 0.5 * math.erfc(R_NORMALE / math.sqrt(2))
+    exponentielle = echantillonneur.exponentielle(n)
+    queue_exp = exponentielle[exponentielle > R_EXPONENTIELLE]
+    return {
+        "normale": effectuer_test(ndtr(normale)),
+        "queue normale": effectuer_test(1.0 - 0.5 * erfc(queue / math.sqrt(2)) / survie_r),
+        "exponentielle": effectuer_test(-np.expm1(-exponentielle)),
+        "queue exponentielle": effectuer_test(-np.expm1(-(queue_exp - R_EXPONENTIELLE))),
+    }
+
+
+if __name__ == "__main__":
+    from time import perf_counter
+    from BoxMuller import NormalSampler
+
+    n = 10_000_000
+    for nom, tirage in [("Box Muller (polaire)", NormalSampler(SEED).normal),
+                        ("Ziggurat normale", Ziggurat(SEED).normal),
+                        ("Ziggurat exponentielle", Ziggurat(SEED).exponentielle)]:
+        debut = perf_counter()
+        tirage(n)
+        duree = perf_counter() - debut
+        print(f"{nom} : {n / duree / 1e6:.1f} millions de nombres par seconde")
+
+    for loi, interpretations in verifier_queues(Ziggurat(SEED)).items():
+        print(f"{loi} : {interpretations}")
@@ -0,0 +1,265 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import threading
+from datetime import datetime
+from time import perf_counter, perf_counter_ns
+
+import numpy as np
+
+from LCG import LCG
+from Mersenne_twister import MersenneTwister
+from BBS import BlumBlumShub
+from BoxMuller import NormalSampler
+from Ziggurat import Ziggurat
+from NRBG import NRBG
+from hash_DRBG import HashDRBG
+from system_generator import random, GenerateurSysteme, TamponEntropie
+
+MODES = ["unitaire", "bloc", "threads"]
+
+
+def _box_muller_bloc(echantillonneur, tampon):
+    """remplit le tampon de nombres de loi Normale (float64)"""
+    valeurs = np.frombuffer(tampon, dtype=np.float64)
+    valeurs[:] = echantillonneur.normal(len(valeurs))
+
+
+def _exponentielle_bloc(echantillonneur, tampon):
+    """remplit le tampon de nombres de loi Exponentielle (float64)"""
+    valeurs = np.frombuffer(tampon, dtype=np.float64)
+    valeurs[:] = echantillonneur.exponentielle(len(valeurs))
+
+
+# générateurs mesurés : nom -> (création d'une instance, appel unitaire, octets produits par
+# appel unitaire, remplissage d'un tampon par l'instance ou None si le mode bloc n'existe pas)
+GENERATEURS = {
+    "LCG": (lambda: LCG(2**32, 1664525, 1013904223, 123),
+            lambda g: g.next_number(), 4, lambda g, tampon: g.fill(tampon)),
+    "Mersenne Twister": (lambda: MersenneTwister(123),
+                         lambda g: g.next_number(), 4, lambda g, tampon: g.fill(tampon)),
+    "BBS": (lambda: BlumBlumShub(),
+            lambda g: g.next_number(), 8, lambda g, tampon: g.fill(tampon)),
+    "Box Muller": (lambda: NormalSampler(123),
+                   lambda g: g.next_number(), 8, _box_muller_bloc),
+    "Ziggurat normale": (lambda: Ziggurat(123),
+                         lambda g: g.next_normal(), 8, _box_muller_bloc),
+    "Ziggurat exponentielle": (lambda: Ziggurat(123),
+                               lambda g: g.next_exponentielle(), 8, _exponentielle_bloc),
+    "NRGB": (lambda: NRBG(),
+             lambda g: g.entier(32), 4, lambda g, tampon: g.fill(tampon)),
+    "Hash DRBG": (lambda: HashDRBG(seedlen=32, reseed_interval=1000),
+                  lambda g: g.next_output(), 32, lambda g, tampon: g.fill(tampon)),
+    "Générateur système": (lambda: GenerateurSysteme(),
+                           lambda g: random(32), 32, lambda g, tampon: g.fill(tampon)),
+    "Générateur système (tampon)": (lambda: TamponEntropie(),
+                                    lambda g: g.read(32), 32, lambda g, tampon: g.fill(tampon)),
+}
+
+
+def _statistiques(durees_ns: list[int], octets_par_appel: int) -> dict:
+    """débit et latences à partir des durées de chaque appel"""
+    durees = np.asarray(durees_ns, dtype=np.float64)
+    moyenne = float(durees.mean())
+    return {
+        "appels": len(durees),
+        "octets_par_s": octets_par_appel * 1e9 / moyenne if moyenne > 0 else float("inf"),
+        "ns_par_appel": moyenne,
+        "p50_ns": float(np.percentile(durees, 50)),
+        "p99_ns": float(np.percentile(durees, 99)),
+    }
+
+
+def mesurer_appels(appel, octets_par_appel: int, duree: float, min_appels: int = 5) -> dict:
+    """appelle appel() en boucle pendant duree secondes en chronométrant chaque appel
+
+    Args:
+        appel: fonction sans argument à mesurer
+        octets_par_appel (int): nombre d'octets produits par un appel
+        duree (float): durée de la mesure en secondes
+        min_appels (int, optional): nombre minimal d'appels. Defaults to 5.
+
+    Returns:
+        dict: appels, octets_par_s, ns_par_appel, p50_ns, p99_ns
+    """
+    appel()  # échauffement (caches, allocation des tampons)
+    durees = []
+    fin = perf_counter() + duree
+    while perf_counter() < fin or len(durees) < min_appels:
+        debut = perf_counter_ns()
+        appel()
+        durees.append(perf_counter_ns() - debut)
+    return _statistiques(durees, octets_par_appel)
+
+
+def mesurer_threads(creer, bloc, taille_bloc: int, duree: float, nb_threads: int) -> dict:
+    """remplit des tampons depuis nb_threads threads, chacun avec sa propre instance
+
+    Args:
+        creer: création d'une instance du générateur
+        bloc: remplissage d'un tampon par une instance
+        taille_bloc (int): taille des tampons en octets
+        duree (float): durée de la mesure en secondes
+        nb_threads (int): nombre de threads
+
+    Returns:
+        dict: mêmes clés que mesurer_appels (octets_par_s cumulé sur tous les threads), plus threads
+    """
+    durees = [[] for _ in range(nb_threads)]
+    depart = threading.Barrier(nb_threads + 1)
+    fin = [0.0]
+
+    def travail(i):
+        generateur = creer()
+        tampon = bytearray(taille_bloc)
+        bloc(generateur, tampon)
+        depart.wait()
+        while perf_counter() < fin[0]:
+            debut = perf_counter_ns()
+            bloc(generateur, tampon)
+            durees[i].append(perf_counter_ns() - debut)
+        if hasattr(generateur, "close"):
+            generateur.close()
+
+    threads = [threading.Thread(target=travail, args=(i,)) for i in range(nb_threads)]
+    for thread in threads:
+        thread.start()
+    fin[0] = float("inf")  # remplacé par la vraie fin dès que tous les threads sont prêts
+    depart.wait()
+    debut = perf_counter()
+    fin[0] = debut + duree
+    for thread in threads:
+        thread.join()
+    ecoule = perf_counter() - debut
+
+    toutes = [d for liste in durees for d in liste]
+    resultat = _statistiques(toutes or [0], taille_bloc)
+    resultat["octets_par_s"] = taille_bloc * len(toutes) / ecoule
+    resultat["threads"] = nb_threads
+    return resultat
+
+
+def lancer_benchmark(noms: list[str] | None = None, modes: list[str] = MODES, duree: float = 0.5,
+                     taille_bloc: int = 1 << 16, nb_threads: int | None = None) -> dict:
+    """mesure chaque générateur dans chaque mode d'accès
+
+    Args:
+        noms (list[str], optional): générateurs à mesurer (clés de GENERATEURS). Defaults to tous.
+        modes (list[str], optional): parmi "unitaire", "bloc", "threads". Defaults to MODES.
+        duree (float, optional): durée de chaque mesure en secondes. Defaults to 0.5.
+        taille_bloc (int, optional): taille des tampons des modes bloc et threads. Defaults to 1 << 16.
+        nb_threads (int, optional): nombre de threads (par défaut le nombre de cœurs, au moins 2). Defaults to None.
+
+    Returns:
+        dict: {"meta": {...}, "resultats": {générateur: {mode: mesures}}}
+    """
+    nb_threads = nb_threads or max(2, os.cpu_count() or 1)
+    resultats = {}
+    for nom in noms or GENERATEURS:
+        creer, unitaire, octets_par_appel, bloc = GENERATEURS[nom]
+        resultats[nom] = {}
+        generateur = creer()
+        if "unitaire" in modes:
+            resultats[nom]["unitaire"] = mesurer_appels(lambda: unitaire(generateur), octets_par_appel, duree)
+        if bloc is not None and "bloc" in modes:
+            tampon = bytearray(taille_bloc)
+            resultats[nom]["bloc"] = mesurer_appels(lambda: bloc(generateur, tampon), taille_bloc, duree)
+        if bloc is not None and "threads" in modes:
+            resultats[nom]["threads"] = mesurer_threads(creer, bloc, taille_bloc, duree, nb_threads)
+        if hasattr(generateur, "close"):
+            generateur.close()
+    return {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "plateforme": platform.platform(),
+            "processeurs": os.cpu_count(),
+            "duree": duree,
+            "taille_bloc": taille_bloc,
+            "threads": nb_threads,
+        },
+        "resultats": resultats,
+    }
+
+
+def comparer(resultats: dict, reference: dict, tolerance: float = 0.10) -> list[str]:
+    """compare le débit de chaque mesure à celui d'une mesure de référence
+
+    Args:
+        resultats (dict): sortie de lancer_benchmark
+        reference (dict): sortie de lancer_benchmark sauvegardée (JSON)
+        tolerance (float, optional): baisse de débit tolérée. Defaults to 0.10.
+
+    Returns:
+        list[str]: les régressions (débit inférieur à (1 - tolerance) fois la référence)
+    """
+    regressions = []
+    for nom, modes in resultats["resultats"].items():
+        for mode, mesure in modes.items():
+            ancienne = reference.get("resultats", {}).get(nom, {}).get(mode)
+            if ancienne is None:
+                continue
+            ratio = mesure["octets_par_s"] / ancienne["octets_par_s"]
+            mesure["ratio_reference"] = ratio
+            if ratio < 1 - tolerance:
+                regressions.append(f"{nom} ({mode}) : {_format_debit(mesure['octets_par_s'])} "
+                                   f"au lieu de {_format_debit(ancienne['octets_par_s'])} (x{ratio:.2f})")
+    return regressions
+
+
+def _format_debit(octets_par_s: float) -> str:
+    """débit lisible (o/s, Ko/s, Mo/s, Go/s)"""
+    for unite in ["o/s", "Ko/s", "Mo/s"]:
+        if octets_par_s < 1024:
+            return f"{octets_par_s:.1f} {unite}"
+        octets_par_s /= 1024
+    return f"{octets_par_s:.1f} Go/s"
+
+
+def afficher(resultats: dict):
+    """affiche un tableau des mesures dans le terminal"""
+    colonnes = ["Générateur", "Mode", "Débit", "ns/appel", "p50 (ns)", "p99 (ns)", "Référence"]
+    lignes = []
+    for nom, modes in resultats["resultats"].items():
+        for mode, mesure in modes.items():
+            ratio = mesure.get("ratio_reference")
+            lignes.append([nom, mode, _format_debit(mesure["octets_par_s"]), f"{mesure['ns_par_appel']:.0f}",
+                           f"{mesure['p50_ns']:.0f}", f"{mesure['p99_ns']:.0f}",
+                           f"x{ratio:.2f}" if ratio is not None else "-"])
+    largeurs = [max(len(ligne[i]) for ligne in lignes + [colonnes]) for i in range(len(colonnes))]
+    print("| " + " | ".join(c.ljust(largeurs[i]) for i, c in enumerate(colonnes)) + " |")
+    print("|" + "|".join("-" * (largeur + 2) for largeur in largeurs) + "|")
+    for ligne in lignes:
+        print("| " + " | ".join(v.ljust(largeurs[i]) for i, v in enumerate(ligne)) + " |")
+
+
+if __name__ == "__main__":
+    parseur = argparse.ArgumentParser(description="Débit et latence des générateurs")
+    parseur.add_argument("--generateurs", nargs="+", choices=list(GENERATEURS), help="générateurs à mesurer (par défaut tous)")
+    parseur.add_argument("--modes", nargs="+", choices=MODES, default=MODES, help="modes d'accès mesurés")
+    parseur.add_argument("--duree", type=float, default=0.5, help="durée de chaque mesure en secondes")
+    parseur.add_argument("--taille-bloc", type=int, default=1 << 16, help="taille des tampons en octets")
+    parseur.add_argument("--threads", type=int, default=None, help="nombre de threads du mode threads")
+    parseur.add_argument("--json", help="fichier où écrire les résultats")
+    parseur.add_argument("--reference", help="résultats sauvegardés auxquels se comparer")
+    parseur.add_argument("--tolerance", type=float, default=0.10, help="baisse de débit tolérée par rapport à la référence")
+    arguments = parseur.parse_args()
+
+    resultats = lancer_benchmark(arguments.generateurs, arguments.modes, arguments.duree,
+                                 arguments.taille_bloc, arguments.threads)
+    regressions = []
+    if arguments.reference:
+        with open(arguments.reference, encoding="utf-8") as f:
+            regressions = comparer(resultats, json.load(f), arguments.tolerance)
+    afficher(resultats)
+    if arguments.json:
+        with open(arguments.json, "w", encoding="utf-8") as f:
+            json.dump(resultats, f, indent=2, ensure_ascii=False)
+    if regressions:
+        print("\nRégressions :")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
@@ -0,0 +1,58 @@
+import os
+
+# dossier des données précalculées (polynômes de saut, paramètres BBS, ...)
+# il peut être déplacé avec la variable d'environnement GENERATEURS_CACHE
+CACHE_DIR: str = os.environ.get(
+    "GENERATEURS_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+)
+
+
+def chemin_cache(nom: str) -> str:
+    """renvois le chemin d'un fichier du cache
+
+    Args:
+        nom (str): nom du fichier dans le cache
+
+    Returns:
+        str: chemin complet du fichier
+    """
+    return os.path.join(CACHE_DIR, nom)
+
+
+def lire_cache(nom: str) -> bytes | None:
+    """lit un fichier du cache
+
+    Args:
+        nom (str): nom du fichier dans le cache
+
+    Returns:
+        bytes | None: contenu du fichier, None s'il n'a pas encore été calculé
+    """
+    try:
+        with open(chemin_cache(nom), "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def ecrire_cache(nom: str, donnees: bytes):
+    """écrit un fichier du cache
+
+    L'écriture passe par un fichier temporaire renommé ensuite, pour qu'un autre
+    processus ne lise jamais un fichier à moitié écrit. Un cache impossible à écrire
+    (dossier en lecture seule, ...) est ignoré : la valeur sera simplement recalculée.
+
+    Args:
+        nom (str): nom du fichier dans le cache
+        donnees (bytes): contenu à enregistrer
+    """
+    chemin = chemin_cache(nom)
+    temporaire = f"{chemin}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(temporaire, "wb") as f:
+            f.write(donnees)
+        os.replace(temporaire, chemin)
+    except OSError:
+        pass
@@ -0,0 +1,186 @@
+import json
+import os
+import struct
+
+import numpy as np
+
+from registre import SEED, TAILLE_TAMPON, avancer, creer, ecrire_flux, type_valeurs, valeurs
+
+# format d'un fichier corpus :
+#   MAGIQUE (8 octets) | longueur de l'en-tête (uint32 petit-boutiste) | en-tête JSON (UTF-8)
+#   | zéros jusqu'au multiple de ALIGNEMENT suivant | valeurs brutes en petit-boutiste
+# l'en-tête contient le générateur, ses paramètres, sa seed, le type et le nombre de valeurs,
+# la position de la première valeur dans le flux du générateur et l'offset des données
+MAGIQUE: bytes = b"CORPUSGA"
+VERSION: int = 1
+# les données commencent sur une page : np.memmap et mmap peuvent les projeter directement
+ALIGNEMENT: int = 4096
+
+
+def _en_tete(informations: dict) -> bytes:
+    """en-tête complet (magique, longueur, JSON, remplissage) avec l'offset des données"""
+    informations = dict(informations, offset=0)
+    while True:
+        texte = json.dumps(informations, ensure_ascii=False).encode("utf-8")
+        taille = len(MAGIQUE) + 4 + len(texte)
+        offset = -(-taille // ALIGNEMENT) * ALIGNEMENT
+        if offset == informations["offset"]:
+            return MAGIQUE + struct.pack("<I", len(texte)) + texte + bytes(offset - taille)
+        informations["offset"] = offset
+
+
+def ecrire_corpus(chemin: str, nom: str, nb_valeurs: int, seed: int = SEED, debut: int = 0,
+                  taille_tampon: int = TAILLE_TAMPON, **parametres) -> "Corpus":
+    """génère un corpus : en-tête puis nb_valeurs valeurs d'un générateur du registre
+
+    Le fichier est écrit sous un nom temporaire puis renommé : un corpus visible est toujours complet.
+
+    Args:
+        chemin (str): fichier à créer
+        nom (str): nom du générateur dans le registre
+        nb_valeurs (int): nombre de valeurs
+        seed (int, optional): seed du générateur. Defaults to SEED.
+        debut (int, optional): position dans le flux de la première valeur gardée. Defaults to 0.
+        taille_tampon (int, optional): taille des écritures. Defaults to TAILLE_TAMPON.
+        **parametres: paramètres du générateur (voir registre.creer)
+
+    Returns:
+        Corpus: le corpus écrit, ouvert en lecture
+    """
+    type = type_valeurs(nom)
+    informations = {"version": VERSION, "generateur": nom, "parametres": parametres, "seed": seed,
+                     "dtype": type.str, "nombre": nb_valeurs, "debut": debut}
+    generateur = creer(nom, seed, **parametres)
+    temporaire = f"{chemin}.{os.getpid()}.tmp"
+    try:
+        avancer(nom, generateur, debut)
+        with open(temporaire, "wb", buffering=taille_tampon) as f:
+            f.write(_en_tete(informations))
+            ecrire_flux(nom, generateur, f, nb_valeurs * type.itemsize, "raw", taille_tampon)
+        os.replace(temporaire, chemin)
+    finally:
+        if os.path.exists(temporaire):
+            os.remove(temporaire)
+        if hasattr(generateur, "close"):
+            generateur.close()
+    return Corpus(chemin)
+
+
+def lire_en_tete(chemin: str) -> dict:
+    """lit l'en-tête d'un corpus sans projeter les données
+
+    Args:
+        chemin (str): fichier corpus
+
+    Returns:
+        dict: generateur, parametres, seed, dtype, nombre, debut, offset, version
+    """
+    with open(chemin, "rb") as f:
+        debut = f.read(len(MAGIQUE) + 4)
+        if len(debut) < len(MAGIQUE) + 4 or debut[:len(MAGIQUE)] != MAGIQUE:
+            raise ValueError(f"{chemin} n'est pas un corpus")
+        (longueur,) = struct.unpack("<I", debut[len(MAGIQUE):])
+        informations = json.loads(f.read(longueur).decode("utf-8"))
+    if informations.get("version", 0) > VERSION:
+        raise ValueError(f"Version de corpus non prise en charge : {informations['version']}")
+    return informations
+
+
+class Corpus:
+    def __init__(self, chemin: str):
+        """Corpus de valeurs générées, projeté en mémoire (np.memmap, lecture seule)
+
+        Les tranches (corpus[debut:fin]) sont des vues sur le fichier, sans copie : seules les
+        pages lues sont chargées. Plusieurs processus qui ouvrent le même corpus partagent les
+        mêmes pages du cache du système.
+
+        Args:
+            chemin (str): fichier écrit par ecrire_corpus
+        """
+        self.chemin = chemin
+        self.informations = lire_en_tete(chemin)
+        self.dtype = np.dtype(self.informations["dtype"])
+        nombre, offset = self.informations["nombre"], self.informations["offset"]
+        if os.path.getsize(chemin) < offset + nombre * self.dtype.itemsize:
+            raise ValueError(f"Corpus tronqué : {chemin}")
+        self.valeurs = np.memmap(chemin, dtype=self.dtype, mode="r", offset=offset, shape=(nombre,))
+
+    @property
+    def generateur(self) -> str:
+        return self.informations["generateur"]
+
+    @property
+    def parametres(self) -> dict:
+        return self.informations["parametres"]
+
+    @property
+    def seed(self):
+        return self.informations["seed"]
+
+    @property
+    def debut(self) -> int:
+        return self.informations["debut"]
+
+    def __len__(self):
+        return len(self.valeurs)
+
+    def __getitem__(self, indice):
+        return self.valeurs[indice]
+
+    def position(self, indice: int) -> int:
+        """renvois la position dans le flux du générateur de la valeur numéro indice du corpus
+
+        Args:
+            indice (int): indice dans le corpus
+
+        Returns:
+            int: position depuis l'initialisation du générateur (utile aux attaques, par exemple
+                 pour les indices de Attaque_MT_GF2.recuperer_etat)
+        """
+        return self.debut + indice
+
+    def octets(self, debut: int = 0, fin: int | None = None) -> np.ndarray:
+        """vue sur les octets bruts des valeurs debut à fin (uint8, sans copie)"""
+        return self.valeurs[debut:fin].view(np.uint8)
+
+    def blocs(self, taille_bloc: int = 1 << 20):
+        """itère sur des vues de taille_bloc valeurs (pour testsStatistiquesFlux.tester_flux)
+
+        Yields:
+            np.ndarray: vue sur le bloc suivant
+        """
+        for debut in range(0, len(self), taille_bloc):
+            yield self.valeurs[debut:debut+taille_bloc]
+
+    def verifier(self, nb_valeurs: int = 1 << 16) -> bool:
+        """regénère les premières valeurs avec le générateur de l'en-tête et les compare au corpus
+
+        Args:
+            nb_valeurs (int, optional): nombre de valeurs comparées. Defaults to 1 << 16.
+
+        Returns:
+            bool: True si le corpus correspond à son en-tête (toujours False pour les générateurs
+                  sans seed, comme le générateur système)
+        """
+        n = min(nb_valeurs, len(self))
+        generateur = creer(self.generateur, self.seed, **self.parametres)
+        try:
+            avancer(self.generateur, generateur, self.debut)
+            return bool(np.array_equal(valeurs(self.generateur, generateur, n), self.valeurs[:n]))
+        finally:
+            if hasattr(generateur, "close"):
+                generateur.close()
+
+
+if __name__ == "__main__":
+    import tempfile
+    from time import perf_counter
+
+    chemin = os.path.join(tempfile.gettempdir(), "mt_123.corpus")
+    debut = perf_counter()
+    corpus = ecrire_corpus(chemin, "mt", 1 << 26, seed=123)
+    print(f"corpus de {len(corpus)} valeurs écrit en {perf_counter() - debut:.1f} s : {corpus.informations}")
+    debut = perf_counter()
+    tranche = Corpus(chemin)[(1 << 25):(1 << 25) + 10]
+    print(f"10 valeurs au milieu du corpus, relues en {1000 * (perf_counter() - debut):.2f} ms : {tranche}")
+    print(f"corpus conforme à son en-tête : {corpus.verifier()}")
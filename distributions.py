@@ -0,0 +1,235 @@
+import numpy as np
+from flux import FluxAleatoire
+
+# nombre d'indices d'échange de melanger convertis à la fois en entiers Python
+TAILLE_PAQUET: int = 1 << 16
+
+
+def uniformes_53(mots: np.ndarray) -> np.ndarray:
+    """convertit des mots de 32 bits en flottants uniformes dans [0, 1) avec 53 bits de précision
+
+    Chaque flottant utilise deux mots consécutifs : les 27 bits de poids fort du premier et les
+    26 bits de poids fort du second forment un entier de 53 bits, divisé par 2^53. Tous les
+    multiples de 2^-53 de [0, 1) sont donc équiprobables.
+
+    Args:
+        mots (np.ndarray): tableau de 2n mots de 32 bits
+
+    Returns:
+        np.ndarray: tableau de n flottants (float64)
+    """
+    mots = np.asarray(mots, dtype=np.uint64).reshape(-1, 2)
+    entiers = ((mots[:, 0] >> np.uint64(5)) << np.uint64(26)) | (mots[:, 1] >> np.uint64(6))
+    return entiers.astype(np.float64) * (1.0 / (1 << 53))
+
+
+class TableAlias:
+    def __init__(self, poids, valeurs=None):
+        """Table d'alias (méthode de Vose) pour tirer un indice avec des probabilités données
+
+        La table est construite une fois en O(k) ; chaque tirage coûte ensuite un entier borné
+        et un flottant uniforme, quel que soit le nombre k de valeurs.
+
+        Args:
+            poids: poids positifs des k valeurs (pas forcément normalisés)
+            valeurs (optional): valeurs renvoyées à la place des indices. Defaults to None.
+        """
+        poids = np.asarray(poids, dtype=np.float64)
+        if poids.ndim != 1 or len(poids) == 0 or np.any(poids < 0) or not np.isfinite(poids).all():
+            raise ValueError("Les poids doivent être une liste non vide de nombres positifs")
+        total = poids.sum()
+        if total <= 0:
+            raise ValueError("La somme des poids doit être strictement positive")
+
+        k = len(poids)
+        probabilites = poids * (k / total)
+        self.seuils = np.ones(k)
+        self.alias = np.arange(k)
+        petits = [i for i in range(k) if probabilites[i] < 1.0]
+        grands = [i for i in range(k) if probabilites[i] >= 1.0]
+        probabilites = probabilites.tolist()
+        while petits and grands:
+            petit, grand = petits.pop(), grands.pop()
+            self.seuils[petit] = probabilites[petit]
+            self.alias[petit] = grand
+            probabilites[grand] -= 1.0 - probabilites[petit]
+            (petits if probabilites[grand] < 1.0 else grands).append(grand)
+        # les restes valent 1 aux erreurs d'arrondi près : seuils déjà à 1
+        self.valeurs = None if valeurs is None else np.asarray(valeurs)
+
+    def __len__(self):
+        return len(self.seuils)
+
+
+class Distributions:
+    def __init__(self, generateur: FluxAleatoire):
+        """Lois usuelles calculées à partir des mots de 32 bits d'un générateur du projet
+
+        Les mots sont lus par blocs : une réserve sert les petits tirages, les grands tirages
+        lisent directement le nombre de mots nécessaire. Dans les deux cas les mots sont
+        consommés dans l'ordre, la suite obtenue ne dépend donc pas de la taille des tirages.
+
+        Args:
+            generateur (FluxAleatoire): source des mots (MersenneTwister, LCG, HashDRBG, ...)
+        """
+        self.generateur = generateur
+        self._reserve = np.empty(0, dtype=np.uint32)
+        self._position = 0
+
+    def mots(self, n: int) -> np.ndarray:
+        """renvois les n mots de 32 bits suivants de la source
+
+        Args:
+            n (int): nombre de mots
+
+        Returns:
+            np.ndarray: tableau de n entiers non signés 32 bits
+        """
+        restants = len(self._reserve) - self._position
+        if n <= restants:
+            sortie = self._reserve[self._position:self._position+n]
+            self._position += n
+            return sortie
+        if n < self.generateur.TAILLE_BLOC:
+            debut = self._reserve[self._position:]
+            self._reserve = self.generateur.random_uint32(self.generateur.TAILLE_BLOC)
+            self._position = n - restants
+            return np.concatenate([debut, self._reserve[:self._position]])
+        debut = self._reserve[self._position:]
+        self._reserve = np.empty(0, dtype=np.uint32)
+        self._position = 0
+        return np.concatenate([debut, self.generateur.random_uint32(n - restants)])
+
+    def uniforme(self, n: int | None = None):
+        """flottants uniformes dans [0, 1) avec 53 bits de précision (deux mots par flottant)
+
+        Args:
+            n (int, optional): nombre de flottants, None pour un seul flottant. Defaults to None.
+
+        Returns:
+            float | np.ndarray: flottant ou tableau de n flottants
+        """
+        valeurs = uniformes_53(self.mots(2 * (1 if n is None else n)))
+        return float(valeurs[0]) if n is None else valeurs
+
+    def entiers(self, borne, n: int | None = None):
+        """entiers uniformes dans [0, borne) sans biais
+
+        Pour borne <= 2^32, méthode presque sans division de Lemire : le produit d'un mot x par
+        borne donne l'entier (x*borne) >> 32 ; seuls les produits dont la partie basse est
+        inférieure à (2^32 - borne) mod borne sont rejetés, et ce reste n'est calculé que si
+        la partie basse est inférieure à borne. Au-delà, deux mots par tirage et rejet des
+        valeurs hors de la plus petite puissance de 2 qui contient borne.
+
+        Args:
+            borne: borne exclusive, entier de 1 à 2^64 ou tableau de bornes (une par tirage, au plus 2^32)
+            n (int, optional): nombre de tirages, None pour un seul entier. Defaults to None.
+
+        Returns:
+            int | np.ndarray: entier ou tableau de n entiers (uint64)
+        """
+        bornes = np.asarray(borne)
+        if bornes.ndim == 1:
+            n = len(bornes)
+        if np.any(bornes < 1):
+            raise ValueError(f"La borne doit être supérieure ou égale à 1: {borne}")
+        taille = 1 if n is None else n
+
+        if bornes.max() <= 1 << 32:
+            valeurs = self._lemire(np.broadcast_to(bornes.astype(np.uint64), (taille,)))
+        elif bornes.ndim == 0 and int(borne) <= 1 << 64:
+            valeurs = self._rejet_64(int(borne), taille)
+        else:
+            raise ValueError(f"La borne doit être au plus 2^64 (2^32 pour un tableau de bornes): {borne}")
+        return int(valeurs[0]) if n is None else valeurs
+
+    def _lemire(self, bornes: np.ndarray) -> np.ndarray:
+        """tirages de Lemire, un mot par tirage plus les tirages rejetés"""
+        resultat = np.empty(len(bornes), dtype=np.uint64)
+        restants = np.arange(len(bornes))
+        while len(restants):
+            s = bornes[restants]
+            produits = self.mots(len(restants)).astype(np.uint64) * s
+            bas = produits & np.uint64(0xFFFFFFFF)
+            acceptes = bas >= s
+            douteux = np.flatnonzero(~acceptes)
+            if len(douteux):
+                seuils = (np.uint64(1 << 32) - s[douteux]) % s[douteux]
+                acceptes[douteux] = bas[douteux] >= seuils
+            resultat[restants[acceptes]] = produits[acceptes] >> np.uint64(32)
+            restants = restants[~acceptes]
+        return resultat
+
+    def _rejet_64(self, borne: int, n: int) -> np.ndarray:
+        """tirages de 64 bits masqués puis rejetés s'ils dépassent borne"""
+        masque = np.uint64((1 << (borne - 1).bit_length()) - 1)
+        resultat = np.empty(n, dtype=np.uint64)
+        restants = np.arange(n)
+        while len(restants):
+            mots = self.mots(2 * len(restants)).astype(np.uint64).reshape(-1, 2)
+            valeurs = ((mots[:, 0] << np.uint64(32)) | mots[:, 1]) & masque
+            if borne == 1 << 64:
+                acceptes = np.ones(len(valeurs), dtype=bool)
+            else:
+                acceptes = valeurs < np.uint64(borne)
+            resultat[restants[acceptes]] = valeurs[acceptes]
+            restants = restants[~acceptes]
+        return resultat
+
+    def choix(self, table: TableAlias, n: int | None = None):
+        """tirages avec les probabilités d'une table d'alias
+
+        Args:
+            table (TableAlias): table construite à partir des poids
+            n (int, optional): nombre de tirages, None pour un seul tirage. Defaults to None.
+
+        Returns:
+            indice(s) tiré(s), ou valeur(s) si la table a des valeurs
+        """
+        taille = 1 if n is None else n
+        colonnes = self.entiers(len(table), taille).astype(np.intp)
+        indices = np.where(self.uniforme(taille) < table.seuils[colonnes], colonnes, table.alias[colonnes])
+        tirages = indices if table.valeurs is None else table.valeurs[indices]
+        return tirages[0].item() if n is None else tirages
+
+    def melanger(self, tableau):
+        """mélange de Fisher–Yates, sur place
+
+        Les n-1 indices d'échange sont tirés en un seul lot (entiers avec une borne par
+        tirage), puis les échanges sont faits sur un tableau d'indices int64 (vu par une
+        memoryview, dont les accès unitaires sont rapides), par paquets de TAILLE_PAQUET
+        échanges convertis à la fois : la mémoire reste de 16 octets par élément. Le tableau
+        NumPy est enfin réordonné en une seule copie.
+
+        Args:
+            tableau: liste ou tableau NumPy (mélangé selon le premier axe)
+
+        Returns:
+            le tableau mélangé
+        """
+        n = len(tableau)
+        if n < 2:
+            return tableau
+        echanges = self.entiers(np.arange(n, 1, -1, dtype=np.uint64))
+        permutation = np.arange(n, dtype=np.int64)
+        indices = memoryview(permutation)
+        for debut in range(0, n - 1, TAILLE_PAQUET):
+            paquet = echanges[debut:debut+TAILLE_PAQUET].tolist()
+            for i, j in zip(range(n - 1 - debut, 0, -1), paquet):
+                indices[i], indices[j] = indices[j], indices[i]
+        if isinstance(tableau, np.ndarray):
+            tableau[...] = tableau[permutation]
+        else:
+            tableau[:] = [tableau[k] for k in permutation.tolist()]
+        return tableau
+
+
+if __name__ == "__main__":
+    from Mersenne_twister import MersenneTwister
+
+    loi = Distributions(MersenneTwister(123))
+    print(f"uniformes : {loi.uniforme(5)}")
+    print(f"dés : {loi.entiers(6, 20) + 1}")
+    table = TableAlias([0.5, 0.3, 0.2], valeurs=["a", "b", "c"])
+    print(f"choix pondéré : {loi.choix(table, 10)}")
+    print(f"mélange : {loi.melanger(list(range(10)))}")
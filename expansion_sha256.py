@@ -0,0 +1,100 @@
+from hashlib import sha256
+import numpy as np
+
+TAILLE_HASH = 32
+# octets de poids faible des données incrémentés comme compteur, le reste est haché une seule fois
+TAILLE_COMPTEUR = 4
+# nombre de blocs dont les compteurs sont préparés à la fois
+BLOCS_PAR_SEGMENT = 1 << 14
+# en dessous de ce nombre d'octets (graines, jetons), chaque bloc est haché directement :
+# préparer les compteurs coûterait plus cher que les quelques hachages
+PETITE_SORTIE = 16 * TAILLE_HASH
+
+
+def _petite_expansion(donnees, taille):
+    """
+    Expansion sans préparation des compteurs, chaque bloc est haché en entier (petites tailles).
+    """
+    longueur = len(donnees)
+    valeur = int.from_bytes(donnees, 'big')
+    modulo = 1 << (8 * longueur)
+    blocs = []
+    for _ in range(0, taille, TAILLE_HASH):
+        blocs.append(sha256(valeur.to_bytes(longueur, 'big')).digest())
+        valeur = (valeur + 1) % modulo
+    return b''.join(blocs)[:taille]
+
+
+def expansion_into(donnees, sortie):
+    """
+    Remplit un tampon avec SHA-256(donnees), SHA-256(donnees+1), SHA-256(donnees+2)...
+    Entrées :
+        donnees (bytes) : Valeur de départ, vue comme un entier gros-boutiste incrémenté
+                          modulo 2^(8*len(donnees)) d'un bloc à l'autre.
+        sortie          : Tampon accessible en écriture (bytearray, memoryview, tableau NumPy...).
+
+    Sortie :
+        (memoryview) : Le tampon rempli, vu comme une suite d'octets.
+
+    Logique : Seuls les TAILLE_COMPTEUR derniers octets (le compteur) changent d'un bloc à
+    l'autre tant qu'il n'y a pas de retenue. Le début des données est absorbé une fois dans un
+    objet sha256 copié pour chaque bloc. Les compteurs d'un segment sont écrits d'un coup avec
+    NumPy, et chaque empreinte est copiée directement à sa place dans le tampon. Le début n'est
+    haché de nouveau qu'au segment suivant une retenue.
+    """
+    sortie = memoryview(sortie).cast('B')
+    longueur = len(donnees)
+    taille_compteur = min(TAILLE_COMPTEUR, longueur)
+    separation = longueur - taille_compteur
+    modulo = 1 << (8 * longueur)
+    periode = 1 << (8 * taille_compteur)
+    valeur = int.from_bytes(donnees, 'big')
+
+    if len(sortie) < PETITE_SORTIE:
+        sortie[:] = _petite_expansion(donnees, len(sortie))
+        return sortie
+
+    pleins, reste = divmod(len(sortie), TAILLE_HASH)
+    bloc = 0
+    while bloc < pleins:
+        compteur = valeur % periode
+        nb = min(pleins - bloc, periode - compteur, BLOCS_PAR_SEGMENT)
+        copie = sha256(valeur.to_bytes(longueur, 'big')[:separation]).copy
+        compteurs = np.arange(compteur, compteur + nb, dtype='>u8').view(np.uint8).reshape(nb, 8)
+        compteurs = memoryview(compteurs[:, 8 - taille_compteur:].tobytes())
+        pos = bloc * TAILLE_HASH
+        for i in range(0, nb * taille_compteur, taille_compteur):
+            h = copie()
+            h.update(compteurs[i:i+taille_compteur])
+            sortie[pos:pos+TAILLE_HASH] = h.digest()
+            pos += TAILLE_HASH
+        valeur = (valeur + nb) % modulo
+        bloc += nb
+    if reste:
+        sortie[len(sortie)-reste:] = sha256(valeur.to_bytes(longueur, 'big')).digest()[:reste]
+    return sortie
+
+
+def expansion(donnees, taille):
+    """
+    Entrées :
+        donnees (bytes) : Valeur de départ (voir expansion_into).
+        taille (int)    : Nombre d'octets à produire.
+
+    Sortie :
+        (bytes) : Les taille premiers octets de SHA-256(donnees) || SHA-256(donnees+1) || ...
+    """
+    if taille < PETITE_SORTIE:
+        return _petite_expansion(donnees, taille)
+    tampon = bytearray(taille)
+    expansion_into(donnees, tampon)
+    return bytes(tampon)
+
+
+if __name__ == "__main__":
+    from time import perf_counter
+
+    tampon = bytearray(1 << 24)
+    debut = perf_counter()
+    expansion_into(bytes(32), tampon)
+    print(f"{len(tampon) / (perf_counter() - debut) / 1e6:.1f} Mo/s")
@@ -0,0 +1,71 @@
+import numpy as np
+
+
+class FluxAleatoire:
+    """Interface commune de lecture en flux des générateurs
+
+    Une classe fille définit au moins l'une des deux méthodes de base :
+        - random_uint32(n) pour les générateurs qui produisent des mots de 32 bits
+        - fill(buffer) pour les générateurs qui produisent des octets
+    l'autre méthode, read et l'itération en découlent. Les grands volumes sont produits par
+    blocs de TAILLE_BLOC mots, la mémoire utilisée ne dépend donc pas de la taille demandée.
+
+    Attention : l'itérateur consomme le générateur par blocs, après avoir lu quelques valeurs
+    avec l'itérateur, le générateur a pu avancer plus loin que les valeurs lues.
+    """
+    TAILLE_BLOC: int = 1 << 16  # nombre de mots générés à la fois
+
+    def random_uint32(self, n: int) -> np.ndarray:
+        """renvois n mots de 32 bits du flux
+
+        Args:
+            n (int): nombre de mots
+
+        Returns:
+            np.ndarray: tableau de n entiers non signés 32 bits (octets du flux en petit-boutiste)
+        """
+        sortie = np.empty(n, dtype="<u4")
+        self.fill(sortie)
+        return sortie.astype(np.uint32, copy=False)
+
+    def fill(self, buffer):
+        """remplit un tampon accessible en écriture avec les octets du flux
+
+        Les mots de 32 bits sont écrits en petit-boutiste, les octets en trop du dernier mot
+        (taille non multiple de 4) sont perdus.
+
+        Args:
+            buffer: tampon (bytearray, memoryview, tableau NumPy contigu, array...)
+
+        Returns:
+            le tampon rempli
+        """
+        octets = memoryview(buffer).cast("B")
+        taille = 4 * self.TAILLE_BLOC
+        for debut in range(0, len(octets), taille):
+            fin = min(debut + taille, len(octets))
+            mots = self.random_uint32((fin - debut + 3) // 4).astype("<u4", copy=False)
+            octets[debut:fin] = mots.view(np.uint8)[:fin - debut]
+        return buffer
+
+    def read(self, nbytes: int) -> bytes:
+        """renvois les nbytes octets suivants du flux
+
+        Args:
+            nbytes (int): nombre d'octets
+
+        Returns:
+            bytes: octets générés
+        """
+        tampon = bytearray(nbytes)
+        self.fill(tampon)
+        return bytes(tampon)
+
+    def __iter__(self):
+        """itère sans fin sur les mots de 32 bits du flux
+
+        Yields:
+            int: mot suivant
+        """
+        while True:
+            yield from self.random_uint32(self.TAILLE_BLOC).tolist()
@@ -0,0 +1,82 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from registre import FORMATS, GENERATEURS, SEED, TAILLE_TAMPON, avancer, creer, ecrire_flux, type_valeurs
+
+_UNITES = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+
+def lire_taille(texte: str) -> int:
+    """convertit une taille lisible ("1G", "512K", "1000000") en nombre
+
+    Args:
+        texte (str): nombre suivi éventuellement d'une unité K, M, G ou T (puissances de 1024)
+
+    Returns:
+        int: taille
+    """
+    texte = texte.strip().upper()
+    if texte and texte[-1] in _UNITES:
+        return int(float(texte[:-1]) * _UNITES[texte[-1]])
+    return int(float(texte))
+
+
+def _parametre(texte: str) -> tuple[str, int]:
+    """lit un paramètre cle=valeur (valeur entière, en décimal, hexadécimal 0x... ou binaire 0b...)"""
+    cle, _, valeur = texte.partition("=")
+    if not cle or not valeur:
+        raise argparse.ArgumentTypeError(f"paramètre attendu sous la forme cle=valeur : {texte}")
+    return cle, int(valeur, 0)
+
+
+if __name__ == "__main__":
+    parseur = argparse.ArgumentParser(description="Écrit le flux d'un générateur sur la sortie standard ou dans un fichier")
+    parseur.add_argument("generateur", nargs="?", choices=list(GENERATEURS), help="générateur (voir --liste)")
+    quantite = parseur.add_mutually_exclusive_group()
+    quantite.add_argument("-n", "--valeurs", type=lire_taille, help="nombre de valeurs (mots de 32 bits ou flottants)")
+    quantite.add_argument("--octets", type=lire_taille, help="nombre d'octets (par défaut flux sans fin en raw et hex)")
+    parseur.add_argument("-f", "--format", choices=FORMATS + ["corpus"], default="raw",
+                         help="format de sortie (corpus : fichier projetable en mémoire, voir corpus.py)")
+    parseur.add_argument("-o", "--sortie", help="fichier de sortie (par défaut la sortie standard)")
+    parseur.add_argument("-s", "--seed", type=lambda v: int(v, 0), default=SEED, help="seed du générateur")
+    parseur.add_argument("-p", "--parametre", type=_parametre, action="append", default=[],
+                         help="paramètre du générateur cle=valeur (répétable), par exemple m=65536")
+    parseur.add_argument("--debut", type=lire_taille, default=0, help="position dans le flux de la première valeur écrite")
+    parseur.add_argument("--tampon", type=lire_taille, default=TAILLE_TAMPON, help="taille des écritures")
+    parseur.add_argument("--liste", action="store_true", help="affiche les générateurs disponibles")
+    arguments = parseur.parse_args()
+
+    if arguments.liste or arguments.generateur is None:
+        for nom, (_, type, _, description) in GENERATEURS.items():
+            print(f"{nom:24} {np.dtype(type).name:8} {description}")
+        sys.exit(0)
+
+    nb_octets = arguments.octets
+    if arguments.valeurs is not None:
+        nb_octets = arguments.valeurs * type_valeurs(arguments.generateur).itemsize
+    if arguments.format == "corpus":
+        from corpus import ecrire_corpus
+        if not arguments.sortie or nb_octets is None:
+            parseur.error("le format corpus demande un fichier (-o) et un nombre de valeurs")
+        ecrire_corpus(arguments.sortie, arguments.generateur, nb_octets // type_valeurs(arguments.generateur).itemsize,
+                      arguments.seed, arguments.debut, arguments.tampon, **dict(arguments.parametre))
+        sys.exit(0)
+
+    generateur = creer(arguments.generateur, arguments.seed, **dict(arguments.parametre))
+    avancer(arguments.generateur, generateur, arguments.debut)
+    sortie = open(arguments.sortie, "wb", buffering=arguments.tampon) if arguments.sortie else sys.stdout.buffer
+    try:
+        ecrire_flux(arguments.generateur, generateur, sortie, nb_octets, arguments.format, arguments.tampon)
+        sortie.flush()
+    except BrokenPipeError:
+        # le lecteur (head, dieharder, ...) a fermé le tube : arrêt sans message d'erreur
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    finally:
+        if arguments.sortie:
+            sortie.close()
+        if hasattr(generateur, "close"):
+            generateur.close()
@@ -1,5 +1,29 @@
 from hashlib import sha256
+from contextvars import ContextVar
+import queue
+import threading
 from system_generator import random
+from flux import FluxAleatoire
+from expansion_sha256 import expansion_into
+
+# taille maximale d'une requête (2^19 bits selon SP 800-90A), au-delà la requête est découpée
+MAX_OCTETS_PAR_REQUETE = 1 << 16
+
+
+def hashgen_into(etat, sortie):
+    """
+    Remplit un tampon en hachant l'état de manière itérative (même résultat que hashgen).
+    Entrées :
+        etat (bytes)   : La valeur interne actuelle qui sert de base au hachage.
+        sortie         : Tampon accessible en écriture (bytearray, memoryview...) à remplir.
+
+    Sortie :
+        (memoryview) : Le tampon rempli, vu comme une suite d'octets.
+
+    Logique : Les blocs hachés sont etat, etat+1, etat+2... (voir expansion_sha256.expansion_into).
+    """
+    return expansion_into(etat, sortie)
+
 
 def hashgen(seedlen, etat):
     """
@@ -14,14 +38,9 @@ def hashgen(seedlen, etat):
     Logique : On hache l'état, puis on l'incrémente de 1 à chaque tour pour que 
     chaque nouveau bloc de 32 octets soit radicalement différent du précédent.
     """
-    data = etat
-    w = b'' #initialisation du bytes à retourner
-    while len(w) < seedlen:
-        w += sha256(data).digest() #on ajoute à w le hashage de data courant
-        data_int = int.from_bytes(data, byteorder='big') + 1 #conversion en int, puis incrémentation 
-        data = data_int.to_bytes(len(data), byteorder='big') #reconversion en bytes
-    
-    return w[:seedlen]
+    w = bytearray(seedlen) #initialisation du tampon à retourner
+    hashgen_into(etat, w)
+    return bytes(w)
 
 def seed(seedlen):
     """
@@ -60,6 +79,28 @@ def generer_hash_DRBG(etat, const, reseed_cpt, reseed_interval, seedlen):
     # Génération des bits pseudo-aléatoires
     bits_retournes = hashgen(seedlen, etat)
     
+    etat = mettre_a_jour_etat(etat, const, reseed_cpt, seedlen)
+    
+    # Incrémenter le compteur de reseed
+    reseed_cpt += 1
+    
+    
+    return bits_retournes, etat, reseed_cpt
+
+
+def mettre_a_jour_etat(etat, const, reseed_cpt, seedlen):
+    """
+    Calcule l'état V suivant après une génération.
+
+    Entrées :
+        etat (bytes)            : L'état V actuel.
+        const (bytes)           : La constante C (graine de sécurité).
+        reseed_cpt (int)        : Compteur du nombre de générations effectuées.
+        seedlen (int)           : Taille de l'état en octets.
+
+    Sortie :
+        etat (bytes) : V = (V + H + C + reseed_cpt) mod 2^(8*seedlen), avec H = Hash(0x03 || V).
+    """
     const_int =  int.from_bytes(const, byteorder='big')
     
     """
@@ -73,13 +114,7 @@ def generer_hash_DRBG(etat, const, reseed_cpt, reseed_interval, seedlen):
     etat_int = int.from_bytes(etat, byteorder='big')
     etat_int = (etat_int + H_int + const_int + reseed_cpt) % (2**(8*seedlen))
     
-    etat = etat_int.to_bytes(seedlen, byteorder='big')
-    
-    # Incrémenter le compteur de reseed
-    reseed_cpt += 1
-    
-    
-    return bits_retournes, etat, reseed_cpt
+    return etat_int.to_bytes(seedlen, byteorder='big')
 
 
 def next_hash_DRBG(etat, const, reseed_cpt, reseed_interval, seedlen, nbIteration = 5):
@@ -94,7 +129,175 @@ def next_hash_DRBG(etat, const, reseed_cpt, reseed_interval, seedlen, nbIteratio
         # print("-------------------------------------------------")
         
     return outputs
-    
+
+
+class HashDRBG(FluxAleatoire):
+    """
+    Hash DRBG qui conserve son état (V, C, compteur de reseed) entre les appels.
+
+    Chaque appel à generate est une requête au sens de SP 800-90A : les octets sont produits
+    directement dans le tampon de sortie, puis l'état est mis à jour une seule fois.
+    Le flux d'octets (read, fill) est donc découpé en requêtes de la taille demandée.
+    """
+    def __init__(self, seedlen=32, reseed_interval=5, etat=None, const=None, reseed_cpt=1):
+        """
+        Entrées :
+            seedlen (int)           : Taille de l'état en octets.
+            reseed_interval (int)   : Limite avant de devoir rafraîchir le hasard.
+            etat (bytes)            : L'état V initial (par défaut une graine système).
+            const (bytes)           : La constante C (par défaut une graine système).
+            reseed_cpt (int)        : Compteur du nombre de générations effectuées.
+        """
+        self.seedlen = seedlen
+        self.reseed_interval = reseed_interval
+        self.etat = etat if etat is not None else seed(seedlen)
+        self.const = const if const is not None else seed(seedlen)
+        self.reseed_cpt = reseed_cpt
+
+    def generate_into(self, buffer):
+        """
+        Remplit un tampon accessible en écriture (bytearray, memoryview, tableau NumPy...).
+
+        Entrée :
+            buffer : tampon à remplir
+
+        Sortie :
+            le tampon rempli
+
+        Logique :
+            Les tampons de plus de MAX_OCTETS_PAR_REQUETE octets sont remplis en plusieurs
+            requêtes successives.
+        """
+        octets = memoryview(buffer).cast('B')
+        for debut in range(0, max(len(octets), 1), MAX_OCTETS_PAR_REQUETE):
+            if self.reseed_cpt > self.reseed_interval:
+                self.etat = seed(self.seedlen)
+                self.reseed_cpt = 1
+            hashgen_into(self.etat, octets[debut:debut+MAX_OCTETS_PAR_REQUETE])
+            self.etat = mettre_a_jour_etat(self.etat, self.const, self.reseed_cpt, self.seedlen)
+            self.reseed_cpt += 1
+        return buffer
+
+    def generate(self, nbytes):
+        """
+        Entrée :
+            nbytes (int) : Nombre d'octets à générer.
+
+        Sortie :
+            (bytes) : Les données aléatoires produites.
+        """
+        tampon = bytearray(nbytes)
+        self.generate_into(tampon)
+        return bytes(tampon)
+
+    def next_output(self):
+        """
+        Sortie :
+            (bytes) : La sortie suivante, identique à celle de generer_hash_DRBG (seedlen octets).
+        """
+        return self.generate(self.seedlen)
+
+    def fill(self, buffer):
+        """
+        Remplit un tampon accessible en écriture avec une requête generate_into.
+        """
+        return self.generate_into(buffer)
+
+    def __iter__(self):
+        """
+        Itère sans fin sur les sorties (bytes) comme next_hash_DRBG.
+        """
+        while True:
+            yield self.next_output()
+
+
+class DRBGPool:
+    """
+    Service de génération de jetons utilisable depuis de nombreux threads ou tâches asyncio.
+
+    Chaque thread (et chaque tâche asyncio qui l'utilise en premier) reçoit sa propre
+    instance HashDRBG, rangée dans une ContextVar : l'appel à token ne prend aucun verrou
+    et deux appelants concurrents ne partagent jamais un état. Les graines (nouvelles
+    instances et reseeds) sont préparées à l'avance par un thread d'arrière-plan.
+    """
+    def __init__(self, seedlen=32, reseed_interval=1000, reserve=16):
+        """
+        Entrées :
+            seedlen (int)           : Taille de l'état des instances en octets.
+            reseed_interval (int)   : Nombre de générations avant de rafraîchir une instance.
+            reserve (int)           : Nombre de graines gardées prêtes par le thread d'arrière-plan.
+        """
+        self.seedlen = seedlen
+        self.reseed_interval = reseed_interval
+        self.reserve = reserve
+        self._instance = ContextVar(f"DRBGPool-{id(self)}", default=None)
+        self._graines = queue.SimpleQueue()
+        self._demande = threading.Event()
+        self._arret = threading.Event()
+        self._thread = threading.Thread(target=self._preparer_graines, name="DRBGPool-reseed", daemon=True)
+        self._thread.start()
+
+    def _preparer_graines(self):
+        """
+        Boucle du thread d'arrière-plan : complète la réserve de graines à chaque demande.
+        """
+        while not self._arret.is_set():
+            while self._graines.qsize() < self.reserve and not self._arret.is_set():
+                self._graines.put(seed(self.seedlen))
+            self._demande.wait()
+            self._demande.clear()
+
+    def _graine(self):
+        """
+        Sortie :
+            (bytes) : Une graine de la réserve, ou une graine calculée sur place si elle est vide.
+        """
+        self._demande.set()
+        try:
+            return self._graines.get_nowait()
+        except queue.Empty:
+            return seed(self.seedlen)
+
+    def _drbg(self):
+        """
+        Sortie :
+            (HashDRBG) : L'instance du thread / de la tâche courante, créée au premier appel.
+
+        Logique :
+            La ContextVar peut être copiée vers un autre thread (run_in_executor par exemple),
+            l'identifiant du thread est donc vérifié avant de réutiliser l'instance.
+        """
+        courant = self._instance.get()
+        thread = threading.get_ident()
+        if courant is None or courant[0] != thread:
+            drbg = HashDRBG(self.seedlen, self.reseed_interval, self._graine(), self._graine())
+            self._instance.set((thread, drbg))
+            return drbg
+        return courant[1]
+
+    def token(self, nbytes=16):
+        """
+        Entrée :
+            nbytes (int) : Taille du jeton en octets.
+
+        Sortie :
+            (bytes) : Le jeton.
+        """
+        drbg = self._drbg()
+        if drbg.reseed_cpt > drbg.reseed_interval:
+            drbg.etat = self._graine()
+            drbg.reseed_cpt = 1
+        return drbg.generate(nbytes)
+
+    def close(self):
+        """
+        Arrête le thread d'arrière-plan.
+        """
+        self._arret.set()
+        self._demande.set()
+        self._thread.join()
+
+
 if __name__ == "__main__":
     # --- Paramètres ---
     seedlen = 16  # 128 bits = 16 octets
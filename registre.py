@@ -0,0 +1,174 @@
+import binascii
+import os
+
+import numpy as np
+
+from LCG import LCG
+from Mersenne_twister import MersenneTwister
+from BBS import BlumBlumShub
+from BoxMuller import NormalSampler
+from Ziggurat import Ziggurat
+from hash_DRBG import HashDRBG
+from NRBG import NRBG
+from system_generator import GenerateurSysteme, TamponEntropie
+
+SEED: int = 123
+FORMATS = ["raw", "hex", "npy"]
+# taille des écritures : un appel système par Mio au lieu d'un print par valeur
+TAILLE_TAMPON: int = 1 << 20
+OCTETS_PAR_LIGNE_HEX: int = 32
+
+
+def _mots(generateur, n: int) -> np.ndarray:
+    """n mots de 32 bits du flux du générateur"""
+    return generateur.random_uint32(n)
+
+
+# générateurs disponibles : nom -> (création à partir de la seed et des paramètres, type NumPy des
+# valeurs produites, production de n valeurs par une instance, description)
+# les générateurs sans seed (graine tirée de l'horloge, du système...) ignorent la seed
+GENERATEURS = {
+    "lcg": (lambda seed, m=2**32, a=1664525, c=1013904223: LCG(m, a, c, seed),
+            "<u4", _mots, "générateur congruentiel linéaire (paramètres m, a, c)"),
+    "mt": (lambda seed: MersenneTwister(seed),
+           "<u4", _mots, "Mersenne Twister MT19937"),
+    "bbs": (lambda seed, seed_q=456, bits=32: BlumBlumShub(seed, seed_q, bits),
+            "<u4", _mots, "Blum Blum Shub, la seed sert à chercher p (paramètres seed_q, bits)"),
+    "box-muller": (lambda seed: NormalSampler(seed),
+                   "<f8", lambda g, n: g.normal(n), "loi Normale centrée réduite (méthode polaire)"),
+    "ziggurat-normale": (lambda seed: Ziggurat(seed),
+                         "<f8", lambda g, n: g.normal(n), "loi Normale centrée réduite (Ziggurat)"),
+    "ziggurat-exponentielle": (lambda seed: Ziggurat(seed),
+                               "<f8", lambda g, n: g.exponentielle(n), "loi Exponentielle de paramètre 1 (Ziggurat)"),
+    "hash-drbg": (lambda seed, seedlen=32, reseed_interval=1000: HashDRBG(seedlen, reseed_interval),
+                  "<u4", _mots, "Hash DRBG SHA-256, graine système (paramètres seedlen, reseed_interval)"),
+    "nrbg": (lambda seed, seed_p=123, seed_q=456, bits=32: NRBG(seed_p, seed_q, bits),
+             "<u4", _mots, "XOR de os.urandom, d'un Mersenne Twister et de BBS (paramètres seed_p, seed_q, bits)"),
+    "systeme": (lambda seed: GenerateurSysteme(),
+                "<u4", _mots, "horodatage et adresse mémoire étendus par SHA-256"),
+    "systeme-tampon": (lambda seed, capacite=1 << 20, taille_bloc=1 << 16: TamponEntropie(capacite, taille_bloc),
+                       "<u4", _mots, "horodatage et adresse mémoire étendus par SHA-256, lus par un thread en arrière-plan"),
+}
+
+
+def creer(nom: str, seed: int = SEED, **parametres):
+    """crée une instance d'un générateur du registre
+
+    Args:
+        nom (str): nom du générateur (clé de GENERATEURS)
+        seed (int, optional): seed du générateur. Defaults to SEED.
+        **parametres: paramètres propres au générateur (m, a, c pour le LCG, ...)
+
+    Returns:
+        FluxAleatoire: instance du générateur
+    """
+    if nom not in GENERATEURS:
+        raise ValueError(f"Générateur inconnu : {nom} (disponibles : {', '.join(GENERATEURS)})")
+    return GENERATEURS[nom][0](seed, **parametres)
+
+
+def type_valeurs(nom: str) -> np.dtype:
+    """renvois le type NumPy (petit-boutiste) des valeurs produites par un générateur du registre
+
+    Args:
+        nom (str): nom du générateur
+
+    Returns:
+        np.dtype: type des valeurs
+    """
+    return np.dtype(GENERATEURS[nom][1])
+
+
+def valeurs(nom: str, generateur, n: int) -> np.ndarray:
+    """renvois les n valeurs suivantes d'une instance créée par creer
+
+    Args:
+        nom (str): nom du générateur
+        generateur: instance du générateur
+        n (int): nombre de valeurs
+
+    Returns:
+        np.ndarray: tableau de n valeurs du type type_valeurs(nom)
+    """
+    return np.asarray(GENERATEURS[nom][2](generateur, n)).astype(type_valeurs(nom), copy=False)
+
+
+def _hexadecimal(octets) -> bytes:
+    """écrit des octets en hexadécimal, OCTETS_PAR_LIGNE_HEX octets par ligne"""
+    hexa = np.frombuffer(binascii.hexlify(octets), dtype=np.uint8)
+    largeur = 2 * OCTETS_PAR_LIGNE_HEX
+    pleines = len(hexa) // largeur
+    lignes = np.empty((pleines, largeur + 1), dtype=np.uint8)
+    lignes[:, :largeur] = hexa[:pleines * largeur].reshape(pleines, largeur)
+    lignes[:, largeur] = ord("\n")
+    reste = hexa[pleines * largeur:].tobytes()
+    return lignes.tobytes() + (reste + b"\n" if reste else b"")
+
+
+def ecrire_flux(nom: str, generateur, sortie, nb_octets: int | None = None, format: str = "raw",
+                taille_tampon: int = TAILLE_TAMPON) -> int:
+    """écrit le flux d'un générateur du registre dans un fichier binaire, par grands blocs
+
+    Les valeurs sont écrites en petit-boutiste (mots de 32 bits ou flottants 64 bits selon le
+    générateur). Les générateurs de mots remplissent directement un tampon réutilisé (fill),
+    sans allocation par bloc.
+
+    Args:
+        nom (str): nom du générateur dans le registre
+        generateur: instance créée par registre.creer
+        sortie: fichier binaire ouvert en écriture (sys.stdout.buffer, open(..., "wb"), ...)
+        nb_octets (int, optional): nombre d'octets à écrire, None pour un flux sans fin. Defaults to None.
+        format (str, optional): "raw", "hex" (une ligne par OCTETS_PAR_LIGNE_HEX octets) ou "npy"
+                                (tableau NumPy de nb_octets // taille d'une valeur valeurs). Defaults to "raw".
+        taille_tampon (int, optional): taille des blocs écrits (arrondie à un multiple de
+                                       OCTETS_PAR_LIGNE_HEX en hexadécimal). Defaults to TAILLE_TAMPON.
+
+    Returns:
+        int: nombre d'octets de données écrits (sans l'en-tête npy ni la mise en forme hexadécimale)
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Format inconnu : {format} (disponibles : {', '.join(FORMATS)})")
+    type = type_valeurs(nom)
+    if format == "npy":
+        if nb_octets is None:
+            raise ValueError("Le format npy demande un nombre de valeurs")
+        nb_octets -= nb_octets % type.itemsize
+        np.lib.format.write_array_header_1_0(sortie, {"descr": np.lib.format.dtype_to_descr(type),
+                                                      "fortran_order": False,
+                                                      "shape": (nb_octets // type.itemsize,)})
+
+    if format == "hex":
+        # chaque bloc doit finir en fin de ligne : taille arrondie à un multiple de la ligne
+        taille_tampon = max(OCTETS_PAR_LIGNE_HEX, taille_tampon - taille_tampon % OCTETS_PAR_LIGNE_HEX)
+    par_bloc = max(1, taille_tampon // type.itemsize)
+    tampon = np.empty(par_bloc, dtype=type) if type == np.dtype("<u4") else None
+    ecrits = 0
+    while nb_octets is None or ecrits < nb_octets:
+        taille = par_bloc * type.itemsize if nb_octets is None else min(par_bloc * type.itemsize, nb_octets - ecrits)
+        n = -(-taille // type.itemsize)
+        if tampon is not None:
+            bloc = tampon[:n]
+            generateur.fill(bloc)
+        else:
+            bloc = valeurs(nom, generateur, n)
+        donnees = memoryview(bloc).cast("B")[:taille]
+        sortie.write(_hexadecimal(donnees) if format == "hex" else donnees)
+        ecrits += taille
+    return ecrits
+
+
+def avancer(nom: str, generateur, n: int):
+    """avance un générateur du registre de n valeurs (en O(log n) pour le LCG, en les générant sinon)
+
+    Args:
+        nom (str): nom du générateur dans le registre
+        generateur: instance créée par registre.creer
+        n (int): nombre de valeurs sautées
+    """
+    if n == 0:
+        return
+    if nom == "lcg":
+        generateur.advance(n)  # un mot par terme de la suite
+    else:
+        with open(os.devnull, "wb") as poubelle:
+            ecrire_flux(nom, generateur, poubelle, n * type_valeurs(nom).itemsize)
@@ -1,5 +1,29 @@
-from time import time_ns
+from time import time_ns, perf_counter
 from hashlib import sha256
+import threading
+from flux import FluxAleatoire
+from expansion_sha256 import expansion, expansion_into
+
+def _graine():
+    """
+    Sortie :
+        (bytes) : Point de départ de l'expansion : SHA-256 de l'horodatage et d'une adresse
+                  mémoire, suivi d'un compteur nul sur 4 octets.
+    """
+    t = time_ns() #prends l'horodotage actuel en nanosecondes
+    obj_random = id(object()) #id unique d'un objet temporaire
+    
+    
+    """
+        val : concatenation en bytes des données aléatoires sources
+    """
+    val =  t.to_bytes(8, 'big') + obj_random.to_bytes(8, 'big')
+    
+    
+    base_hash = sha256(val).digest() #hashage de val pour générer 32 octets
+    return base_hash + bytes(4)
+
+
 def random(seedlen):
     """
     Simule un générateur de nombres aléatoires système basé sur l'entropie locale.
@@ -15,31 +39,173 @@ def random(seedlen):
         et adresse mémoire d'un objet pour créer une graine initiale, puis on 
         l'étend via SHA-256 pour atteindre la taille demandée.
     """
-    t = time_ns() #prends l'horodotage actuel en nanosecondes
-    obj_random = id(object()) #id unique d'un objet temporaire
-    
-    
+    # blocs sha256(base_hash + cpt) pour cpt = 0, 1, 2... (compteur sur 4 octets)
+    return expansion(_graine(), seedlen)
+
+
+class GenerateurSysteme(FluxAleatoire):
     """
-        val : concatenation en bytes des données aléatoires sources
+    Flux d'octets du générateur système (voir random).
     """
-    val =  t.to_bytes(8, 'big') + obj_random.to_bytes(8, 'big')
-    
-    
-    base_hash = sha256(val).digest() #hashage de val pour générer 32 octets
-    
-    cpt = 0
-    result = b'' #contient le retour du random
-    while len(result) < seedlen:
-        data = base_hash + cpt.to_bytes(4,'big')
-        result += sha256(data).digest()
-        cpt += 1
-        
-    return result[:seedlen]
+    def fill(self, buffer):
+        """
+        Remplit un tampon accessible en écriture avec des octets de random.
+
+        Entrée :
+            buffer : tampon (bytearray, memoryview, tableau NumPy contigu...)
+
+        Sortie :
+            le tampon rempli
+
+        Logique :
+            Les octets sont produits par blocs de taille fixe, chaque bloc repart d'une
+            nouvelle graine (horodatage + adresse mémoire) et est écrit directement dans le tampon.
+        """
+        octets = memoryview(buffer).cast('B')
+        taille = 4 * self.TAILLE_BLOC
+        for debut in range(0, len(octets), taille):
+            expansion_into(_graine(), octets[debut:debut+taille])
+        return buffer
+
+
+class TamponEntropie(FluxAleatoire):
+    """
+    Réserve d'octets de random, remplie à l'avance par un thread d'arrière-plan.
+
+    Les petites lectures sont de simples copies depuis un tampon circulaire ; les lectures
+    plus grandes que le tampon sont faites directement avec random. Si la réserve ne
+    contient pas assez d'octets, la lecture est faite directement (sans attendre le thread).
+    """
+    def __init__(self, capacite=1 << 20, taille_bloc=1 << 16):
+        """
+        Entrées :
+            capacite (int)    : Taille du tampon circulaire en octets.
+            taille_bloc (int) : Nombre d'octets produits par chaque remplissage.
+        """
+        self.capacite = capacite
+        self.taille_bloc = min(taille_bloc, capacite)
+        self._tampon = bytearray(capacite)
+        self._debut = 0   # position du premier octet disponible
+        self._niveau = 0  # nombre d'octets disponibles
+        self._condition = threading.Condition(threading.Lock())
+        self._arret = False
+        self._compteurs = {"succes": 0, "echecs": 0, "contournements": 0, "remplissages": 0,
+                           "latence_totale": 0.0, "latence_max": 0.0}
+        self._thread = threading.Thread(target=self._remplir, name="TamponEntropie", daemon=True)
+        self._thread.start()
+
+    def _remplir(self):
+        """
+        Boucle du thread d'arrière-plan : ajoute un bloc dès qu'il y a la place.
+        """
+        while True:
+            with self._condition:
+                while self._niveau > self.capacite - self.taille_bloc and not self._arret:
+                    self._condition.wait()
+                if self._arret:
+                    return
+            debut = perf_counter()
+            bloc = random(self.taille_bloc)
+            latence = perf_counter() - debut
+            with self._condition:
+                fin = (self._debut + self._niveau) % self.capacite
+                premiere_partie = min(len(bloc), self.capacite - fin)
+                self._tampon[fin:fin+premiere_partie] = bloc[:premiere_partie]
+                self._tampon[:len(bloc)-premiere_partie] = bloc[premiere_partie:]
+                self._niveau += len(bloc)
+                self._compteurs["remplissages"] += 1
+                self._compteurs["latence_totale"] += latence
+                self._compteurs["latence_max"] = max(self._compteurs["latence_max"], latence)
+
+    def read(self, nbytes):
+        """
+        Entrée :
+            nbytes (int) : Nombre d'octets à lire.
+
+        Sortie :
+            (bytes) : Les octets lus.
+        """
+        if nbytes > self.capacite:
+            with self._condition:
+                self._compteurs["contournements"] += 1
+            return random(nbytes)
+        with self._condition:
+            if self._niveau >= nbytes:
+                debut, fin = self._debut, self._debut + nbytes
+                if fin <= self.capacite:
+                    resultat = bytes(self._tampon[debut:fin])
+                else:
+                    resultat = bytes(self._tampon[debut:]) + bytes(self._tampon[:fin-self.capacite])
+                self._debut = fin % self.capacite
+                self._niveau -= nbytes
+                self._compteurs["succes"] += 1
+                if self._niveau <= self.capacite - self.taille_bloc:
+                    self._condition.notify()
+                return resultat
+            self._compteurs["echecs"] += 1
+            self._condition.notify()
+        return random(nbytes)
+
+    def fill(self, buffer):
+        """
+        Remplit un tampon accessible en écriture.
+
+        Entrée :
+            buffer : tampon (bytearray, memoryview, tableau NumPy contigu...)
+
+        Sortie :
+            le tampon rempli
+        """
+        octets = memoryview(buffer).cast('B')
+        octets[:] = self.read(len(octets))
+        return buffer
+
+    def statistiques(self):
+        """
+        Sortie :
+            (dict) : Compteurs de lectures servies par la réserve (succes), faites directement
+                     faute d'octets disponibles (echecs) ou trop grandes (contournements),
+                     nombre de remplissages, latences moyenne et maximale d'un remplissage (s),
+                     et niveau actuel de la réserve.
+        """
+        with self._condition:
+            compteurs = dict(self._compteurs)
+            compteurs["niveau"] = self._niveau
+        latence_totale = compteurs.pop("latence_totale")
+        compteurs["latence_moyenne"] = latence_totale / compteurs["remplissages"] if compteurs["remplissages"] else 0.0
+        return compteurs
+
+    def close(self):
+        """
+        Arrête le thread d'arrière-plan.
+        """
+        with self._condition:
+            self._arret = True
+            self._condition.notify()
+        self._thread.join()
+
+
+_TAMPON: TamponEntropie | None = None
+_VERROU_TAMPON = threading.Lock()
+
+
+def random_tamponne(seedlen):
+    """
+    Même usage que random, mais servi par une réserve TamponEntropie partagée.
+
+    Entrée :
+        seedlen (int) : Nombre d'octets aléatoires à générer.
+
+    Sortie :
+        (bytes) : Un tableau d'octets de longueur 'seedlen'.
+    """
+    global _TAMPON
+    if _TAMPON is None:
+        with _VERROU_TAMPON:
+            if _TAMPON is None:
+                _TAMPON = TamponEntropie()
+    return _TAMPON.read(seedlen)
+
 
 if __name__ == "__main__":
-    print(random(50).hex())    
-    
-    
-    
-    
-    
\ No newline at end of file
+    print(random(50).hex())
@@ -0,0 +1,396 @@
+import math
+import numpy as np
+from scipy.special import gammaincc, erfc
+from scipy.stats import norm
+
+# seuil de décision de NIST SP 800-22
+ALPHA = 0.01
+# nombre d'octets traités à la fois par les tests qui ont besoin de tableaux intermédiaires
+TAILLE_SEGMENT = 1 << 20
+
+# bits de chaque valeur d'octet (poids fort en premier) et sommes partielles des +1/-1 après 1..8 bits
+_BITS_OCTETS = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1)
+_UNS_OCTETS = _BITS_OCTETS.sum(axis=1).astype(np.uint8)
+_PREFIXES_OCTETS = np.cumsum(2 * _BITS_OCTETS.astype(np.int64) - 1, axis=1)
+
+
+def _popcount(octets: np.ndarray) -> np.ndarray:
+    """nombre de bits à 1 de chaque octet (np.bitwise_count n'existe qu'à partir de NumPy 2)"""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(octets)
+    return _UNS_OCTETS[octets]
+
+
+def vers_bits(donnees, nb_bits: int = 32) -> np.ndarray:
+    """convertit des données en suite de bits compactée (8 bits par octet, poids fort en premier)
+
+    Les tests travaillent sur cette forme compactée, sans tableau d'un élément par bit.
+
+    Args:
+        donnees: octets (bytes, bytearray, memoryview), entiers (les nb_bits bits de poids
+            faible de chaque valeur sont gardés) ou flottants dans [0, 1] (quantifiés sur nb_bits bits)
+        nb_bits (int, optional): bits gardés par valeur, multiple de 8 et au plus 64. Defaults to 32.
+
+    Returns:
+        np.ndarray: suite de 8 * len(resultat) bits (uint8)
+    """
+    if isinstance(donnees, (bytes, bytearray, memoryview)):
+        return np.frombuffer(donnees, dtype=np.uint8)
+    if nb_bits % 8 or not 0 < nb_bits <= 64:
+        raise ValueError(f"nb_bits doit être un multiple de 8 entre 8 et 64: {nb_bits}")
+
+    valeurs = np.asarray(donnees)
+    masque = (1 << nb_bits) - 1
+    if valeurs.dtype.kind == 'f':
+        if valeurs.size and not (valeurs.min() >= 0.0 and valeurs.max() <= 1.0):
+            raise ValueError("Les flottants doivent être dans [0,1]")
+        mots = np.minimum(np.floor(valeurs * 2.0**nb_bits), 2.0**nb_bits - 1).astype(np.uint64)
+    elif valeurs.dtype.kind in 'iu':
+        mots = valeurs.astype(np.uint64) & np.uint64(masque)
+    else:
+        # entiers Python plus grands que 64 bits
+        mots = np.array([int(valeur) & masque for valeur in valeurs.ravel()], dtype=np.uint64)
+
+    octets = mots.ravel().astype('>u8').view(np.uint8).reshape(-1, 8)[:, 8 - nb_bits // 8:]
+    return octets.ravel()
+
+
+def _resultat(p_value: float | None, *autres_p_values: float) -> dict:
+    """met en forme le résultat d'un test (la suite est aléatoire si toutes les p-values >= ALPHA)"""
+    if p_value is None:
+        return {"p_value": None, "interpretation": "Données insuffisantes"}
+    resultat = {"p_value": float(p_value)}
+    for i, autre in enumerate(autres_p_values, start=2):
+        resultat[f"p_value{i}"] = float(autre)
+    aleatoire = min((p_value,) + autres_p_values) >= ALPHA
+    resultat["interpretation"] = "Aléatoire" if aleatoire else "Non aléatoire"
+    return resultat
+
+
+def _motifs(bits: np.ndarray, m: int) -> np.ndarray:
+    """nombre d'occurrences de chaque motif de m bits (fenêtres chevauchantes, suite prolongée
+    de ses m-1 premiers bits)
+
+    Pour chaque octet du segment, le mot de 64 bits qui commence à cet octet contient les
+    motifs commençant à ses 8 bits (m <= 57) : ils sont extraits par décalage et masque.
+    """
+    prolongee = np.concatenate([bits, np.resize(bits, 7)])
+    masque = np.uint64((1 << m) - 1)
+    comptes = np.zeros(1 << m, dtype=np.int64)
+    for debut in range(0, len(bits), TAILLE_SEGMENT):
+        fin = min(debut + TAILLE_SEGMENT, len(bits))
+        fenetres = np.lib.stride_tricks.sliding_window_view(prolongee[debut:fin+7], 8)
+        mots = fenetres.copy().view('>u8').ravel().astype(np.uint64)
+        for decalage in range(8):
+            valeurs = (mots >> np.uint64(64 - m - decalage)) & masque
+            comptes += np.bincount(valeurs.astype(np.intp), minlength=1 << m)
+    return comptes
+
+
+##################################################
+# Tests de fréquence
+##################################################
+def frequence(bits: np.ndarray) -> dict:
+    """test de fréquence (monobit) : proportion de 1 dans toute la suite
+
+    Args:
+        bits (np.ndarray): suite de bits compactée (voir vers_bits)
+    """
+    n = 8 * len(bits)
+    if n == 0:
+        return _resultat(None)
+    somme = 2 * int(_popcount(bits).sum(dtype=np.int64)) - n
+    return _resultat(erfc(abs(somme) / math.sqrt(n) / math.sqrt(2)))
+
+
+def frequence_blocs(bits: np.ndarray, M: int = 128) -> dict:
+    """test de fréquence par blocs : proportion de 1 dans chaque bloc de M bits
+
+    Args:
+        bits (np.ndarray): suite de bits compactée (voir vers_bits)
+        M (int, optional): taille des blocs. Defaults to 128.
+    """
+    N = 8 * len(bits) // M
+    if N == 0:
+        return _resultat(None)
+    if M % 8 == 0:
+        uns = _popcount(bits[:N*M//8]).reshape(N, M // 8).sum(axis=1, dtype=np.int64)
+    else:
+        # nombre de 1 avant chaque frontière de bloc : octets entiers puis bits de poids fort
+        frontieres = np.arange(N + 1) * M
+        cumul = np.concatenate([[0], np.cumsum(_popcount(bits), dtype=np.int64)])
+        octets = np.append(bits, np.uint8(0))[frontieres // 8]
+        avant = cumul[frontieres // 8] + _popcount(octets >> (8 - frontieres % 8)) * (frontieres % 8 > 0)
+        uns = np.diff(avant)
+    proportions = uns / M
+    chi2_obs = 4 * M * float(np.sum((proportions - 0.5)**2))
+    return _resultat(gammaincc(N / 2, chi2_obs / 2))
+
+
+def cusum(bits: np.ndarray) -> dict:
+    """test des sommes cumulées, vers l'avant (p_value) et vers l'arrière (p_value2)
+
+    Args:
+        bits (np.ndarray): suite de bits compactée (voir vers_bits)
+    """
+    n = 8 * len(bits)
+    if n == 0:
+        return _resultat(None)
+    # extremums des sommes partielles S_i, pour i = 1..n (vers l'avant) et i = 0..n-1
+    # (vers l'arrière, les sommes valent total - S_i), à partir de la somme au début de chaque
+    # octet et des extremums des sommes partielles à l'intérieur de l'octet
+    prefixes = _PREFIXES_OCTETS
+    apres = (prefixes.max(axis=1), prefixes.min(axis=1))
+    avant = (np.maximum(prefixes[:, :7].max(axis=1), 0), np.minimum(prefixes[:, :7].min(axis=1), 0))
+    total, haut_apres, bas_apres, haut_avant, bas_avant = 0, -n, n, -n, n
+    for debut in range(0, len(bits), TAILLE_SEGMENT):
+        octets = bits[debut:debut + TAILLE_SEGMENT]
+        sommes = prefixes[octets, 7]
+        departs = total + np.cumsum(sommes) - sommes
+        haut_apres = max(haut_apres, int(np.max(departs + apres[0][octets])))
+        bas_apres = min(bas_apres, int(np.min(departs + apres[1][octets])))
+        haut_avant = max(haut_avant, int(np.max(departs + avant[0][octets])))
+        bas_avant = min(bas_avant, int(np.min(departs + avant[1][octets])))
+        total += int(sommes.sum())
+    p_values = []
+    for z in (max(haut_apres, -bas_apres), max(total - bas_avant, haut_avant - total)):
+        racine = math.sqrt(n)
+        k = np.arange((-n // z + 1) // 4, (n // z - 1) // 4 + 1)
+        somme1 = np.sum(norm.cdf((4*k + 1) * z / racine) - norm.cdf((4*k - 1) * z / racine))
+        k = np.arange((-n // z - 3) // 4, (n // z - 1) // 4 + 1)
+        somme2 = np.sum(norm.cdf((4*k + 3) * z / racine) - norm.cdf((4*k + 1) * z / racine))
+        p_values.append(min(1.0, max(0.0, 1 - somme1 + somme2)))
+    return _resultat(*p_values)
+
+
+##################################################
+# Tests de séries (runs)
+##################################################
+def runs(bits: np.ndarray) -> dict:
+    """test des séries : nombre de suites ininterrompues de bits identiques
+
+    Args:
+        bits (np.ndarray): suite de bits compactée (voir vers_bits)
+    """
+    n = 8 * len(bits)
+    if n < 2:
+        return _resultat(None)
+    pi = int(_popcount(bits).sum(dtype=np.int64)) / n
+    # prérequis : le test de fréquence doit être passé
+    if abs(pi - 0.5) >= 2 / math.sqrt(n):
+        return _resultat(0.0)
+    # changements entre bits voisins d'un même octet, puis entre octets voisins
+    interieurs = int(_popcount((bits ^ (bits >> 1)) & 0x7F).sum(dtype=np.int64))
+    frontieres = int(np.count_nonzero((bits[:-1] & 1) ^ (bits[1:] >> 7)))
+    v_obs = 1 + interieurs + frontieres
+    return _resultat(erfc(abs(v_obs - 2*n*pi*(1 - pi)) / (2 * math.sqrt(2*n) * pi * (1 - pi))))
+
+
+# (taille minimale de la suite, M, classes extrêmes v_min et v_max, probabilités des classes)
+# probabilités du code de référence de NIST (leur somme vaut 1)
+_PARAMETRES_PLUS_LONGUE_SERIE = [
+    (750000, 10000, 10, 16, [0.0882, 0.2092, 0.2483, 0.1933, 0.1208, 0.0675, 0.0727]),
+    (6272, 128, 4, 9, [0.1174035788, 0.242955959, 0.249363483, 0.17517706, 0.102701071, 0.112398847]),
+    (128, 8, 1, 4, [0.21484375, 0.3671875, 0.23046875, 0.1875]),
+]
+
+
+def plus_longue_serie(bits: np.ndarray) -> dict:
+    """test de la plus longue série de 1 dans des blocs de M bits (M dépend de la taille de la suite)
+
+    Args:
+        bits (np.ndarray): suite de bits compactée (voir vers_bits)
+    """
+    n = 8 * len(bits)
+    for taille_min, M, v_min, v_max, probabilites in _PARAMETRES_PLUS_LONGUE_SERIE:
+        if n >= taille_min:
+            break
+    else:
+        return _resultat(None)
+    N = n // M
+
+    # après k étapes blocs &= blocs << 1, un bloc est non nul s'il contient une série de plus de k 1
+    # (M est un multiple de 8 : un bloc est une ligne d'octets)
+    actifs = np.arange(N)
+    blocs = bits[:N*M//8].reshape(N, M // 8)
+    plus_longues = np.zeros(N, dtype=np.int64)
+    while True:
+        restants = blocs.any(axis=1)
+        actifs, blocs = actifs[restants], blocs[restants]
+        if len(actifs) == 0:
+            break
+        plus_longues[actifs] += 1
+        decales = blocs << 1
+        decales[:, :-1] |= blocs[:, 1:] >> 7
+        blocs = blocs & decales
+
+    classes = np.bincount(np.clip(plus_longues, v_min, v_max) - v_min, minlength=len(probabilites))
+    attendus = N * np.array(probabilites)
+    chi2_obs = float(np.sum((classes - attendus)**2 / attendus))
+    return _resultat(gammaincc((len(probabilites) - 1) / 2, chi2_obs / 2))
+
+
+##################################################
+# Test du rang des matrices binaires
+##################################################
+def rangs_gf2(lignes: np.ndarray) -> np.ndarray:
+    """rang sur GF(2) de matrices 32x32 dont chaque ligne est un mot de 32 bits
+
+    Le pivot de Gauss est fait en même temps pour toutes les matrices, colonne par colonne.
+
+    Args:
+        lignes (np.ndarray): tableau (N, 32) de uint32
+
+    Returns:
+        np.ndarray: rang de chaque matrice
+    """
+    lignes = lignes.copy()
+    N, Q = lignes.shape
+    rangs = np.zeros(N, dtype=np.int64)
+    indices = np.arange(Q)
+    for colonne in range(32):
+        bit = np.uint32(1 << (31 - colonne))
+        candidats = ((lignes & bit) != 0) & (indices[None, :] >= rangs[:, None])
+        matrices = np.flatnonzero(candidats.any(axis=1))
+        if len(matrices) == 0:
+            continue
+        rang = rangs[matrices]
+        pivot = np.argmax(candidats[matrices], axis=1)
+
+        # échange de la ligne pivot avec la ligne d'indice rang
+        ligne_pivot = lignes[matrices, pivot]
+        lignes[matrices, pivot] = lignes[matrices, rang]
+        lignes[matrices, rang] = ligne_pivot
+
+        # élimination du bit dans les lignes suivantes
+        sous_matrices = lignes[matrices]
+        elimination = ((sous_matrices & bit) != 0) & (indices[None, :] > rang[:, None])
+        lignes[matrices] = sous_matrices ^ np.where(elimination, ligne_pivot[:, None], np.uint32(0))
+        rangs[matrices] += 1
+    return rangs
+
+
+def rang_matrices(bits: np.ndarray) -> dict:
+    """test du rang des matrices binaires 32x32 formées par les blocs de 1024 bits
+
+    Args:
+        bits (np.ndarray): suite de bits compactée (voir vers_bits)
+    """
+    N = 8 * len(bits) // 1024
+    if N == 0:
+        return _resultat(None)
+    lignes = bits[:N*128].view('>u4').astype(np.uint32)
+    rangs = rangs_gf2(lignes.reshape(N, 32))
+
+    complet = int(np.count_nonzero(rangs == 32))
+    moins_un = int(np.count_nonzero(rangs == 31))
+    observes = np.array([complet, moins_un, N - complet - moins_un])
+    attendus = N * np.array([0.2888, 0.5776, 0.1336])
+    chi2_obs = float(np.sum((observes - attendus)**2 / attendus))
+    return _resultat(math.exp(-chi2_obs / 2))
+
+
+##################################################
+# Test spectral (transformée de Fourier discrète)
+##################################################
+def spectral(bits: np.ndarray) -> dict:
+    """test spectral : nombre de pics de la transformée de Fourier au-dessus du seuil à 95 %
+
+    Args:
+        bits (np.ndarray): suite de bits compactée (voir vers_bits)
+    """
+    n = 8 * len(bits)
+    if n < 2:
+        return _resultat(None)
+    # la transformée de Fourier demande de toute façon un flottant par bit
+    modules = np.abs(np.fft.rfft(2 * np.unpackbits(bits).astype(np.float64) - 1))[:n // 2]
+    seuil = math.sqrt(math.log(1 / 0.05) * n)
+    n0 = 0.95 * n / 2
+    n1 = int(np.count_nonzero(modules < seuil))
+    d = (n1 - n0) / math.sqrt(n * 0.95 * 0.05 / 4)
+    return _resultat(erfc(abs(d) / math.sqrt(2)))
+
+
+##################################################
+# Tests sur les motifs de m bits
+##################################################
+def serie(bits: np.ndarray, m: int | None = None) -> dict:
+    """test sériel : uniformité des motifs de m bits chevauchants (deux p-values)
+
+    Args:
+        bits (np.ndarray): suite de bits compactée (voir vers_bits)
+        m (int, optional): taille des motifs. Defaults to floor(log2 n) - 3, au plus 16.
+    """
+    n = 8 * len(bits)
+    if m is None:
+        m = min(16, int(math.log2(n)) - 3) if n else 0
+    if m < 2 or n == 0:
+        return _resultat(None)
+
+    def psi2(taille):
+        if taille <= 0:
+            return 0.0
+        comptes = _motifs(bits, taille)
+        return float((1 << taille) / n * np.sum(comptes.astype(np.float64)**2) - n)
+
+    psi_m, psi_m1, psi_m2 = psi2(m), psi2(m - 1), psi2(m - 2)
+    p1 = gammaincc(2**(m - 2), (psi_m - psi_m1) / 2)
+    p2 = gammaincc(2**(m - 3), (psi_m - 2*psi_m1 + psi_m2) / 2)
+    return _resultat(p1, p2)
+
+
+def entropie_approchee(bits: np.ndarray, m: int | None = None) -> dict:
+    """test d'entropie approchée : fréquences des motifs de m et m+1 bits chevauchants
+
+    Args:
+        bits (np.ndarray): suite de bits compactée (voir vers_bits)
+        m (int, optional): taille des motifs. Defaults to floor(log2 n) - 6, au plus 10.
+    """
+    n = 8 * len(bits)
+    if m is None:
+        m = min(10, int(math.log2(n)) - 6) if n else 0
+    if m < 1 or n == 0:
+        return _resultat(None)
+
+    def phi(taille):
+        frequences = _motifs(bits, taille) / n
+        frequences = frequences[frequences > 0]
+        return float(np.sum(frequences * np.log(frequences)))
+
+    apen = phi(m) - phi(m + 1)
+    chi2_obs = 2 * n * (math.log(2) - apen)
+    return _resultat(gammaincc(2**(m - 1), chi2_obs / 2))
+
+
+# tests de la suite : nom de colonne -> fonction sur la suite de bits
+TESTS_NIST = {
+    'NIST-Fréquence': frequence,
+    'NIST-Fréquence-blocs': frequence_blocs,
+    'NIST-Runs': runs,
+    'NIST-Plus-longue-série': plus_longue_serie,
+    'NIST-Rang': rang_matrices,
+    'NIST-Spectral': spectral,
+    'NIST-Sériel': serie,
+    'NIST-Entropie-approchée': entropie_approchee,
+    'NIST-Sommes-cumulées': cusum,
+}
+
+
+def effectuer_tests_nist(bits: np.ndarray) -> list[dict]:
+    """effectue tous les tests de TESTS_NIST sur une suite de bits
+
+    Args:
+        bits (np.ndarray): suite de bits compactée (voir vers_bits)
+
+    Returns:
+        list[dict]: résultat de chaque test, dans l'ordre de TESTS_NIST
+    """
+    return [test(bits) for test in TESTS_NIST.values()]
+
+
+if __name__ == "__main__":
+    from Mersenne_twister import MersenneTwister
+
+    bits = vers_bits(MersenneTwister(123).random_uint32(100000))
+    for nom, resultat in zip(TESTS_NIST, effectuer_tests_nist(bits)):
+        print(f"{nom} : p = {round(resultat['p_value'], 4)} -> {resultat['interpretation']}")
@@ -1,11 +1,19 @@
 import math
-from BoxMuller import BoxMuller
-from LCG import linear_congruential_generator
+import os
+import signal
+import tempfile
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+from BoxMuller import NormalSampler
+from LCG import LCG
 from Mersenne_twister import MersenneTwister
-from BBS import BBS
+from BBS import BlumBlumShub
 from scipy.stats import chi2
-from hash_DRBG import next_hash_DRBG
-from system_generator import random
+from scipy.fft import next_fast_len
+from hash_DRBG import HashDRBG
+from system_generator import random_tamponne
+from testsNIST import TESTS_NIST, vers_bits, effectuer_tests_nist
 
 
 
@@ -14,26 +22,47 @@ def normaliser(data : list):
     """normalise les données entre 0 et 1
 
     Args:
-        data (list): donnée récupéré
+        data (list): donnée récupéré (liste ou tableau NumPy)
 
     Returns:
-        list[float]: donnée en d'entrée normalisé
+        np.ndarray: donnée en d'entrée normalisé (float64)
     """
-    if not data:
-        return []
+    data = np.asarray(data, dtype=np.float64)
+    if data.size == 0:
+        return data
     
     # Si déjà entre 0 et 1
-    min_val = min(data)
-    max_val = max(data)
+    min_val = data.min()
+    max_val = data.max()
     
     if min_val >= 0 and max_val <= 1:
         return data
     
     # Sinon, normaliser
     if max_val == min_val:
-        return [0.5] * len(data)
+        return np.full(data.shape, 0.5)
     
-    return [(x - min_val) / (max_val - min_val) for x in data]
+    return (data - min_val) / (max_val - min_val)
+
+
+def histogramme_octets(data: np.ndarray) -> np.ndarray:
+    """Renvoie le nombre d'occurrences de chaque octet en une seule passe
+    Args:
+        data (np.ndarray): données normalisées dans [0, 1]
+    Returns:
+        np.ndarray: nombre d'occurrences de chaque octet (0-255)
+    Raises:
+        ValueError: si les données ne sont pas normalisées
+    """
+    data = np.asarray(data, dtype=np.float64)
+    hors_intervalle = np.flatnonzero(~((data >= 0.0) & (data <= 1.0)))
+    if hors_intervalle.size:
+        i = hors_intervalle[0]
+        raise ValueError(f"Donnée à l'index {i} hors de [0,1]: {data[i]}")
+    
+    # Conversion en octet [0, 255]
+    octets = np.minimum((data * 256).astype(np.int64), 255)
+    return np.bincount(octets, minlength=256)
 
 
 def conversion_octet(data: list[float]) -> dict[int, int]:
@@ -43,22 +72,9 @@ def conversion_octet(data: list[float]) -> dict[int, int]:
     Returns:
         dict[int, int]: nombre d'occurrences de chaque octet (0-255)
     Raises:
-        ValueError: si les données ne sont pas normalisées ou du mauvais type
+        ValueError: si les données ne sont pas normalisées
     """
-    nb_occurence_octet: dict[int, int] = {i: 0 for i in range(256)}
-    
-    for i, value in enumerate(data):
-        if not isinstance(value, float):
-            raise ValueError(f"Donnée à l'index {i} n'est pas un float: {type(value)}")
-        
-        if not (0.0 <= value <= 1.0):
-            raise ValueError(f"Donnée à l'index {i} hors de [0,1]: {value}")
-        
-        # Conversion en octet [0, 255]
-        octet = min(int(value * 256), 255)
-        nb_occurence_octet[octet] += 1
-    
-    return nb_occurence_octet
+    return dict(enumerate(histogramme_octets(data).tolist()))
 
 def octets_vers_float_uniforme(octets):
     """Convertit des octets en float [0,1) avec haute précision
@@ -79,27 +95,48 @@ def octets_vers_float_uniforme(octets):
     # Normaliser sur [0, 1)
     return valeur / (2**32)
 
-def effectuer_test(data_brut: list, precision: int=3, affichage: bool=False) -> list[str]:
+def bits_donnees(data_brut: list) -> np.ndarray:
+    """suite de bits des données brutes pour les tests de testsNIST
+
+    Les octets et les entiers sont utilisés tels quels (32 bits de poids faible de chaque
+    valeur), les flottants sont normalisés puis quantifiés sur 32 bits.
+
+    Args:
+        data_brut (list): ensemble de données brut générée
+
+    Returns:
+        np.ndarray: suite de bits compactée (uint8, 8 bits par octet)
+    """
+    if isinstance(data_brut, (bytes, bytearray, memoryview)):
+        return vers_bits(data_brut)
+    valeurs = np.asarray(data_brut)
+    if valeurs.dtype.kind == 'f':
+        return vers_bits(normaliser(valeurs))
+    return vers_bits(valeurs)
+
+def effectuer_test(data_brut: list, precision: int=3, affichage: bool=False, nist: bool=False) -> list[str]:
     """effectue les différents tests a partir de donnée brut
 
     Args:
         data_brut (list): ensemble de données brut générée
         precision (int, optional): nombre de chiffre de précision dans l'affichage des résultats. Defaults to 3.
         affichage (bool, optional): effectue un affichage terminal des résultats. Defaults to False.
+        nist (bool, optional): ajoute les tests sur les bits de testsNIST (dans l'ordre de TESTS_NIST). Defaults to False.
 
     Returns:
         list[str]: liste des interprétations des différents tests
     """
+    # une seule normalisation, un seul histogramme et un seul tri pour tous les tests
     data = normaliser(data_brut)
     n = len(data)
+    histogramme = histogramme_octets(data)
 
-    result_shannon = Shannon(data, n)
-    result_chi2 = Chi2(data, n)
-    result_correlations = []
+    result_shannon = Shannon(data, n, histogramme)
+    result_chi2 = Chi2(data, n, histogramme)
     lags = [1, 2, 8, 16]
-    for lag in lags:
-        result_correlations.append(autocorrelation(data, n, lag))
-    result_ks = kolmogorov_smirnov(data, n)
+    result_correlations = autocorrelations(data, n, lags)
+    result_ks = kolmogorov_smirnov(data, n, np.sort(data))
+    result_nist = effectuer_tests_nist(bits_donnees(data_brut)) if nist else []
 
     # AFFICHAGE 
     if affichage:
@@ -136,20 +173,31 @@ def effectuer_test(data_brut: list, precision: int=3, affichage: bool=False) ->
         print(f"{result_ks.get('interpretation')}")
         print("="*60)
         print()        
+        for nom_test, result in zip(TESTS_NIST, result_nist):
+            print("="*60)
+            print(f"Test {nom_test}")
+            print("="*60)
+            if result.get('p_value') is not None:
+                print(f"p-value : {round(result.get('p_value'), precision)}")
+            print(f"{result.get('interpretation')}")
+            print("="*60)
+            print()
 
     return [result_shannon.get("interpretation", ""), result_chi2.get("interpretation", "")] + \
         [result_autocorrelation.get("interpretation", "") for result_autocorrelation in result_correlations] + \
-        [result_ks.get("interpretation", "")]
+        [result_ks.get("interpretation", "")] + \
+        [result.get("interpretation", "") for result in result_nist]
 
 
-def generer_tableau_tests(tests, resultats, fichier='resultat.txt'):
+def generer_tableau_tests(tests, resultats, fichier='resultat.txt', affichage=True):
     """
     Génère un tableau formaté des tests statistiques et leurs résultats dans un fichier
-    
+
     Parameters:
     tests (list): Liste des noms de tests
     resultats (list of list): Liste de listes de résultats, chaque sous-liste correspond à une ligne
     fichier (str): Nom du fichier de sortie (par défaut 'resultat.txt')
+    affichage (bool): Affiche le nom du fichier généré (par défaut True)
     """
     # Vérification que chaque sous-liste a la même longueur que tests
     for i, row in enumerate(resultats):
@@ -178,29 +226,29 @@ def generer_tableau_tests(tests, resultats, fichier='resultat.txt'):
             values = "| " + " | ".join(val.ljust(largeurs[i]) for i, val in enumerate(row)) + " |"
             f.write(values + "\n")
     
-    print(f"Tableau généré dans le fichier '{fichier}'")
+    if affichage:
+        print(f"Tableau généré dans le fichier '{fichier}'")
 
 ##################################################
 # Entropie de Shannon
 ##################################################
-def Shannon(data: list[float], nb_data: int):
+def Shannon(data: list[float], nb_data: int, histogramme: np.ndarray | None = None):
     """Effectue un test d'entropie de Shanon par octet
 
     Args:
         data (list[float]): liste des données normalisé a tester
         nb_data (int): nombre de donnée a tester
+        histogramme (np.ndarray, optional): histogramme des octets s'il est déjà calculé
     """
     # etape de conversion en octet
-    nb_occurence_octet = conversion_octet(data)
+    if histogramme is None:
+        histogramme = histogramme_octets(data)
 
     # calcul des probabilité d'apparitions
-    entropie = 0.0
-    for key in nb_occurence_octet:
-        # formule 1
-        proba: float = nb_occurence_octet[key] / nb_data
-        if proba > 0:
-            # formule 2
-            entropie -= proba * math.log2(proba)
+    # formule 1
+    proba = histogramme[histogramme > 0] / nb_data
+    # formule 2
+    entropie = float(-np.sum(proba * np.log2(proba)))
 
     # ajout d'un ratio par rapport a l'entropie max possible
     # le ratio est le taux de dispertion des données
@@ -244,23 +292,23 @@ def chi2_critique(ddl, alpha=0.05):
 
 
 
-def Chi2(data: list[float], nb_data: int):    
+def Chi2(data: list[float], nb_data: int, histogramme: np.ndarray | None = None):
     """effectue un test du Chi2 sur l'uniformité des octets
 
     Args:
         data (list[float]): liste des données normalisé a tester
         nb_data (int): nombre de donnée a tester
+        histogramme (np.ndarray, optional): histogramme des octets s'il est déjà calculé
     """
     
     # etape de conversion en octet
-    nb_occurence_octet = conversion_octet(data)
+    if histogramme is None:
+        histogramme = histogramme_octets(data)
 
     frequence_theorique: float = nb_data / 256
 
     # calcul du Chi2 pratique
-    chi2_calcule = 0.0
-    for key in nb_occurence_octet:
-        chi2_calcule += ( (nb_occurence_octet[key] - frequence_theorique)**2 / frequence_theorique )
+    chi2_calcule = float(np.sum((histogramme - frequence_theorique)**2 / frequence_theorique))
 
     # calcul du Chi2 théorique avec 255 degrés de liberté
     ddl = 255
@@ -284,46 +332,59 @@ def autocorrelation(data: list[float], nb_data: int, lag: int):
         nb_data (int): nombre de donnée a tester
         lag (int): valeur du lag de décalage
     """
-    moy = sum(data) / nb_data
-    
+    return autocorrelations(data, nb_data, [lag])[0]
+
+
+def autocorrelations(data: list[float], nb_data: int, lags: list[int]):
+    """test d'autocorrélation pour plusieurs décalages en une seule FFT
+
+    La covariance pour tous les décalages est la transformée inverse du spectre
+    de puissance des données centrées (théorème de Wiener-Khintchine), complétées
+    par au moins max(lags) zéros pour ne pas mélanger le début et la fin de la série.
+
+    Args:
+        data (list[float]): liste des données normalisé a tester
+        nb_data (int): nombre de donnée a tester
+        lags (list[int]): valeurs des lags de décalage
+
+    Returns:
+        list[dict]: résultat du test pour chaque lag
+    """
+    centre = np.asarray(data, dtype=np.float64) - np.mean(data)
+    taille_fft = next_fast_len(nb_data + max(lags), real=True)
+    spectre = np.fft.rfft(centre, taille_fft)
+    covariances = np.fft.irfft(spectre * np.conj(spectre), taille_fft)
+
     # Calcul de la variance totale (dénominateur)
-    variance = sum((x - moy)**2 for x in data)
-    
-    # Calcul de la covariance avec lag (numérateur)
-    covariance = sum((data[i] - moy) * (data[i+lag] - moy) 
-                     for i in range(nb_data - lag))
-    
-    rho = covariance / variance if variance != 0 else 0
-    
+    variance = float(np.dot(centre, centre))
     interval_confiance = 1.96 / math.sqrt(nb_data)
-    
-    return {
-        "rho": rho,
-        "interpretation": "non corrélation" if abs(rho) < interval_confiance else "corrélation"
-    }
+
+    resultats = []
+    for lag in lags:
+        # covariance avec lag (numérateur)
+        rho = float(covariances[lag]) / variance if variance != 0 and lag < nb_data else 0
+        resultats.append({
+            "rho": rho,
+            "interpretation": "non corrélation" if abs(rho) < interval_confiance else "corrélation"
+        })
+    return resultats
 
 # =================================================================
 # Test de Kolmogorov-Smirnov
 # =================================================================
-def kolmogorov_smirnov(data: list[float], nb_data: int):
+def kolmogorov_smirnov(data: list[float], nb_data: int, donnees_triees: np.ndarray | None = None):
     """permet de tester si les données sont uniformes ou non
 
     Args:
         data (list[float]): liste des données normalisé a tester
         nb_data (int): nombre de donnée a tester
+        donnees_triees (np.ndarray, optional): données déjà triées
     """
     # tri des données
-    data = sorted(data)
-    max_distance = 0
-
-    for i in range(nb_data):
-        x_i = data[i]
-        f_empirique = (i + 1) / nb_data
-        f_theorique = x_i
-
-        distance = abs(f_empirique - f_theorique)
-        if distance > max_distance:
-            max_distance = distance
+    if donnees_triees is None:
+        donnees_triees = np.sort(np.asarray(data, dtype=np.float64))
+    f_empirique = np.arange(1, nb_data + 1) / nb_data
+    max_distance = float(np.max(np.abs(f_empirique - donnees_triees))) if nb_data else 0
         
     # formule approximative
     d_critique_005 = 1.36 / math.sqrt(nb_data)
@@ -336,60 +397,211 @@ def kolmogorov_smirnov(data: list[float], nb_data: int):
 
 
 
-if __name__ == "__main__":
-    # INITIALISATEURS
-    mt = MersenneTwister(123)
-    
-    tests = [
-        'Algorithme',
-        'Shannon', 
-        'Chi²', 
-        'Corrélation-lag1', 
-        'Corrélation-lag2', 
-        'Corrélation-lag8', 
-        'Corrélation-lag16', 
-        'Kolmogorov-Smirnov'
-    ]
-    interpretations = []
-
-    # DATA
-    nb_data = 10000 # nombre de données de tests
-    
-    data = [mt.next_number() for _ in range(nb_data)]
-    interpretations.append(["Mersenne Twister"] + effectuer_test(data))
+# =================================================================
+# Campagne de tests en parallèle
+# =================================================================
+def donnees_mersenne_twister(taille: int, seed):
+    """renvois taille mots du Mersenne Twister initialisé avec seed"""
+    return MersenneTwister(seed).random_uint32(taille)
+
+def donnees_box_muller(taille: int, seed):
+    """renvois taille nombres de loi Normale (Box Muller) dont la source uniforme est initialisée avec seed"""
+    return NormalSampler(seed).normal(taille)
+
+def donnees_lcg(taille: int, seed):
+    """renvois taille termes du LCG(m=9, a=2, c=1) de valeur de départ seed"""
+    return LCG(9, 2, 1, seed).generate_array(taille)
+
+def donnees_bbs(taille: int, seed):
+    """renvois taille termes de Blum Blum Shub, seed est le couple (seed_p, seed_q)"""
+    generateur = BlumBlumShub(*seed)
+    return [generateur.next_number() for _ in range(taille)]
+
+def donnees_systeme(taille: int, seed):
+    """renvois taille mots de 32 bits du générateur système (seed est ignorée)"""
+    return np.frombuffer(random_tamponne(4 * taille), dtype='>u4')
+
+def donnees_hash_drbg(taille: int, seed):
+    """renvois taille mots de 32 bits du Hash DRBG, une requête de 32 octets à la fois
+    (seed est ignorée : l'état initial et les reseed viennent du générateur système)"""
+    drbg = HashDRBG(seedlen=32, reseed_interval=6)
+    octets = b"".join(drbg.next_output() for _ in range(-(-taille // 8)))
+    return np.frombuffer(octets, dtype='>u4')[:taille]
+
+def donnees_corpus(taille: int, chemin: str):
+    """renvois les taille premières valeurs d'un corpus (voir corpus.py), sans les regénérer
+    (seed est le chemin du corpus : la tranche est une vue projetée en mémoire, sans copie)"""
+    from corpus import Corpus
+    return Corpus(chemin)[:taille]
+
+
+# générateurs de la campagne : nom -> (fonction de génération, taille de l'échantillon, seed)
+GENERATEURS = {
+    "Mersenne Twister": (donnees_mersenne_twister, 10000, 123),
+    "Box Muller": (donnees_box_muller, 10000, 123),
+    "LCG": (donnees_lcg, 10000, 3),
+    "BBS": (donnees_bbs, 10000, (123, 456)),
+    "Générateur système": (donnees_systeme, 10000, None),
+    "Hash DRBG": (donnees_hash_drbg, 10000, None),
+}
+
+# tests de la campagne : nom de colonne -> fonction sur les données normalisées
+TESTS = {
+    'Shannon': lambda data: Shannon(data, len(data)),
+    'Chi²': lambda data: Chi2(data, len(data)),
+    'Corrélation-lag1': lambda data: autocorrelation(data, len(data), 1),
+    'Corrélation-lag2': lambda data: autocorrelation(data, len(data), 2),
+    'Corrélation-lag8': lambda data: autocorrelation(data, len(data), 8),
+    'Corrélation-lag16': lambda data: autocorrelation(data, len(data), 16),
+    'Kolmogorov-Smirnov': lambda data: kolmogorov_smirnov(data, len(data)),
+}
+
+
+def _delai_depasse(signum, frame):
+    raise TimeoutError
+
+
+@contextmanager
+def _delai(timeout: float | None):
+    """lève TimeoutError dans le bloc après timeout secondes (systèmes POSIX, sinon aucun délai)"""
+    alarme = timeout is not None and hasattr(signal, "setitimer")
+    if alarme:
+        signal.signal(signal.SIGALRM, _delai_depasse)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        yield
+    finally:
+        if alarme:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def generer_echantillon(generation, taille: int, seed, chemin: str, timeout: float | None = None) -> tuple[str, bool] | None:
+    """génère l'échantillon d'un générateur et l'écrit dans un fichier .npy (un job de campagne_tests)
+
+    Les jobs de tests projettent ensuite ce fichier en mémoire : l'échantillon est généré une
+    seule fois et les processus partagent les mêmes pages du cache du système.
 
-    data = [BoxMuller() for _ in range(nb_data)]
-    interpretations.append(["Box Muller"] + effectuer_test(data))
+    Args:
+        generation: fonction de génération (taille, seed) -> données brutes
+        taille (int): nombre de données à générer
+        seed: seed passée à la fonction de génération
+        chemin (str): fichier .npy à écrire
+        timeout (float, optional): durée maximale de la génération en secondes. Defaults to None.
 
-    data = linear_congruential_generator(9,2,1,3,nb_data)
-    interpretations.append(["LCG"] + effectuer_test(data))
+    Returns:
+        tuple[str, bool] | None: chemin du fichier et True si les données brutes sont des octets
+                                 (bytes, bytearray, memoryview), None si le délai est dépassé
+    """
+    try:
+        with _delai(timeout):
+            data_brut = generation(taille, seed)
+    except TimeoutError:
+        return None
+    octets = isinstance(data_brut, (bytes, bytearray, memoryview))
+    np.save(chemin, np.frombuffer(data_brut, dtype=np.uint8) if octets else np.asarray(data_brut))
+    return chemin, octets
 
-    data = BBS(nb_data)
-    interpretations.append(["BBS"] + effectuer_test(data))
-    
-    data = []
-    for _ in range(nb_data):
-        rand = random(32)
-        data.extend([octets_vers_float_uniforme(rand)])
-    interpretations.append(["Générateur système"] + effectuer_test(data))
-    
-    
-    """--------------<Hash DRBG>------------------"""
-    etat = random(32) #32 octets <=> 256 bits
-    const = random(32) #32 octets <=> 256 bits
-    reseed_interval = 6
-    seedlen = 32
-    reseed_cpt = 0
-    outputs = next_hash_DRBG(etat, const, reseed_cpt, reseed_interval, seedlen, nbIteration = nb_data)
-    data = []
-    for output in outputs:
-        for i in range(0, 32, 4):
-            data.append(octets_vers_float_uniforme(output[i:i+4]))
-    interpretations.append(["Hash DRBG"] + effectuer_test(data))
-    """--------------</Hash DRBG>------------------"""
-
-
-    generer_tableau_tests(tests, interpretations)
 
-    
+def _charger(chemin: str, octets: bool):
+    """relit un échantillon écrit par generer_echantillon (projeté en mémoire sauf pour les entiers Python)"""
+    try:
+        data_brut = np.load(chemin, mmap_mode="r")
+    except ValueError:
+        data_brut = np.load(chemin, allow_pickle=True)  # tableau d'objets : entiers de plus de 64 bits
+    return memoryview(data_brut) if octets else data_brut
+
+
+def executer_job(echantillon: tuple[str, bool], nom_test: str, timeout: float | None = None) -> str:
+    """effectue un seul test sur un échantillon déjà généré (un job de campagne_tests)
+
+    Args:
+        echantillon (tuple[str, bool]): résultat de generer_echantillon
+        nom_test (str): nom du test dans TESTS ou dans TESTS_NIST
+        timeout (float, optional): durée maximale du job en secondes (systèmes POSIX). Defaults to None.
+
+    Returns:
+        str: interprétation du test, ou "délai dépassé"
+    """
+    try:
+        with _delai(timeout):
+            data_brut = _charger(*echantillon)
+            if nom_test in TESTS_NIST:
+                return TESTS_NIST[nom_test](bits_donnees(data_brut)).get("interpretation", "")
+            return TESTS[nom_test](normaliser(data_brut)).get("interpretation", "")
+    except TimeoutError:
+        return "délai dépassé"
+
+
+def campagne_tests(generateurs: dict = GENERATEURS, workers: int | None = None, timeout: float | None = 600,
+                   fichier: str = 'resultat.txt', nist: bool = False) -> list[list[str]]:
+    """effectue tous les tests sur tous les générateurs dans un pool de processus
 
+    Chaque générateur produit son échantillon une seule fois (un job par générateur, écrit dans
+    un fichier temporaire), puis chaque couple (générateur, test) est un job séparé qui relit
+    l'échantillon projeté en mémoire. Le tableau est réécrit avec generer_tableau_tests à chaque
+    job terminé, les cases des jobs pas encore terminés contiennent "en cours".
+
+    Args:
+        generateurs (dict, optional): nom -> (fonction de génération, taille, seed). Defaults to GENERATEURS.
+        workers (int, optional): nombre de processus (par défaut le nombre de cœurs). Defaults to None.
+        timeout (float, optional): durée maximale d'un job (génération ou test) en secondes,
+                                   None pour aucune. Defaults to 600.
+        fichier (str, optional): fichier du tableau de résultats. Defaults to 'resultat.txt'.
+        nist (bool, optional): ajoute une colonne par test de TESTS_NIST. Defaults to False.
+
+    Returns:
+        list[list[str]]: une ligne par générateur (nom puis interprétations dans l'ordre des colonnes)
+    """
+    noms_tests = list(TESTS) + (list(TESTS_NIST) if nist else [])
+    tests = ['Algorithme'] + noms_tests
+    lignes = {nom: [nom] + ["en cours"] * len(noms_tests) for nom in generateurs}
+    total = len(generateurs) * len(noms_tests)
+    termine = 0
+
+    def noter(nom, colonne, interpretation):
+        nonlocal termine
+        termine += 1
+        lignes[nom][colonne] = interpretation
+        print(f"[{termine}/{total}] {nom} - {tests[colonne]} : {interpretation}")
+
+    with tempfile.TemporaryDirectory() as dossier, ProcessPoolExecutor(max_workers=workers) as executeur:
+        generations, jobs = {}, {}
+        for i, (nom, (generation, taille, seed)) in enumerate(generateurs.items()):
+            chemin = os.path.join(dossier, f"echantillon_{i}.npy")
+            generations[executeur.submit(generer_echantillon, generation, taille, seed, chemin, timeout)] = nom
+
+        en_cours = set(generations)
+        while en_cours:
+            finis, en_cours = wait(en_cours, return_when=FIRST_COMPLETED)
+            for job in finis:
+                if job in generations:
+                    nom = generations[job]
+                    try:
+                        echantillon = job.result()
+                        erreur = "délai dépassé" if echantillon is None else None
+                    except Exception as exception:
+                        erreur = f"erreur ({type(exception).__name__})"
+                    if erreur is not None:
+                        # pas d'échantillon : tous les tests du générateur prennent le même résultat
+                        for colonne in range(1, len(tests)):
+                            noter(nom, colonne, erreur)
+                        continue
+                    for colonne, nom_test in enumerate(noms_tests, start=1):
+                        test = executeur.submit(executer_job, echantillon, nom_test, timeout)
+                        jobs[test] = (nom, colonne)
+                        en_cours.add(test)
+                else:
+                    nom, colonne = jobs[job]
+                    try:
+                        interpretation = job.result()
+                    except Exception as exception:
+                        interpretation = f"erreur ({type(exception).__name__})"
+                    noter(nom, colonne, interpretation)
+                generer_tableau_tests(tests, list(lignes.values()), fichier, affichage=False)
+
+    print(f"Tableau généré dans le fichier '{fichier}'")
+    return list(lignes.values())
+
+
+if __name__ == "__main__":
+    campagne_tests()
@@ -0,0 +1,213 @@
+import math
+import numpy as np
+from testsStatistiques import Shannon, Chi2
+
+
+class AccumulateurTests:
+    """Version en flux des tests de testsStatistiques (Shannon, Chi², autocorrélation, KS)
+
+    Les données sont lues par blocs et seuls des résumés de taille fixe sont conservés :
+        - l'histogramme des octets (Shannon, Chi²)
+        - les sommes des valeurs, des carrés et des produits x(i)*x(i+lag) ainsi que
+          les max(lags) premières et dernières valeurs (autocorrélation)
+        - un histogramme fin de nb_classes_ks classes sur [0, 1] (Kolmogorov-Smirnov,
+          distance approchée à 1/nb_classes_ks près)
+    Deux accumulateurs de morceaux consécutifs du flux se fusionnent exactement : le
+    résultat est celui qu'aurait donné un seul accumulateur sur les deux morceaux.
+
+    Les valeurs brutes sont ramenées dans [0, 1] avec des bornes fixées à l'avance
+    (borne_min, borne_max), et non avec le min et le max de l'échantillon comme normaliser.
+    """
+
+    def __init__(self, lags: list[int] = [1, 2, 8, 16], borne_min: float = 0.0, borne_max: float = 1.0,
+                 nb_classes_ks: int = 1 << 16):
+        """
+        Args:
+            lags (list[int], optional): décalages des tests d'autocorrélation. Defaults to [1, 2, 8, 16].
+            borne_min (float, optional): valeur brute ramenée à 0. Defaults to 0.0.
+            borne_max (float, optional): valeur brute ramenée à 1 (2**32 pour des mots de 32 bits). Defaults to 1.0.
+            nb_classes_ks (int, optional): nombre de classes de l'histogramme de KS. Defaults to 1 << 16.
+        """
+        self.lags = list(lags)
+        self.max_lag = max(self.lags)
+        self.borne_min = borne_min
+        self.borne_max = borne_max
+
+        self.n = 0
+        self.histogramme = np.zeros(256, dtype=np.int64)
+        self.histogramme_ks = np.zeros(nb_classes_ks, dtype=np.int64)
+        self.somme = 0.0
+        self.somme_carres = 0.0
+        self.produits = np.zeros(len(self.lags))  # somme des x(i)*x(i+lag) pour chaque lag
+        self.debut = np.empty(0)  # max_lag premières valeurs
+        self.fin = np.empty(0)    # max_lag dernières valeurs
+
+    def _vide(self) -> "AccumulateurTests":
+        """renvois un accumulateur vide avec les mêmes paramètres"""
+        return AccumulateurTests(self.lags, self.borne_min, self.borne_max, len(self.histogramme_ks))
+
+    def ajouter(self, bloc) -> "AccumulateurTests":
+        """ajoute le bloc suivant du flux
+
+        Args:
+            bloc: valeurs brutes (liste ou tableau NumPy)
+
+        Returns:
+            AccumulateurTests: l'accumulateur lui-même
+        """
+        x = (np.asarray(bloc, dtype=np.float64).ravel() - self.borne_min) / (self.borne_max - self.borne_min)
+        hors_intervalle = np.flatnonzero(~((x >= 0.0) & (x <= 1.0)))
+        if hors_intervalle.size:
+            i = hors_intervalle[0]
+            raise ValueError(f"Donnée à l'index {i} du bloc hors des bornes: {bloc[i]}")
+
+        morceau = self._vide()
+        morceau.n = len(x)
+        morceau.histogramme = np.bincount(np.minimum((x * 256).astype(np.int64), 255), minlength=256)
+        nb_classes = len(self.histogramme_ks)
+        morceau.histogramme_ks = np.bincount(np.minimum((x * nb_classes).astype(np.int64), nb_classes - 1),
+                                             minlength=nb_classes)
+        morceau.somme = float(np.sum(x))
+        morceau.somme_carres = float(np.dot(x, x))
+        morceau.produits = np.array([np.dot(x[:-lag], x[lag:]) if lag < len(x) else 0.0 for lag in self.lags])
+        morceau.debut = x[:self.max_lag].copy()
+        morceau.fin = x[-self.max_lag:].copy()
+        return self.fusionner(morceau)
+
+    def fusionner(self, autre: "AccumulateurTests") -> "AccumulateurTests":
+        """fusionne l'accumulateur du morceau de flux qui suit immédiatement celui-ci
+
+        Args:
+            autre (AccumulateurTests): accumulateur du morceau suivant (mêmes paramètres)
+
+        Returns:
+            AccumulateurTests: l'accumulateur lui-même
+        """
+        if autre.lags != self.lags or len(autre.histogramme_ks) != len(self.histogramme_ks):
+            raise ValueError("Les accumulateurs n'ont pas les mêmes paramètres")
+
+        # produits x(i)*x(i+lag) dont x(i) est dans ce morceau et x(i+lag) dans le suivant
+        jonction = np.concatenate([self.fin, autre.debut])
+        a, b = len(self.fin), len(autre.debut)
+        for k, lag in enumerate(self.lags):
+            i0, i1 = max(0, a - lag), min(a, a + b - lag)
+            if i1 > i0:
+                self.produits[k] += np.dot(jonction[i0:i1], jonction[i0+lag:i1+lag])
+        self.produits += autre.produits
+
+        self.debut = np.concatenate([self.debut, autre.debut])[:self.max_lag]
+        self.fin = jonction[-self.max_lag:].copy() if len(autre.fin) < self.max_lag else autre.fin.copy()
+        self.n += autre.n
+        self.histogramme += autre.histogramme
+        self.histogramme_ks += autre.histogramme_ks
+        self.somme += autre.somme
+        self.somme_carres += autre.somme_carres
+        return self
+
+    def autocorrelations(self) -> list[dict]:
+        """test d'autocorrélation pour chaque lag (même résultat que testsStatistiques.autocorrelations)
+
+        Returns:
+            list[dict]: résultat du test pour chaque lag
+        """
+        n = self.n
+        moy = self.somme / n
+        variance = self.somme_carres - n * moy**2
+        interval_confiance = 1.96 / math.sqrt(n)
+        resultats = []
+        for k, lag in enumerate(self.lags):
+            rho = 0
+            if variance != 0 and lag < n:
+                # somme des (x(i)-moy)(x(i+lag)-moy) pour i < n-lag, développée
+                somme_gauche = self.somme - float(np.sum(self.fin[len(self.fin)-lag:]))  # x(0) .. x(n-lag-1)
+                somme_droite = self.somme - float(np.sum(self.debut[:lag]))              # x(lag) .. x(n-1)
+                covariance = self.produits[k] - moy * (somme_gauche + somme_droite) + (n - lag) * moy**2
+                rho = float(covariance) / variance
+            resultats.append({
+                "rho": rho,
+                "interpretation": "non corrélation" if abs(rho) < interval_confiance else "corrélation"
+            })
+        return resultats
+
+    def kolmogorov_smirnov(self) -> dict:
+        """test de Kolmogorov-Smirnov approché sur l'histogramme fin
+
+        La fonction de répartition empirique est comparée à la loi uniforme au bord droit de
+        chaque classe, la distance obtenue est exacte à 1/nb_classes_ks près.
+
+        Returns:
+            dict: même forme que testsStatistiques.kolmogorov_smirnov
+        """
+        nb_classes = len(self.histogramme_ks)
+        f_empirique = np.cumsum(self.histogramme_ks) / self.n
+        f_theorique = np.arange(1, nb_classes + 1) / nb_classes
+        max_distance = float(np.max(np.abs(f_empirique - f_theorique)))
+
+        # formule approximative
+        d_critique_005 = 1.36 / math.sqrt(self.n)
+        return {
+            "d_crit" : d_critique_005,
+            "d_max": max_distance,
+            "interpretation": "Les données sont bien de distribution uniforme" if max_distance < d_critique_005 else "les données ne sont pas de distribution uniforme"
+        }
+
+    def interpretations(self) -> list[str]:
+        """renvois les interprétations dans le même ordre que testsStatistiques.effectuer_test
+
+        Returns:
+            list[str]: Shannon, Chi², autocorrélation pour chaque lag, Kolmogorov-Smirnov
+        """
+        return [Shannon(None, self.n, self.histogramme).get("interpretation", ""),
+                Chi2(None, self.n, self.histogramme).get("interpretation", "")] + \
+            [resultat.get("interpretation", "") for resultat in self.autocorrelations()] + \
+            [self.kolmogorov_smirnov().get("interpretation", "")]
+
+
+def lire_blocs(chemin: str, dtype="<u4", taille_bloc: int = 1 << 20):
+    """lit un fichier binaire bloc par bloc
+
+    Args:
+        chemin (str): fichier de valeurs brutes
+        dtype (optional): type NumPy des valeurs. Defaults to "<u4" (mots de 32 bits).
+        taille_bloc (int, optional): nombre de valeurs par bloc. Defaults to 1 << 20.
+
+    Yields:
+        np.ndarray: bloc suivant
+    """
+    with open(chemin, "rb") as f:
+        while True:
+            bloc = np.fromfile(f, dtype=dtype, count=taille_bloc)
+            if len(bloc) == 0:
+                return
+            yield bloc
+
+
+def tester_flux(blocs, lags: list[int] = [1, 2, 8, 16], borne_min: float = 0.0, borne_max: float = 1.0,
+                nb_classes_ks: int = 1 << 16) -> AccumulateurTests:
+    """effectue les tests sur un flux de blocs en mémoire constante
+
+    Args:
+        blocs: itérable de blocs de valeurs brutes (générateur, lire_blocs, ...)
+        lags, borne_min, borne_max, nb_classes_ks: voir AccumulateurTests
+
+    Returns:
+        AccumulateurTests: accumulateur de tout le flux (interpretations() pour les résultats)
+    """
+    accumulateur = AccumulateurTests(lags, borne_min, borne_max, nb_classes_ks)
+    for bloc in blocs:
+        accumulateur.ajouter(bloc)
+    return accumulateur
+
+
+if __name__ == "__main__":
+    from Mersenne_twister import MersenneTwister
+    from testsStatistiques import effectuer_test
+
+    mt = MersenneTwister(123)
+    data = mt.random_uint32(100000)
+    print("tests en une fois :", effectuer_test(data / 2**32))
+
+    # même flux découpé en blocs, réparti sur deux accumulateurs puis fusionné
+    premier = tester_flux((data[i:i+7000] for i in range(0, 50000, 7000)), borne_max=2**32)
+    second = tester_flux((data[i:i+7000] for i in range(50000, 100000, 7000)), borne_max=2**32)
+    print("tests en flux     :", premier.fusionner(second).interpretations())